@@ -1,6 +1,7 @@
 from ui.main_window import MainWindow
 from PyQt5.QtWidgets import QApplication
 import sys
+import multiprocessing
 import traceback
 from PyQt5.QtGui import QFont
 from ui.utils.settings_manager import load_settings
@@ -21,6 +22,8 @@ def global_exception_handler(exc_type, exc_value, exc_traceback):
 
 
 if __name__ == '__main__':
+    # 打包为exe后，多进程传输的子进程需要
+    multiprocessing.freeze_support()
     # 设置全局异常处理器
     sys.excepthook = global_exception_handler
 
@@ -1,13 +1,19 @@
 from PyQt5.QtWidgets import QTreeWidget
 from PyQt5.QtCore import Qt
-import os
-import json
+from ui.models.collection_manager import NODE_COLLECTION, node_kind
 
 class CollectionTreeWidget(QTreeWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self._main_window = None  # 运行时注入
 
+    def startDrag(self, supported_actions):
+        # 拖动尚未读取分片的集合前先读取，保证子节点随之移动
+        if self._main_window:
+            for item in self.selectedItems():
+                self._main_window.ensure_collection_loaded(item)
+        super().startDrag(supported_actions)
+
     def dragEnterEvent(self, event):
         """拖拽进入事件"""
         if event.source() == self:
@@ -18,11 +24,11 @@ class CollectionTreeWidget(QTreeWidget):
     def dragMoveEvent(self, event):
         """拖拽移动事件"""
         if event.source() == self:
-            # 获取拖拽的目标项
+            # 先让Qt计算放置位置（dropIndicatorPosition），再按节点类型验证
+            super().dragMoveEvent(event)
             target_item = self.itemAt(event.pos())
             
-            if target_item:
-                # 简单验证：确保有目标项
+            if target_item and self._is_valid_drop(self.currentItem(), target_item, self.dropIndicatorPosition()):
                 event.acceptProposedAction()
             else:
                 event.ignore()
@@ -38,10 +44,13 @@ class CollectionTreeWidget(QTreeWidget):
         # 获取拖拽的目标项
         target_item = self.itemAt(event.pos())
         
-        if not target_item:
+        if not target_item or not self._is_valid_drop(self.currentItem(), target_item, self.dropIndicatorPosition()):
             event.ignore()
             return
         
+        if self._main_window:
+            self._main_window.ensure_collection_loaded(target_item)
+
         # 让Qt完成默认的拖拽操作
         super().dropEvent(event)
         
@@ -55,40 +64,14 @@ class CollectionTreeWidget(QTreeWidget):
                 # 更新所有Tab标签路径 - 重新扫描整个树结构
                 self._main_window.update_all_tabs_after_drag()
                 
-                # 验证保存是否成功
-                user_data_dir = os.path.join(self._main_window._workspace_dir, 'user-data')
-                collections_path = os.path.join(user_data_dir, 'collections.json')
-                
-                if os.path.exists(collections_path):
-                    with open(collections_path, 'r', encoding='utf-8') as f:
-                        saved_data = json.load(f)
-                    
-                    # 统计保存的数据
-                    collections_count = 0
-                    requests_count = 0
-                    
-                    def count_items(items):
-                        nonlocal collections_count, requests_count
-                        for item in items:
-                            if item.get('type') == 'collection':
-                                collections_count += 1
-                                if 'children' in item:
-                                    count_items(item['children'])
-                            elif item.get('type') == 'request':
-                                requests_count += 1
-                    
-                    count_items(saved_data)
-                    
-                    self._main_window.log_info(f'✅ 拖拽持久化成功: {collections_count} 个集合, {requests_count} 个请求')
-                    
-                    # 显示状态栏提示（如果有的话）
-                    if hasattr(self._main_window, 'statusBar'):
-                        self._main_window.statusBar().showMessage(f'拖拽完成并已保存', 3000)
-                else:
-                    self._main_window.log_warning('❌ collections.json 文件未找到，保存可能失败')
-                    if hasattr(self._main_window, 'statusBar'):
-                        self._main_window.statusBar().showMessage('保存失败：文件未创建', 3000)
-                        
+                # 保存时已更新内存集合模型，直接统计，不再重新读取文件
+                collections_count, requests_count = self._main_window.collection_manager.model.counts()
+                self._main_window.log_info(f'✅ 拖拽持久化成功: {collections_count} 个集合, {requests_count} 个请求')
+
+                # 显示状态栏提示（如果有的话）
+                if hasattr(self._main_window, 'statusBar'):
+                    self._main_window.statusBar().showMessage(f'拖拽完成并已保存', 3000)
+
             except Exception as e:
                 self._main_window.log_error(f'❌ 拖拽后保存失败: {e}')
                 if hasattr(self._main_window, 'statusBar'):
@@ -126,43 +109,25 @@ class CollectionTreeWidget(QTreeWidget):
         
         return None
 
-    def _is_valid_drop(self, source_item, target_item):
-        """验证拖拽规则"""
-        def is_collection(item):
-            # Collection：有子项或者是顶级项（没有父项）
-            return item.parent() is None or item.childCount() >= 0
-            
-        def is_request(item):
-            # Request：没有子项且有父项
-            return item.childCount() == 0 and item.parent() is not None
-            
-        source_is_collection = is_collection(source_item)
-        source_is_request = is_request(source_item)
-        target_is_collection = is_collection(target_item)
-        target_is_request = is_request(target_item)
-        
-        # 验证拖拽规则
-        if source_is_collection and target_is_collection:
-            # Collection可以拖拽到Collection下
-            return True
-        elif source_is_request and target_is_collection:
-            # Request可以拖拽到Collection下
-            return True
-        elif source_is_collection and target_is_request:
-            # Collection不能拖拽到Request下
-            return False
-        elif source_is_request and target_is_request:
-            # Request不能拖拽到Request下
+    def _is_valid_drop(self, source_item, target_item, position=None):
+        """验证拖拽规则：Request和Collection只能放入Collection，顶级只能是Collection"""
+        if source_item is None or target_item is None:
             return False
+        if target_item is source_item or self._is_child_of(source_item, target_item):
+            return False  # 不能拖到自身或自己的子节点下
+        if position is None or position == self.OnItem:
+            new_parent = target_item
         else:
-            # 其他情况不允许拖拽
-            return False
+            new_parent = target_item.parent()  # 放在目标的上方或下方，成为其兄弟节点
+        if new_parent is None:
+            return node_kind(source_item) == NODE_COLLECTION
+        return node_kind(new_parent) == NODE_COLLECTION
 
     def _is_child_of(self, parent, child):
-        """检查child是否是parent的子项"""
-        for i in range(parent.childCount()):
-            if parent.child(i) == child:
-                return True
-            if self._is_child_of(parent.child(i), child):
+        """检查child是否是parent的子孙节点（沿child向上查找）"""
+        item = child.parent()
+        while item is not None:
+            if item is parent:
                 return True
-        return False 
\ No newline at end of file
+            item = item.parent()
+        return False
@@ -1,3 +1,4 @@
 # Dialogs package 
 from .about_dialog import AboutDialog
-from .settings_dialog import SettingsDialog 
\ No newline at end of file
+from .settings_dialog import SettingsDialog
+from .request_queue_dialog import RequestQueueDialog
\ No newline at end of file
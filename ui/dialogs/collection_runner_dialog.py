@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView, QAbstractItemView, QSpinBox, QProgressBar
+)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from ui.utils.collection_runner import CollectionRunner
+from ui.utils.i18n import get_text
+from ui.utils.settings_manager import load_settings
+
+
+class CollectionRunnerDialog(QDialog):
+    """集合运行对话框 - 依次或并发运行集合中的所有请求，结果逐行显示"""
+
+    COL_INDEX, COL_REQUEST, COL_METHOD, COL_STATUS, COL_TIME, COL_SIZE, COL_ERROR = range(7)
+
+    def __init__(self, name, requests, main_window=None):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.name = name
+        self.requests = list(requests)  # [(路径, 请求数据)]
+        self.runner = None
+        self._done = 0
+        self._passed = 0
+        self._failed = 0
+        self.setMinimumSize(820, 480)
+        self.setModal(False)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+
+        layout = QVBoxLayout(self)
+        options = QHBoxLayout()
+        self.concurrency_label = QLabel()
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 64)
+        self.concurrency_spin.setValue(1)
+        self.timeout_label = QLabel()
+        self.timeout_spin = QSpinBox()
+        self.timeout_spin.setRange(0, 3600)
+        self.timeout_spin.setValue(30)
+        self.timeout_spin.setSuffix(' s')
+        options.addWidget(self.concurrency_label)
+        options.addWidget(self.concurrency_spin)
+        options.addSpacing(16)
+        options.addWidget(self.timeout_label)
+        options.addWidget(self.timeout_spin)
+        options.addStretch()
+        self.start_btn = QPushButton()
+        self.stop_btn = QPushButton()
+        self.stop_btn.setEnabled(False)
+        options.addWidget(self.start_btn)
+        options.addWidget(self.stop_btn)
+        layout.addLayout(options)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, max(1, len(self.requests)))
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.table = QTableWidget(0, 7)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        for col in range(7):
+            header.setSectionResizeMode(col, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(self.COL_REQUEST, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        self.start_btn.clicked.connect(self.start)
+        self.stop_btn.clicked.connect(self.stop)
+        self.table.cellDoubleClicked.connect(self.open_request)
+
+        self.refresh_texts()
+        self.reset_table()
+
+    def refresh_texts(self):
+        self.setWindowTitle(get_text('runner_title').format(name=self.name))
+        self.concurrency_label.setText(get_text('runner_concurrency'))
+        self.timeout_label.setText(get_text('runner_timeout'))
+        self.concurrency_spin.setToolTip(get_text('runner_concurrency_tooltip'))
+        self.timeout_spin.setToolTip(get_text('runner_timeout_tooltip'))
+        self.start_btn.setText(get_text('runner_start'))
+        self.stop_btn.setText(get_text('runner_stop'))
+        self.table.setHorizontalHeaderLabels([
+            '#', get_text('queue_request'), get_text('runner_method'), get_text('runner_status'),
+            get_text('runner_time'), get_text('runner_size'), get_text('runner_error'),
+        ])
+        self.update_summary()
+
+    def reset_table(self):
+        self.table.setRowCount(len(self.requests))
+        for row, (path, request) in enumerate(self.requests):
+            values = [str(row + 1), path, (request.get('method') or 'GET').upper(),
+                      get_text('runner_pending'), '', '', '']
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+        self._done = self._passed = self._failed = 0
+        self.progress_bar.setValue(0)
+        self.update_summary()
+
+    def update_summary(self, elapsed=None):
+        text = get_text('runner_summary').format(
+            done=self._done, total=len(self.requests), passed=self._passed, failed=self._failed)
+        if elapsed is not None:
+            text += '   ' + get_text('runner_elapsed').format(elapsed=elapsed)
+        self.summary_label.setText(text)
+
+    def start(self):
+        if self.runner is not None and self.runner.is_running():
+            return
+        self.reset_table()
+        timeout = self.timeout_spin.value()
+        # 不设父对象：对话框关闭后，仍在运行的工作线程持有 runner 直到退出
+        s = load_settings()
+        self.runner = CollectionRunner(self.requests, self.concurrency_spin.value(), timeout or None,
+                                       transport=s.get('request_transport', 'thread'),
+                                       http2=s.get('http2_enabled', False))
+        self.runner.request_started.connect(self.on_request_started)
+        self.runner.result.connect(self.on_result)
+        self.runner.finished.connect(self.on_finished)
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.concurrency_spin.setEnabled(False)
+        self.timeout_spin.setEnabled(False)
+        if self.main_window is not None:
+            self.main_window.log_info(f'Run collection "{self.name}": {len(self.requests)} requests, '
+                                      f'concurrency {self.concurrency_spin.value()}')
+        self.runner.start()
+
+    def stop(self):
+        if self.runner is not None:
+            self.runner.stop()
+        self.stop_btn.setEnabled(False)
+
+    def on_request_started(self, index):
+        self.table.item(index, self.COL_STATUS).setText(get_text('runner_running'))
+
+    def on_result(self, index, row):
+        error = row.get('error')
+        if error is None:
+            status = row.get('status_text', '')
+            if row.get('http_version'):
+                status = f"{row['http_version']} {status}"
+            ok = row.get('status_code', 0) < 400
+            size = row.get('size', 0)
+            size_text = f'{size / 1024:.1f} KB' if size >= 1024 else f'{size} B'
+        else:
+            status = get_text('runner_failed')
+            ok = False
+            size_text = ''
+        self.table.item(index, self.COL_STATUS).setText(status)
+        self.table.item(index, self.COL_STATUS).setForeground(QColor('#2e7d32' if ok else '#c62828'))
+        self.table.item(index, self.COL_TIME).setText(f"{row.get('elapsed', 0) * 1000:.0f} ms")
+        self.table.item(index, self.COL_SIZE).setText(size_text)
+        self.table.item(index, self.COL_ERROR).setText(error or '')
+        self.table.item(index, self.COL_ERROR).setToolTip(error or '')
+        self._done += 1
+        if ok:
+            self._passed += 1
+        else:
+            self._failed += 1
+        self.progress_bar.setValue(self._done)
+        self.update_summary()
+
+    def on_finished(self, passed, failed, elapsed):
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.concurrency_spin.setEnabled(True)
+        self.timeout_spin.setEnabled(True)
+        for row in range(self.table.rowCount()):
+            item = self.table.item(row, self.COL_STATUS)
+            if item.text() == get_text('runner_pending'):
+                item.setText(get_text('runner_skipped'))
+        self.update_summary(elapsed)
+        if self.main_window is not None:
+            self.main_window.log_info(f'Collection "{self.name}" finished: {passed} passed, {failed} failed, {elapsed:.1f}s')
+
+    def open_request(self, row, _column):
+        """双击结果行时在标签页中打开对应的请求"""
+        if self.main_window is None or row >= len(self.requests):
+            return
+        item = self.main_window.path_index.item_for_path(self.requests[row][0])
+        if item is not None:
+            self.main_window.collection_tree.setCurrentItem(item)
+            self.main_window.on_collection_item_clicked(item, 0)
+
+    def closeEvent(self, event):
+        if self.runner is not None:
+            self.runner.stop()
+        super().closeEvent(event)
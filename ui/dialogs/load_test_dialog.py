@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton, QSpinBox,
+    QComboBox, QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView,
+    QAbstractItemView, QPlainTextEdit, QTabWidget, QSplitter, QMessageBox
+)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+from ui.utils.load_tester import LARGE_UPLOAD_BYTES, LoadTester, upload_size
+from ui.utils.request_builder import close_file_handles, use_http2
+from ui.utils.i18n import get_text
+from ui.utils.settings_manager import load_settings
+
+BAR_WIDTH = 40
+
+
+def _ms(value_us):
+    return f'{value_us / 1000.0:.1f} ms'
+
+
+class LoadTestDialog(QDialog):
+    """压测对话框 - 以指定并发或目标速率重复发送当前请求，显示延迟分布"""
+
+    MODE_CONCURRENCY = 0
+    MODE_RPS = 1
+    REFRESH_INTERVAL_MS = 250
+
+    def __init__(self, prepare, label, main_window=None):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.prepare = prepare  # 每次运行前重新构建请求参数，返回 build_request 的结果
+        self.label = label
+        self.tester = None
+        self.setMinimumSize(760, 560)
+        self.setModal(False)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+
+        layout = QVBoxLayout(self)
+        self.request_label = QLabel(label)
+        self.request_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.request_label)
+
+        options = QHBoxLayout()
+        self.total_label = QLabel()
+        self.total_spin = QSpinBox()
+        self.total_spin.setRange(1, 1000000)
+        self.total_spin.setValue(100)
+        self.mode_combo = QComboBox()
+        self.concurrency_label = QLabel()
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 500)
+        self.concurrency_spin.setValue(10)
+        self.rps_label = QLabel()
+        self.rps_spin = QSpinBox()
+        self.rps_spin.setRange(1, 100000)
+        self.rps_spin.setValue(50)
+        self.timeout_label = QLabel()
+        self.timeout_spin = QSpinBox()
+        self.timeout_spin.setRange(0, 3600)
+        self.timeout_spin.setValue(30)
+        self.timeout_spin.setSuffix(' s')
+        for widget in (self.total_label, self.total_spin, self.mode_combo, self.concurrency_label,
+                       self.concurrency_spin, self.rps_label, self.rps_spin,
+                       self.timeout_label, self.timeout_spin):
+            options.addWidget(widget)
+        options.addStretch()
+        self.start_btn = QPushButton()
+        self.stop_btn = QPushButton()
+        self.stop_btn.setEnabled(False)
+        options.addWidget(self.start_btn)
+        options.addWidget(self.stop_btn)
+        layout.addLayout(options)
+
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+
+        # 统计数据
+        stats = QGridLayout()
+        self.stat_labels = {}
+        self.stat_values = {}
+        for i, key in enumerate(['done', 'errors', 'rps', 'elapsed', 'min', 'mean', 'p50', 'p90', 'p99', 'max']):
+            name = QLabel()
+            value = QLabel('-')
+            value.setTextInteractionFlags(Qt.TextSelectableByMouse)
+            self.stat_labels[key] = name
+            self.stat_values[key] = value
+            stats.addWidget(name, i // 4, (i % 4) * 2)
+            stats.addWidget(value, i // 4, (i % 4) * 2 + 1)
+        layout.addLayout(stats)
+        self.error_label = QLabel()
+        self.error_label.setWordWrap(True)
+        self.error_label.setStyleSheet('color: #c62828;')
+        layout.addWidget(self.error_label)
+
+        splitter = QSplitter(Qt.Horizontal)
+        self.status_table = QTableWidget(0, 2)
+        self.status_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.status_table.verticalHeader().setVisible(False)
+        self.status_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.status_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        splitter.addWidget(self.status_table)
+        self.charts = QTabWidget()
+        mono = QFont('Consolas', 10)
+        mono.setStyleHint(QFont.Monospace)
+        self.histogram_view = QPlainTextEdit()
+        self.histogram_view.setReadOnly(True)
+        self.histogram_view.setFont(mono)
+        self.throughput_view = QPlainTextEdit()
+        self.throughput_view.setReadOnly(True)
+        self.throughput_view.setFont(mono)
+        self.charts.addTab(self.histogram_view, '')
+        self.charts.addTab(self.throughput_view, '')
+        splitter.addWidget(self.charts)
+        splitter.setStretchFactor(1, 3)
+        layout.addWidget(splitter, 1)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self._timer.timeout.connect(self.refresh)
+
+        self.mode_combo.currentIndexChanged.connect(self.update_mode)
+        self.start_btn.clicked.connect(self.start)
+        self.stop_btn.clicked.connect(self.stop)
+
+        self.refresh_texts()
+        self.update_mode()
+
+    def refresh_texts(self):
+        self.setWindowTitle(get_text('load_test_title'))
+        self.total_label.setText(get_text('load_test_total'))
+        current = self.mode_combo.currentIndex()
+        self.mode_combo.blockSignals(True)
+        self.mode_combo.clear()
+        self.mode_combo.addItems([get_text('load_test_mode_concurrency'), get_text('load_test_mode_rps')])
+        self.mode_combo.setCurrentIndex(max(0, current))
+        self.mode_combo.blockSignals(False)
+        self.concurrency_label.setText(get_text('runner_concurrency'))
+        self.rps_label.setText(get_text('load_test_rps'))
+        self.timeout_label.setText(get_text('runner_timeout'))
+        self.rps_spin.setToolTip(get_text('load_test_rps_tooltip'))
+        self.start_btn.setText(get_text('runner_start'))
+        self.stop_btn.setText(get_text('runner_stop'))
+        for key, label in self.stat_labels.items():
+            label.setText(get_text('load_test_stat_' + key))
+        self.status_table.setHorizontalHeaderLabels([get_text('runner_status'), get_text('load_test_count')])
+        self.charts.setTabText(0, get_text('load_test_histogram'))
+        self.charts.setTabText(1, get_text('load_test_throughput'))
+
+    def update_mode(self):
+        rps_mode = self.mode_combo.currentIndex() == self.MODE_RPS
+        self.rps_label.setEnabled(rps_mode)
+        self.rps_spin.setEnabled(rps_mode)
+
+    def set_running(self, running):
+        self.start_btn.setEnabled(not running)
+        self.stop_btn.setEnabled(running)
+        for widget in (self.total_spin, self.mode_combo, self.concurrency_spin, self.rps_spin, self.timeout_spin):
+            widget.setEnabled(not running)
+        if not running:
+            self.update_mode()
+
+    def start(self):
+        if self.tester is not None and self.tester.is_running():
+            return
+        try:
+            prepared = self.prepare()
+        except OSError as e:
+            self.error_label.setText(f'Cannot open file: {e.filename}\n{e}')
+            return
+        except RuntimeError:
+            # 请求所在的标签页已关闭
+            self.error_label.setText(get_text('load_test_tab_closed'))
+            return
+        if not prepared['url']:
+            close_file_handles(prepared['file_handles'])
+            self.error_label.setText(get_text('load_test_no_url'))
+            return
+        size = upload_size(prepared)
+        if size > LARGE_UPLOAD_BYTES:
+            choice = QMessageBox.question(
+                self, get_text('load_test_title'),
+                get_text('load_test_large_upload').format(size=size / (1024 * 1024)),
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if choice != QMessageBox.Yes:
+                close_file_handles(prepared['file_handles'])
+                return
+        self.error_label.setText('')
+        rps = self.rps_spin.value() if self.mode_combo.currentIndex() == self.MODE_RPS else None
+        # 不设父对象：对话框关闭后，仍在运行的工作线程持有 tester 直到退出
+        s = load_settings()
+        self.tester = LoadTester(prepared, self.total_spin.value(), self.concurrency_spin.value(),
+                                 rps, self.timeout_spin.value() or None,
+                                 transport=s.get('request_transport', 'thread'),
+                                 http2=use_http2(prepared['http_version'], s.get('http2_enabled', False)))
+        self.tester.finished.connect(self.on_finished)
+        self.progress_bar.setRange(0, self.tester.total)
+        self.progress_bar.setValue(0)
+        self.set_running(True)
+        if self.main_window is not None:
+            self.main_window.log_info(
+                f'Load test {self.label}: {self.tester.total} requests, concurrency {self.tester.concurrency}'
+                + (f', {rps} req/s' if rps else ''))
+        self.tester.start()
+        self._timer.start()
+
+    def stop(self):
+        if self.tester is not None:
+            self.tester.stop()
+        self.stop_btn.setEnabled(False)
+
+    def on_finished(self):
+        self._timer.stop()
+        self.refresh()
+        self.set_running(False)
+        if self.main_window is not None and self.tester is not None:
+            snap = self.tester.snapshot()
+            self.main_window.log_info(
+                f"Load test finished: {snap['done']} requests, {snap['errors']} errors, {snap['rps']:.1f} req/s, "
+                f"p50 {_ms(snap['p50'])}, p90 {_ms(snap['p90'])}, p99 {_ms(snap['p99'])}, max {_ms(snap['max'])}")
+
+    def refresh(self):
+        if self.tester is None:
+            return
+        snap = self.tester.snapshot()
+        self.progress_bar.setValue(snap['done'])
+        values = {
+            'done': f"{snap['done']}/{snap['total']}",
+            'errors': str(snap['errors']),
+            'rps': f"{snap['rps']:.1f}",
+            'elapsed': f"{snap['elapsed']:.1f} s",
+        }
+        for key in ('min', 'mean', 'p50', 'p90', 'p99', 'max'):
+            values[key] = _ms(snap[key]) if snap['done'] else '-'
+        for key, value in values.items():
+            self.stat_values[key].setText(value)
+        if snap['last_error']:
+            self.error_label.setText(snap['last_error'])
+
+        counts = sorted(snap['status_counts'].items(), key=lambda kv: (-kv[1], kv[0]))
+        self.status_table.setRowCount(len(counts))
+        for row, (status, n) in enumerate(counts):
+            self.status_table.setItem(row, 0, QTableWidgetItem(status))
+            self.status_table.setItem(row, 1, QTableWidgetItem(str(n)))
+
+        self.histogram_view.setPlainText(self._bars(
+            [(f'<= {_ms(upper)}', n) for upper, n in snap['buckets']]))
+        self.throughput_view.setPlainText(self._bars(
+            [(f'{second:>4d}s', n) for second, n in enumerate(snap['throughput'])]))
+
+    @staticmethod
+    def _bars(rows):
+        """[(标签, 数量)] -> 文本条形图"""
+        if not rows:
+            return ''
+        peak = max(n for _, n in rows) or 1
+        width = max(len(label) for label, _ in rows)
+        lines = []
+        for label, n in rows:
+            bar = '█' * int(round(n * BAR_WIDTH / peak))
+            lines.append(f'{label:>{width}} | {bar} {n}')
+        return '\n'.join(lines)
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        if self.tester is not None:
+            self.tester.stop()
+        super().closeEvent(event)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+    QTableWidgetItem, QHeaderView, QAbstractItemView
+)
+from PyQt5.QtCore import QTimer
+from ui.utils.i18n import get_text
+
+
+class RequestQueueDialog(QDialog):
+    """请求队列对话框 - 显示运行中和排队中的请求，可取消"""
+
+    def __init__(self, scheduler, main_window=None):
+        super().__init__(main_window)
+        self.scheduler = scheduler
+        self.main_window = main_window
+        self._jobs = []
+        self.setWindowTitle(get_text('request_queue'))
+        self.setMinimumSize(640, 300)
+        self.setModal(False)
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+
+        btn_layout = QHBoxLayout()
+        btn_layout.addStretch()
+        self.cancel_selected_btn = QPushButton()
+        self.cancel_all_btn = QPushButton()
+        btn_layout.addWidget(self.cancel_selected_btn)
+        btn_layout.addWidget(self.cancel_all_btn)
+        layout.addLayout(btn_layout)
+
+        self.cancel_selected_btn.clicked.connect(self.cancel_selected)
+        self.cancel_all_btn.clicked.connect(self.scheduler.cancel_all)
+        self.scheduler.queue_changed.connect(self.refresh)
+
+        # 有请求时每秒刷新耗时；队列为空时停止，不产生空闲唤醒
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000)
+        self._timer.timeout.connect(self.update_elapsed)
+
+        self.refresh_texts()
+        self.refresh()
+
+    def refresh_texts(self):
+        self.setWindowTitle(get_text('request_queue'))
+        self.table.setHorizontalHeaderLabels([
+            get_text('queue_state'), get_text('queue_request'),
+            get_text('queue_tab'), get_text('queue_elapsed'),
+        ])
+        self.cancel_selected_btn.setText(get_text('queue_cancel_selected'))
+        self.cancel_all_btn.setText(get_text('queue_cancel_all'))
+        self.update_summary()
+
+    def update_summary(self):
+        self.summary_label.setText(get_text('queue_summary').format(
+            running=self.scheduler.running_count(), queued=self.scheduler.queued_count()))
+
+    def refresh(self):
+        """根据调度器当前任务重建表格"""
+        self._jobs = self.scheduler.jobs()
+        self.table.setRowCount(len(self._jobs))
+        for row, job in enumerate(self._jobs):
+            state = get_text('queue_running') if job.state == job.RUNNING else get_text('queue_queued')
+            self.table.setItem(row, 0, QTableWidgetItem(state))
+            self.table.setItem(row, 1, QTableWidgetItem(job.label or job.url))
+            self.table.setItem(row, 2, QTableWidgetItem(self._tab_text(job.owner)))
+            self.table.setItem(row, 3, QTableWidgetItem(''))
+        self.update_elapsed()
+        self.update_summary()
+        if self._jobs and not self._timer.isActive():
+            self._timer.start()
+        elif not self._jobs:
+            self._timer.stop()
+
+    def update_elapsed(self):
+        now = time.monotonic()
+        for row, job in enumerate(self._jobs):
+            item = self.table.item(row, 3)
+            if item is not None:
+                item.setText(f'{now - job.submitted_at:.1f}s')
+
+    def cancel_selected(self):
+        rows = sorted({index.row() for index in self.table.selectedIndexes()})
+        for job in [self._jobs[r] for r in rows if r < len(self._jobs)]:
+            self.scheduler.cancel(job.owner)
+
+    def _tab_text(self, editor):
+        req_tabs = getattr(self.main_window, 'req_tabs', None)
+        if req_tabs is None:
+            return ''
+        index = req_tabs.indexOf(editor)
+        return req_tabs.tabText(index) if index >= 0 else ''
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        try:
+            self.scheduler.queue_changed.disconnect(self.refresh)
+        except TypeError:
+            pass
+        super().closeEvent(event)
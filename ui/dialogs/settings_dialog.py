@@ -1,6 +1,6 @@
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem, QStackedWidget,
-    QWidget, QLabel, QPushButton, QLineEdit, QComboBox, QSpinBox, QFileDialog, QTableWidget, QTableWidgetItem, QMessageBox, QFontComboBox, QApplication, QKeySequenceEdit, QStyledItemDelegate
+    QWidget, QLabel, QPushButton, QLineEdit, QComboBox, QSpinBox, QFileDialog, QTableWidget, QTableWidgetItem, QMessageBox, QFontComboBox, QApplication, QKeySequenceEdit, QStyledItemDelegate, QCheckBox
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
@@ -27,6 +27,18 @@ class DataDirectoryPanel(QWidget):
         hlayout2.addWidget(self.log_path_edit)
         hlayout2.addWidget(self.log_choose_btn)
         layout.addLayout(hlayout2)
+        self.save_delay_label = QLabel(get_text('collections_save_delay_ms'))
+        self.save_delay_spin = QSpinBox()
+        self.save_delay_spin.setRange(0, 10000)
+        hlayout3 = QHBoxLayout()
+        hlayout3.addWidget(self.save_delay_label)
+        hlayout3.addStretch()
+        hlayout3.addWidget(self.save_delay_spin)
+        layout.addLayout(hlayout3)
+        self.compact_check = QCheckBox(get_text('collections_compact_json'))
+        layout.addWidget(self.compact_check)
+        self.sharded_check = QCheckBox(get_text('collections_sharded'))
+        layout.addWidget(self.sharded_check)
         layout.addStretch()
         self.coll_choose_btn.clicked.connect(self.choose_coll_file)
         self.log_choose_btn.clicked.connect(self.choose_log_file)
@@ -43,10 +55,16 @@ class DataDirectoryPanel(QWidget):
         s = load_settings()
         self.coll_path_edit.setText(s.get('collections_path', ''))
         self.log_path_edit.setText(s.get('log_path', ''))
+        self.save_delay_spin.setValue(s.get('collections_save_delay_ms', 500))
+        self.compact_check.setChecked(s.get('collections_compact_json', False))
+        self.sharded_check.setChecked(s.get('collections_sharded', False))
     def get_settings(self):
         return {
             'collections_path': self.coll_path_edit.text().strip(),
-            'log_path': self.log_path_edit.text().strip()
+            'log_path': self.log_path_edit.text().strip(),
+            'collections_save_delay_ms': self.save_delay_spin.value(),
+            'collections_compact_json': self.compact_check.isChecked(),
+            'collections_sharded': self.sharded_check.isChecked(),
         }
     def validate_paths(self):
         coll_path = self.coll_path_edit.text().strip()
@@ -58,12 +76,16 @@ class DataDirectoryPanel(QWidget):
         return True, ''
     def is_changed(self):
         s = load_settings()
-        return (self.coll_path_edit.text().strip() != s.get('collections_path', '')) or (self.log_path_edit.text().strip() != s.get('log_path', ''))
+        return (self.coll_path_edit.text().strip() != s.get('collections_path', '')) or (self.log_path_edit.text().strip() != s.get('log_path', '')) \
+            or self.sharded_check.isChecked() != s.get('collections_sharded', False)
     def refresh_texts(self):
         self.label_coll.setText(get_text('select_json_file') + ':')
         self.coll_choose_btn.setText(get_text('select_file'))
         self.label_log.setText(get_text('select_log_file') + ':')
         self.log_choose_btn.setText(get_text('select_file'))
+        self.save_delay_label.setText(get_text('collections_save_delay_ms'))
+        self.compact_check.setText(get_text('collections_compact_json'))
+        self.sharded_check.setText(get_text('collections_sharded'))
 
 class ShortcutKeyDelegate(QStyledItemDelegate):
     def createEditor(self, parent, option, index):
@@ -294,6 +316,310 @@ class EditorTabPanel(QWidget):
     def refresh_texts(self):
         self.label.setText(get_text('tab') + ':')
 
+class NetworkPanel(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        self.label = QLabel(get_text('network') + ':')
+        layout.addWidget(self.label)
+        self.pool_size_label = QLabel(get_text('http_pool_size'))
+        self.pool_size_spin = QSpinBox()
+        self.pool_size_spin.setRange(1, 100)
+        self.max_per_host_label = QLabel(get_text('http_pool_max_per_host'))
+        self.max_per_host_spin = QSpinBox()
+        self.max_per_host_spin.setRange(0, 100)
+        self.idle_timeout_label = QLabel(get_text('http_pool_idle_timeout'))
+        self.idle_timeout_spin = QSpinBox()
+        self.idle_timeout_spin.setRange(0, 3600)
+        self.max_concurrent_label = QLabel(get_text('max_concurrent_requests'))
+        self.max_concurrent_spin = QSpinBox()
+        self.max_concurrent_spin.setRange(1, 64)
+        self.max_concurrent_host_label = QLabel(get_text('max_concurrent_per_host'))
+        self.max_concurrent_host_spin = QSpinBox()
+        self.max_concurrent_host_spin.setRange(0, 64)
+        self.transport_label = QLabel(get_text('request_transport'))
+        self.transport_combo = QComboBox()
+        self.transport_combo.addItem(get_text('request_transport_thread'), 'thread')
+        self.transport_combo.addItem(get_text('request_transport_async'), 'async')
+        self.transport_combo.addItem(get_text('request_transport_process'), 'process')
+        self.transport_combo.setToolTip(get_text('request_transport_tooltip'))
+        self.process_pool_label = QLabel(get_text('process_pool_size'))
+        self.process_pool_spin = QSpinBox()
+        self.process_pool_spin.setRange(1, 32)
+        self.timeout_labels = {}
+        self.timeout_spins = {}
+        for key in ('request_connect_timeout', 'request_read_timeout', 'request_total_timeout'):
+            self.timeout_labels[key] = QLabel(get_text(key))
+            self.timeout_spins[key] = QSpinBox()
+            self.timeout_spins[key].setRange(0, 86400)
+        self.streaming_check = QCheckBox(get_text('response_streaming'))
+        self.http2_check = QCheckBox(get_text('http2_enabled'))
+        self.http2_check.setToolTip(get_text('http2_tooltip'))
+        self.spill_threshold_label = QLabel(get_text('stream_spill_threshold_mb'))
+        self.spill_threshold_spin = QSpinBox()
+        self.spill_threshold_spin.setRange(1, 4096)
+        self.stream_preview_label = QLabel(get_text('stream_preview_kb'))
+        self.stream_preview_spin = QSpinBox()
+        self.stream_preview_spin.setRange(64, 65536)
+        layout.addWidget(self.streaming_check)
+        layout.addWidget(self.http2_check)
+        rows = [(self.pool_size_label, self.pool_size_spin),
+                (self.max_per_host_label, self.max_per_host_spin),
+                (self.idle_timeout_label, self.idle_timeout_spin),
+                (self.max_concurrent_label, self.max_concurrent_spin),
+                (self.max_concurrent_host_label, self.max_concurrent_host_spin),
+                (self.transport_label, self.transport_combo),
+                (self.process_pool_label, self.process_pool_spin)]
+        rows += [(self.timeout_labels[key], spin) for key, spin in self.timeout_spins.items()]
+        rows += [(self.spill_threshold_label, self.spill_threshold_spin),
+                 (self.stream_preview_label, self.stream_preview_spin)]
+        for lbl, spin in rows:
+            hlayout = QHBoxLayout()
+            hlayout.addWidget(lbl)
+            hlayout.addStretch()
+            hlayout.addWidget(spin)
+            layout.addLayout(hlayout)
+        layout.addStretch()
+        self.load_current_settings()
+    def get_settings(self):
+        return {
+            'http_pool_size': self.pool_size_spin.value(),
+            'http_pool_max_per_host': self.max_per_host_spin.value(),
+            'http_pool_idle_timeout': self.idle_timeout_spin.value(),
+            'max_concurrent_requests': self.max_concurrent_spin.value(),
+            'max_concurrent_per_host': self.max_concurrent_host_spin.value(),
+            'request_transport': self.transport_combo.currentData(),
+            'process_pool_size': self.process_pool_spin.value(),
+            **{key: spin.value() for key, spin in self.timeout_spins.items()},
+            'response_streaming': self.streaming_check.isChecked(),
+            'http2_enabled': self.http2_check.isChecked(),
+            'stream_spill_threshold_mb': self.spill_threshold_spin.value(),
+            'stream_preview_kb': self.stream_preview_spin.value(),
+        }
+    def load_current_settings(self):
+        s = load_settings()
+        self.pool_size_spin.setValue(s.get('http_pool_size', 10))
+        self.max_per_host_spin.setValue(s.get('http_pool_max_per_host', 6))
+        self.idle_timeout_spin.setValue(s.get('http_pool_idle_timeout', 90))
+        self.max_concurrent_spin.setValue(s.get('max_concurrent_requests', 6))
+        self.max_concurrent_host_spin.setValue(s.get('max_concurrent_per_host', 4))
+        self.transport_combo.setCurrentIndex(max(0, self.transport_combo.findData(s.get('request_transport', 'thread'))))
+        self.process_pool_spin.setValue(s.get('process_pool_size', 2))
+        for key, spin in self.timeout_spins.items():
+            spin.setValue(s.get(key, 0))
+        self.streaming_check.setChecked(s.get('response_streaming', True))
+        self.http2_check.setChecked(s.get('http2_enabled', False))
+        self.spill_threshold_spin.setValue(s.get('stream_spill_threshold_mb', 32))
+        self.stream_preview_spin.setValue(s.get('stream_preview_kb', 1024))
+    def refresh_texts(self):
+        self.label.setText(get_text('network') + ':')
+        self.pool_size_label.setText(get_text('http_pool_size'))
+        self.max_per_host_label.setText(get_text('http_pool_max_per_host'))
+        self.idle_timeout_label.setText(get_text('http_pool_idle_timeout'))
+        self.max_concurrent_label.setText(get_text('max_concurrent_requests'))
+        self.max_concurrent_host_label.setText(get_text('max_concurrent_per_host'))
+        self.transport_label.setText(get_text('request_transport'))
+        self.transport_combo.setItemText(0, get_text('request_transport_thread'))
+        self.transport_combo.setItemText(1, get_text('request_transport_async'))
+        self.transport_combo.setItemText(2, get_text('request_transport_process'))
+        self.process_pool_label.setText(get_text('process_pool_size'))
+        for key, label in self.timeout_labels.items():
+            label.setText(get_text(key))
+        self.transport_combo.setToolTip(get_text('request_transport_tooltip'))
+        self.streaming_check.setText(get_text('response_streaming'))
+        self.http2_check.setText(get_text('http2_enabled'))
+        self.http2_check.setToolTip(get_text('http2_tooltip'))
+        self.spill_threshold_label.setText(get_text('stream_spill_threshold_mb'))
+        self.stream_preview_label.setText(get_text('stream_preview_kb'))
+
+class LargeContentPanel(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        self.label = QLabel(get_text('large_content') + ':')
+        layout.addWidget(self.label)
+        self.viewer_threshold_label = QLabel(get_text('large_body_viewer_threshold_kb'))
+        self.viewer_threshold_spin = QSpinBox()
+        self.viewer_threshold_spin.setRange(64, 1048576)
+        self.json_format_label = QLabel(get_text('json_auto_format_max_kb'))
+        self.json_format_spin = QSpinBox()
+        self.json_format_spin.setRange(0, 1048576)
+        self.highlight_max_label = QLabel(get_text('highlight_max_size_kb'))
+        self.highlight_max_spin = QSpinBox()
+        self.highlight_max_spin.setRange(0, 1048576)
+        for lbl, spin in [(self.viewer_threshold_label, self.viewer_threshold_spin),
+                          (self.json_format_label, self.json_format_spin),
+                          (self.highlight_max_label, self.highlight_max_spin)]:
+            hlayout = QHBoxLayout()
+            hlayout.addWidget(lbl)
+            hlayout.addStretch()
+            hlayout.addWidget(spin)
+            layout.addLayout(hlayout)
+        layout.addStretch()
+        self.load_current_settings()
+    def get_settings(self):
+        return {
+            'large_body_viewer_threshold_kb': self.viewer_threshold_spin.value(),
+            'json_auto_format_max_kb': self.json_format_spin.value(),
+            'highlight_max_size_kb': self.highlight_max_spin.value(),
+        }
+    def load_current_settings(self):
+        s = load_settings()
+        self.viewer_threshold_spin.setValue(s.get('large_body_viewer_threshold_kb', 2048))
+        self.json_format_spin.setValue(s.get('json_auto_format_max_kb', 5120))
+        self.highlight_max_spin.setValue(s.get('highlight_max_size_kb', 2048))
+    def refresh_texts(self):
+        self.label.setText(get_text('large_content') + ':')
+        self.viewer_threshold_label.setText(get_text('large_body_viewer_threshold_kb'))
+        self.json_format_label.setText(get_text('json_auto_format_max_kb'))
+        self.highlight_max_label.setText(get_text('highlight_max_size_kb'))
+
+class HistorySettingsPanel(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        self.label = QLabel(get_text('history') + ':')
+        layout.addWidget(self.label)
+        self.enabled_check = QCheckBox(get_text('history_enabled'))
+        layout.addWidget(self.enabled_check)
+        self.spins = {}
+        self.spin_labels = {}
+        for key, maximum in [('history_max_entries', 10000000), ('history_max_days', 36500),
+                             ('history_max_mb', 1048576), ('history_max_body_kb', 1048576)]:
+            label = QLabel(get_text(key))
+            spin = QSpinBox()
+            spin.setRange(0, maximum)
+            self.spin_labels[key] = label
+            self.spins[key] = spin
+            hlayout = QHBoxLayout()
+            hlayout.addWidget(label)
+            hlayout.addStretch()
+            hlayout.addWidget(spin)
+            layout.addLayout(hlayout)
+        layout.addStretch()
+        self.load_current_settings()
+    def get_settings(self):
+        settings = {key: spin.value() for key, spin in self.spins.items()}
+        settings['history_enabled'] = self.enabled_check.isChecked()
+        return settings
+    def load_current_settings(self):
+        s = load_settings()
+        self.enabled_check.setChecked(s.get('history_enabled', True))
+        for key, spin in self.spins.items():
+            spin.setValue(s.get(key, 0))
+    def refresh_texts(self):
+        self.label.setText(get_text('history') + ':')
+        self.enabled_check.setText(get_text('history_enabled'))
+        for key, label in self.spin_labels.items():
+            label.setText(get_text(key))
+
+class DnsSettingsPanel(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        self.label = QLabel(get_text('dns') + ':')
+        layout.addWidget(self.label)
+        self.enabled_check = QCheckBox(get_text('dns_cache_enabled'))
+        layout.addWidget(self.enabled_check)
+        self.spins = {}
+        self.spin_labels = {}
+        for key in ('dns_cache_ttl', 'dns_negative_ttl'):
+            label = QLabel(get_text(key))
+            spin = QSpinBox()
+            spin.setRange(0, 86400)
+            self.spin_labels[key] = label
+            self.spins[key] = spin
+            hlayout = QHBoxLayout()
+            hlayout.addWidget(label)
+            hlayout.addStretch()
+            hlayout.addWidget(spin)
+            layout.addLayout(hlayout)
+        self.overrides_label = QLabel(get_text('dns_overrides'))
+        layout.addWidget(self.overrides_label)
+        self.table = QTableWidget(0, 2)
+        self.table.setHorizontalHeaderLabels([get_text('dns_override_host'), get_text('dns_override_addresses')])
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+        btn_layout = QHBoxLayout()
+        self.add_btn = QPushButton(get_text('dns_override_add'))
+        self.remove_btn = QPushButton(get_text('dns_override_remove'))
+        self.flush_btn = QPushButton(get_text('dns_flush'))
+        self.stats_label = QLabel()
+        self.add_btn.clicked.connect(self.add_override)
+        self.remove_btn.clicked.connect(self.remove_override)
+        self.flush_btn.clicked.connect(self.flush_cache)
+        btn_layout.addWidget(self.add_btn)
+        btn_layout.addWidget(self.remove_btn)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.stats_label)
+        btn_layout.addWidget(self.flush_btn)
+        layout.addLayout(btn_layout)
+        self.load_current_settings()
+    def add_override(self):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.table.setItem(row, 0, QTableWidgetItem(''))
+        self.table.setItem(row, 1, QTableWidgetItem(''))
+        self.table.editItem(self.table.item(row, 0))
+    def remove_override(self):
+        rows = sorted({index.row() for index in self.table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            self.table.removeRow(row)
+    def flush_cache(self):
+        from ui.utils.dns_cache import flush_dns_cache
+        flush_dns_cache()
+        self.update_stats()
+    def update_stats(self):
+        from ui.utils.dns_cache import get_dns_cache
+        self.stats_label.setText(get_text('dns_cache_stats').format(**get_dns_cache().stats()))
+    def overrides(self):
+        overrides = {}
+        for row in range(self.table.rowCount()):
+            host = self.table.item(row, 0).text().strip() if self.table.item(row, 0) else ''
+            addresses = self.table.item(row, 1).text().strip() if self.table.item(row, 1) else ''
+            if host and addresses:
+                overrides[host] = addresses.replace(',', ' ').split()
+        return overrides
+    def validate(self):
+        """检查手动指定的地址，返回 (是否有效, 错误信息)"""
+        from ui.utils.dns_cache import parse_overrides
+        for host, addresses in self.overrides().items():
+            try:
+                parse_overrides({host: addresses})
+            except ValueError as e:
+                return False, get_text('dns_override_invalid').format(host=host, error=e)
+        return True, ''
+    def get_settings(self):
+        settings = {key: spin.value() for key, spin in self.spins.items()}
+        settings['dns_cache_enabled'] = self.enabled_check.isChecked()
+        settings['dns_overrides'] = self.overrides()
+        return settings
+    def load_current_settings(self):
+        s = load_settings()
+        self.enabled_check.setChecked(s.get('dns_cache_enabled', False))
+        for key, spin in self.spins.items():
+            spin.setValue(s.get(key, 0))
+        overrides = s.get('dns_overrides', {})
+        self.table.setRowCount(0)
+        for host, addresses in overrides.items():
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            self.table.setItem(row, 0, QTableWidgetItem(host))
+            text = addresses if isinstance(addresses, str) else ', '.join(addresses)
+            self.table.setItem(row, 1, QTableWidgetItem(text))
+        self.update_stats()
+    def refresh_texts(self):
+        self.label.setText(get_text('dns') + ':')
+        self.enabled_check.setText(get_text('dns_cache_enabled'))
+        for key, label in self.spin_labels.items():
+            label.setText(get_text(key))
+        self.overrides_label.setText(get_text('dns_overrides'))
+        self.table.setHorizontalHeaderLabels([get_text('dns_override_host'), get_text('dns_override_addresses')])
+        self.add_btn.setText(get_text('dns_override_add'))
+        self.remove_btn.setText(get_text('dns_override_remove'))
+        self.flush_btn.setText(get_text('dns_flush'))
+        self.update_stats()
+
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -312,6 +638,8 @@ class SettingsDialog(QDialog):
         shortcut.setData(0, Qt.UserRole, 'shortcut_key')
         language = QTreeWidgetItem(general, [get_text('language')])
         language.setData(0, Qt.UserRole, 'language')
+        history = QTreeWidgetItem(general, [get_text('history')])
+        history.setData(0, Qt.UserRole, 'history')
         appearance = QTreeWidgetItem(self.tree, [get_text('appearance')])
         appearance.setData(0, Qt.UserRole, 'appearance')
         theme = QTreeWidgetItem(appearance, [get_text('theme')])
@@ -324,6 +652,12 @@ class SettingsDialog(QDialog):
         editor_font.setData(0, Qt.UserRole, 'font')
         editor_tab = QTreeWidgetItem(editor, [get_text('tab')])
         editor_tab.setData(0, Qt.UserRole, 'tab')
+        editor_large = QTreeWidgetItem(editor, [get_text('large_content')])
+        editor_large.setData(0, Qt.UserRole, 'large_content')
+        network = QTreeWidgetItem(self.tree, [get_text('network')])
+        network.setData(0, Qt.UserRole, 'network')
+        dns_item = QTreeWidgetItem(network, [get_text('dns')])
+        dns_item.setData(0, Qt.UserRole, 'dns')
         self.tree.expandAll()
         self.tree.setMaximumWidth(180)
         # 右侧stack
@@ -336,6 +670,10 @@ class SettingsDialog(QDialog):
             'font_appearance': AppearanceFontPanel(),
             'font_editor': EditorFontPanel(),
             'tab_editor': EditorTabPanel(),  # 新增Tab设置
+            'network': NetworkPanel(),
+            'large_content': LargeContentPanel(),
+            'history': HistorySettingsPanel(),
+            'dns': DnsSettingsPanel(),
         }
         self.stack.addWidget(self.panels['data directory'])      # 0
         self.stack.addWidget(self.panels['shortcut key'])        # 1
@@ -344,6 +682,10 @@ class SettingsDialog(QDialog):
         self.stack.addWidget(self.panels['font_appearance'])     # 4
         self.stack.addWidget(self.panels['font_editor'])         # 5
         self.stack.addWidget(self.panels['tab_editor'])          # 6 新增
+        self.stack.addWidget(self.panels['network'])             # 7
+        self.stack.addWidget(self.panels['large_content'])       # 8
+        self.stack.addWidget(self.panels['history'])             # 9
+        self.stack.addWidget(self.panels['dns'])                 # 10
         main_layout.addWidget(self.tree)
         main_layout.addWidget(self.stack, 1)
         # 选项树切换逻辑
@@ -400,12 +742,18 @@ class SettingsDialog(QDialog):
                 self.stack.setCurrentWidget(self.panels['theme'])
             elif key == 'editor':
                 self.stack.setCurrentWidget(self.panels['font_editor'])
+            elif key == 'network':
+                self.stack.setCurrentWidget(self.panels['network'])
     def on_ok(self):
         data_panel = self.panels['data directory']
         valid, msg = data_panel.validate_paths()
         if not valid:
             QMessageBox.warning(self, get_text('warning'), get_text('collection_path_invalid') if 'collections' in msg else get_text('log_path_invalid'))
             return
+        valid, msg = self.panels['dns'].validate()
+        if not valid:
+            QMessageBox.warning(self, get_text('warning'), msg)
+            return
         changed = data_panel.is_changed()
         s = load_settings()
         s.update(data_panel.get_settings())
@@ -413,6 +761,32 @@ class SettingsDialog(QDialog):
         s.update(self.panels['tab_editor'].get_settings())
         # 保存快捷键设置
         s.update(self.panels['shortcut key'].get_settings())
+        # 保存大文件显示设置
+        s.update(self.panels['large_content'].get_settings())
+        # 保存网络设置，并立即生效
+        s.update(self.panels['network'].get_settings())
+        from ui.utils.session_pool import apply_pool_settings
+        apply_pool_settings(s)
+        from ui.utils.multiprocess_worker import apply_process_pool_settings
+        apply_process_pool_settings(s)
+        # 保存DNS设置，清空已缓存的解析结果
+        s.update(self.panels['dns'].get_settings())
+        from ui.utils.dns_cache import apply_dns_settings
+        apply_dns_settings(s)
+        scheduler = getattr(self.parent(), 'request_scheduler', None)
+        if scheduler is not None:
+            scheduler.configure(max_concurrent=s['max_concurrent_requests'],
+                                max_per_host=s['max_concurrent_per_host'])
+        # 保存历史记录设置，保留策略在下一次写入时生效
+        s.update(self.panels['history'].get_settings())
+        history_store = getattr(self.parent(), 'history_store', None)
+        if history_store is not None:
+            history_store.configure(s['history_max_entries'], s['history_max_days'],
+                                    s['history_max_mb'], s['history_max_body_kb'])
+        saver = getattr(self.parent(), 'collection_saver', None)
+        if saver is not None:
+            saver.configure(debounce_ms=s['collections_save_delay_ms'],
+                            compact=s['collections_compact_json'])
         # 保存Appearance字体设置，并立即生效
         font_settings = self.panels['font_appearance'].get_settings()
         s.update(font_settings)
@@ -3,11 +3,14 @@
 
 import os
 import sys
+import time
 import logging
 import json
 import psutil  # 添加内存监控
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QTabWidget,
+    QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QTabWidget, QStackedWidget,
     QMenuBar, QMenu, QAction, QFrame, QLabel, QPushButton,
     QTreeWidget, QTreeWidgetItem, QListWidget, QTextEdit,
     QLineEdit, QFileDialog, QMessageBox, QApplication,
@@ -26,7 +29,7 @@ from PyQt5.QtWidgets import (
     QGridLayout, QSpacerItem, QSizePolicy, QInputDialog
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QEventLoop
-from PyQt5.QtGui import QIcon, QFont, QKeySequence, QClipboard, QPixmap
+from PyQt5.QtGui import QIcon, QFont, QKeySequence, QClipboard, QPixmap, QTextCursor
 # from PyQt5.QtWebEngineWidgets import QWebEngineView  # 暂时注释掉，避免导入错误
 
 # 导入自定义模块
@@ -34,17 +37,33 @@ from .widgets.code_editor import CodeEditor
 from .widgets.json_highlighter import JsonHighlighter
 from .widgets.request_editor import RequestEditor
 from .widgets.loading_overlay import RespLoadingOverlay
-from .utils.request_worker import RequestWorker
-from .utils.multiprocess_worker import MultiprocessRequestWorker
+from .widgets.large_text_viewer import LargeTextViewer
+from .widgets.history_panel import HistoryPanel
+from .utils.request_worker import create_request_worker, timeouts_from_settings
+from .utils.request_timing import format_timing
+from .utils.multiprocess_worker import apply_process_pool_settings
+from .utils.request_scheduler import RequestScheduler
+from .utils.session_pool import close_session_pool
+from .utils.request_builder import build_request, use_http2
+from .utils.response_store import ResponseBody
+from .utils.json_formatter import JsonFormatWorker
+from .utils.collection_saver import CollectionSaver
 from .utils.markdown_converter import MarkdownConverter
 from .dialogs.about_dialog import AboutDialog
-from .models.collection_manager import CollectionManager
+from .models.collection_manager import CollectionManager, NODE_KIND_ROLE, NODE_COLLECTION, NODE_REQUEST, node_kind
+from .models.collection_store import ShardedCollectionStore, shard_directory
+from .models.history_store import HistoryStore, history_path_for
+from .models.request_path_index import RequestPathIndex
+from .models.search_index import tokenize
 from PyQt5.QtWidgets import QTabWidget
 from ui.collection_tree_widget import CollectionTreeWidget
 from ui.dialogs.settings_dialog import SettingsDialog
 from ui.utils.settings_manager import load_settings
 from ui.utils.i18n import get_text
 
+SHARD_ROLE = Qt.UserRole + 2  # 尚未读取分片的顶级集合：分片文件名
+LAZY_ROLE = Qt.UserRole + 3  # 尚未创建子节点的集合：待创建子节点的编号
+
 
 class MainWindow(QWidget):
     """主窗口 - 重构版本"""
@@ -52,8 +71,6 @@ class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
         self._req_thread = None  # 修复首次请求时的线程属性异常
-        self._req_worker = None  # 修复首次请求时的工作器属性异常
-        self._sending_request = False  # 修复发送状态属性异常
         self._workspace_dir = self.get_workspace_dir()
         self._app_icon = QIcon(self.get_icon_path())
         self.collection_manager = CollectionManager(self._workspace_dir)
@@ -75,10 +92,55 @@ class MainWindow(QWidget):
         self._collections_path = self._settings.get('collections_path')
         self._log_path = self._settings.get('log_path')
         
+        # 请求调度器：限制全局和单主机并发，超出的请求排队
+        self.request_scheduler = RequestScheduler(
+            max_concurrent=self._settings.get('max_concurrent_requests', 6),
+            max_per_host=self._settings.get('max_concurrent_per_host', 4),
+            parent=self,
+        )
+        self.request_scheduler.job_finished.connect(self._on_job_finished)
+        self.request_scheduler.job_error.connect(self._on_job_error)
+        self.request_scheduler.job_stopped.connect(self._on_job_stopped)
+        self.request_scheduler.queue_changed.connect(self._on_request_queue_changed)
+        # 多进程传输：启动时预启动进程池，首个请求无需等待进程启动
+        apply_process_pool_settings(self._settings)
+        self._file_handles_to_close = {}  # editor -> 上传文件句柄列表
+        self._lazy_children = {}  # 编号 -> 尚未创建树节点的子节点数据
+        self._next_lazy_key = 1
+        self._request_queue_dialog = None
+
+        # 可选的分片存储：每个顶级集合一个文件，展开时才读取
+        self._collection_store = None
+        if self._settings.get('collections_sharded', False):
+            self._collection_store = ShardedCollectionStore(shard_directory(self.get_collections_path()))
+            # 搜索时读取尚未展开的分片（只读，不创建树节点）
+            self.collection_manager.model.search.loader = (
+                lambda node: self._collection_store.load_shard(node['shard'], node.get('name')))
+        # 集合持久化：合并短时间内的多次修改，后台原子写入
+        self.collection_saver = CollectionSaver(
+            debounce_ms=self._settings.get('collections_save_delay_ms', 500),
+            compact=self._settings.get('collections_compact_json', False),
+            store=self._collection_store,
+            parent=self,
+        )
+        self.collection_saver.saved.connect(self._on_collections_saved)
+        self.collection_saver.save_failed.connect(self._on_collections_save_failed)
+        # 请求历史：与集合文件同目录的SQLite数据库，后台线程写入
+        self.history_store = HistoryStore(
+            history_path_for(self.get_collections_path()),
+            max_entries=self._settings.get('history_max_entries', 100000),
+            max_days=self._settings.get('history_max_days', 30),
+            max_mb=self._settings.get('history_max_mb', 512),
+            max_body_kb=self._settings.get('history_max_body_kb', 1024),
+        )
+        self._history_snapshots = {}  # editor -> (请求快照, 发送的URL, 发送时间)
+        
         self._shortcut_objs = []  # 保存QShortcut对象，便于刷新
         
         self.init_logging()
         self.init_ui()
+        # 请求路径 -> 树节点 -> 打开的Tab 的索引
+        self.path_index = RequestPathIndex(self.collection_tree, lambda: self.req_tabs, self.ensure_collection_loaded)
         self.load_collections()
         self.refresh_shortcuts()  # 初始化快捷键
         
@@ -145,6 +207,12 @@ class MainWindow(QWidget):
         file_menu.addAction(preferences_action)
         file_menu.addSeparator()
         file_menu.addAction(exit_action)
+        # View菜单
+        view_menu = menubar.addMenu(get_text('menu_view'))
+        view_menu.setProperty('_i18n_key', 'menu_view')
+        request_queue_action = QAction(get_text('request_queue'), self)
+        request_queue_action.setProperty('_i18n_key', 'request_queue')
+        view_menu.addAction(request_queue_action)
         # Help菜单
         help_menu = menubar.addMenu(get_text('menu_help'))
         help_menu.setProperty('_i18n_key', 'menu_help')
@@ -165,6 +233,7 @@ class MainWindow(QWidget):
         save_all_action.triggered.connect(self.save_all)
         preferences_action.triggered.connect(self.show_preferences_dialog)
         exit_action.triggered.connect(self.close)
+        request_queue_action.triggered.connect(self.show_request_queue)
         about_action.triggered.connect(self.show_about)
         doc_action.triggered.connect(self.show_doc)
         contact_action.triggered.connect(self.show_contact)
@@ -231,8 +300,9 @@ class MainWindow(QWidget):
         self.left_tab.addTab(self.env_list, 'Environments')
         
         # History Tab
-        self.history_list = QListWidget()
-        self.left_tab.addTab(self.history_list, 'History')
+        self.history_panel = HistoryPanel(self.history_store)
+        self.history_panel.open_requested.connect(self.open_history_entry)
+        self.left_tab.addTab(self.history_panel, 'History')
         
         left_layout.addWidget(self.left_tab)
         left_widget.setMinimumWidth(200)
@@ -256,12 +326,27 @@ class MainWindow(QWidget):
         self.collection_tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.collection_tree.setDragEnabled(True)
         self.collection_tree.setAcceptDrops(True)
+
+        # 搜索框：输入时按全文索引过滤集合树
+        self.collection_search_edit = QLineEdit()
+        self.collection_search_edit.setObjectName('CollectionSearch')
+        self.collection_search_edit.setPlaceholderText(get_text('search_collections_placeholder'))
+        self.collection_search_edit.setClearButtonEnabled(True)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self.filter_collection_tree)
+        self.collection_search_edit.textChanged.connect(lambda _: self._search_timer.start())
+        self._search_visible = None  # 过滤时应显示的路径集合，None 表示不过滤
+        collections_layout.addWidget(self.collection_search_edit)
         
         # 默认集合
         root = QTreeWidgetItem(self.collection_tree, ['Default Collection'])
         root.setIcon(0, self.folder_icon)
+        root.setData(0, NODE_KIND_ROLE, NODE_COLLECTION)
         demo_req = QTreeWidgetItem(root, ['GET Example Request'])
         demo_req.setIcon(0, self.file_icon)
+        demo_req.setData(0, NODE_KIND_ROLE, NODE_REQUEST)
         
         collections_layout.addWidget(self.collection_tree)
         
@@ -269,6 +354,8 @@ class MainWindow(QWidget):
         self.collection_tree.customContextMenuRequested.connect(self.show_collection_menu)
         self.collection_tree.itemDoubleClicked.connect(self.on_collection_item_double_clicked)
         self.collection_tree.itemClicked.connect(self.on_collection_item_clicked)
+        self.collection_tree.itemExpanded.connect(self.ensure_collection_loaded)
+        self.collection_tree.itemExpanded.connect(self._apply_search_filter_to_children)
         
         return collections_panel
         
@@ -476,8 +563,11 @@ class MainWindow(QWidget):
         status_row.addWidget(resp_status_label)
         status_row.addStretch()
         
+        format_resp_btn = QPushButton('Format JSON')
+        format_resp_btn.setVisible(False)  # 仅在JSON过大未自动格式化时显示
         save_resp_btn = QPushButton('Save Response to File')
         clear_resp_btn = QPushButton('Clear Response')
+        status_row.addWidget(format_resp_btn)
         status_row.addWidget(save_resp_btn)
         status_row.addWidget(clear_resp_btn)
         resp_body_layout.addLayout(status_row)
@@ -485,8 +575,13 @@ class MainWindow(QWidget):
         # Response Body编辑器
         resp_body_edit = CodeEditor()
         resp_body_edit.setReadOnly(True)
-        resp_json_highlighter = JsonHighlighter(resp_body_edit.document())
-        resp_body_layout.addWidget(resp_body_edit)
+        resp_json_highlighter = JsonHighlighter(resp_body_edit.document(), editor=resp_body_edit)
+        # 大响应体使用虚拟化查看器，与编辑器放在同一个堆栈中切换
+        resp_large_viewer = LargeTextViewer()
+        resp_body_stack = QStackedWidget()
+        resp_body_stack.addWidget(resp_body_edit)
+        resp_body_stack.addWidget(resp_large_viewer)
+        resp_body_layout.addWidget(resp_body_stack)
         resp_body_widget.setLayout(resp_body_layout)
         resp_tabs.addTab(resp_body_widget, 'Body')
         
@@ -494,6 +589,15 @@ class MainWindow(QWidget):
         resp_headers_widget = QTextEdit()
         resp_headers_widget.setReadOnly(True)
         resp_tabs.addTab(resp_headers_widget, 'Headers')
+
+        # Timing Tab：各阶段耗时的文本瀑布图，需要等宽字体对齐
+        resp_timing_widget = QTextEdit()
+        resp_timing_widget.setReadOnly(True)
+        resp_timing_widget.setLineWrapMode(QTextEdit.NoWrap)
+        timing_font = QFont(load_settings().get('editor_font_family', 'Consolas'))
+        timing_font.setStyleHint(QFont.Monospace)
+        resp_timing_widget.setFont(timing_font)
+        resp_tabs.addTab(resp_timing_widget, 'Timing')
         resp_card_layout.addWidget(resp_tabs)
         resp_card.setLayout(resp_card_layout)
         
@@ -505,17 +609,28 @@ class MainWindow(QWidget):
         clear_resp_btn.clicked.connect(lambda: self.clear_response(tab_index))
         
         # 返回Response组件字典
-        return {
+        response_widget = {
             'card': resp_card,
             'tabs': resp_tabs,
             'status_label': resp_status_label,
             'body_edit': resp_body_edit,
             'headers_widget': resp_headers_widget,
+            'timing_widget': resp_timing_widget,
             'loading_overlay': resp_loading_overlay,
             'save_btn': save_resp_btn,
             'clear_btn': clear_resp_btn,
             'json_highlighter': resp_json_highlighter,  # 新增
+            'body_stack': resp_body_stack,
+            'large_viewer': resp_large_viewer,
+            'response_body': None,
+            'format_btn': format_resp_btn,
+            'json_formatter': JsonFormatWorker(resp_card),
         }
+        formatter = response_widget['json_formatter']
+        formatter.finished.connect(lambda gen, text: self._on_response_json_formatted(response_widget, gen, text))
+        formatter.error.connect(lambda gen, msg: self._on_response_json_format_error(response_widget, gen, msg))
+        format_resp_btn.clicked.connect(lambda: self.format_response_json(response_widget))
+        return response_widget
 
     def get_tab_key(self, idx):
         tab_text = self.req_tabs.tabText(idx)
@@ -553,6 +668,7 @@ class MainWindow(QWidget):
             tab_key = self.get_tab_key(tab_index)
             if tab_key in self.response_widgets:
                 response_widget = self.response_widgets[tab_key]
+                self._set_response_body(response_widget, None)
                 self.resp_container_layout.removeWidget(response_widget['card'])
                 response_widget['card'].deleteLater()
                 del self.response_widgets[tab_key]
@@ -562,6 +678,7 @@ class MainWindow(QWidget):
         self.fix_all_collection_icons()
         from PyQt5.QtWidgets import QInputDialog, QMessageBox, QTreeWidgetItem
         selected_item = self.collection_tree.currentItem()
+        self.ensure_collection_loaded(selected_item)
         if selected_item and self.is_request_node(selected_item):
             QMessageBox.information(
                 self,
@@ -603,7 +720,7 @@ class MainWindow(QWidget):
             if parent_collection is None:
                 new_item = QTreeWidgetItem(['Default Collection'])
                 new_item.setIcon(0, self.folder_icon)
-                new_item.setData(0, Qt.UserRole+1, 'collection')
+                new_item.setData(0, NODE_KIND_ROLE, NODE_COLLECTION)
                 self.collection_tree.addTopLevelItem(new_item)
                 parent_collection = new_item
 
@@ -626,18 +743,18 @@ class MainWindow(QWidget):
         temp_item.setParent(None)  # 清理
 
         # 新建Tab前，先查找是否已存在
-        for i in range(self.req_tabs.count()):
-            print(f'[DEBUG] before add: tabData[{i}]={{self.req_tabs.tabBar().tabData(i)}}')
-            if self.req_tabs.tabBar().tabData(i) == request_path:
-                self.req_tabs.setCurrentIndex(i)
-                print(f'[DEBUG] Prevent duplicate tab for {{request_path}}')
-                return
+        existing = self.path_index.tab_for_path(request_path)
+        if existing is not None:
+            self.req_tabs.setCurrentWidget(existing)
+            print(f'[DEBUG] Prevent duplicate tab for {request_path}')
+            return
 
         # 真正新建
         from ui.widgets.request_editor import RequestEditor
         req_editor = RequestEditor(self, req_name=request_name)
         tab_index = self.req_tabs.addTab(req_editor, request_path)
         self.req_tabs.tabBar().setTabData(tab_index, request_path)  # tabText和tabData完全一致
+        self.path_index.bind_tab(req_editor, request_path)  # 树节点在保存到集合后按路径查找
         print(f'[DEBUG] setTabData: tab_index={tab_index}, request_path={request_path}')
         self.req_tabs.setCurrentWidget(req_editor)
         self.show_response_for_tab(tab_index)
@@ -664,8 +781,8 @@ class MainWindow(QWidget):
         # 创建树节点
         new_item = QTreeWidgetItem([request_name])
         new_item.setIcon(0, self.file_icon)
-        new_item.setData(0, Qt.UserRole, req_data)
-        new_item.setData(0, Qt.UserRole+1, 'request')
+        self.set_request_payload(new_item, req_data)
+        new_item.setData(0, NODE_KIND_ROLE, NODE_REQUEST)
         
         if parent_collection:
             # 添加到父集合
@@ -682,96 +799,22 @@ class MainWindow(QWidget):
 
     def on_collection_item_clicked(self, item, column):
         """集合项单击事件（用tabBar().setTabData做唯一性判断+调试输出）"""
-        if item.childCount() == 0 and item.parent() is not None and item.icon(0).cacheKey() == self.file_icon.cacheKey():
+        if item.parent() is not None and self.is_request_node(item):
             self.ensure_req_tabs()
-            def get_request_path(item):
-                path_parts = []
-                current = item
-                while current is not None:
-                    path_parts.insert(0, current.text(0))
-                    current = current.parent()
-                return '/'.join(path_parts)
-            request_path = get_request_path(item)
+            request_path = self.build_item_path(item)
             print(f"DEBUG: request_path={request_path!r}")
-            for i in range(self.req_tabs.count()):
-                print(f"Tab {i}: tabText={self.req_tabs.tabText(i)!r}, tabData={self.req_tabs.tabBar().tabData(i)!r}")
-                if self.req_tabs.tabBar().tabData(i) == request_path:
-                    print(f"DEBUG: Found existing tab for {request_path!r} at index {i}")
-                    self.req_tabs.setCurrentIndex(i)
-                    return
+            existing = self.path_index.tab_for_path(request_path)
+            if existing is not None:
+                print(f"DEBUG: Found existing tab for {request_path!r}")
+                self.req_tabs.setCurrentWidget(existing)
+                return
             req_data = self.get_request_data_from_tree(item)
             req_editor = RequestEditor(self, req_name=item.text(0))
             if req_data:
-                req_editor.method_combo.setCurrentText(req_data.get('method', 'GET'))
-                req_editor.url_edit.setText(req_data.get('url', ''))
-                # Params
-                req_editor.params_table.setRowCount(1)
-                for i, param in enumerate(req_data.get('params', [])):
-                    if i >= req_editor.params_table.rowCount()-1:
-                        req_editor.params_table.insertRow(req_editor.params_table.rowCount())
-                        req_editor.add_table_row(req_editor.params_table, req_editor.params_table.rowCount()-1)
-                    req_editor.params_table.setItem(i, 1, QTableWidgetItem(param.get('key', '')))
-                    req_editor.params_table.setItem(i, 2, QTableWidgetItem(param.get('value', '')))
-                # Headers
-                req_editor.headers_table.setRowCount(1)
-                for i, h in enumerate(req_data.get('headers', [])):
-                    if i >= req_editor.headers_table.rowCount()-1:
-                        req_editor.headers_table.insertRow(req_editor.headers_table.rowCount())
-                        req_editor.add_table_row(req_editor.headers_table, req_editor.headers_table.rowCount()-1)
-                    req_editor.headers_table.setItem(i, 1, QTableWidgetItem(h.get('key', '')))
-                    req_editor.headers_table.setItem(i, 2, QTableWidgetItem(h.get('value', '')))
-                req_editor.refresh_table_widgets(req_editor.headers_table)
-                # 只保留一个空白行
-                while req_editor.headers_table.rowCount() > len(req_data.get('headers', [])) + 1:
-                    req_editor.headers_table.removeRow(req_editor.headers_table.rowCount()-2)
-                # Body
-                body_type = req_data.get('body_type', 'none')
-                if body_type == 'form-data':
-                    req_editor.body_form_radio.setChecked(True)
-                    req_editor.form_table.setRowCount(1)
-                    for i, item in enumerate(req_data.get('body', [])):
-                        if i >= req_editor.form_table.rowCount()-1:
-                            req_editor.form_table.insertRow(req_editor.form_table.rowCount())
-                            req_editor.add_table_row(req_editor.form_table, req_editor.form_table.rowCount()-1)
-                        req_editor.form_table.setItem(i, 1, QTableWidgetItem(item.get('key', '')))
-                        # 设置Type列QComboBox
-                        type_combo = req_editor.form_table.cellWidget(i, 2)
-                        type_val = item.get('type', 'Text')
-                        if type_combo:
-                            idx = type_combo.findText(type_val)
-                            if idx >= 0:
-                                type_combo.setCurrentIndex(idx)
-                                req_editor.update_row_for_type(req_editor.form_table, i)
-                        # 设置Value列
-                        if type_val == 'File':
-                            req_editor.form_table.setItem(i, 3, QTableWidgetItem(item.get('value', '')))
-                            req_editor.update_row_for_type(req_editor.form_table, i)
-                        else:
-                            req_editor.form_table.setItem(i, 3, QTableWidgetItem(item.get('value', '')))
-                        # 设置Description列
-                        req_editor.form_table.setItem(i, 4, QTableWidgetItem(item.get('description', '')) if 'description' in item else QTableWidgetItem(''))
-                    # 只保留一个空白行
-                    while req_editor.form_table.rowCount() > len(req_data.get('body', [])) + 1:
-                        req_editor.form_table.removeRow(req_editor.form_table.rowCount()-2)
-                elif body_type == 'x-www-form-urlencoded':
-                    req_editor.body_url_radio.setChecked(True)
-                    req_editor.url_table.setRowCount(1)
-                    for i, item in enumerate(req_data.get('body', [])):
-                        if i >= req_editor.url_table.rowCount()-1:
-                            req_editor.url_table.insertRow(req_editor.url_table.rowCount())
-                            req_editor.add_table_row(req_editor.url_table, req_editor.url_table.rowCount()-1)
-                        req_editor.url_table.setItem(i, 1, QTableWidgetItem(item.get('key', '')))
-                        req_editor.url_table.setItem(i, 2, QTableWidgetItem(item.get('value', '')))
-                    while req_editor.url_table.rowCount() > len(req_data.get('body', [])) + 1:
-                        req_editor.url_table.removeRow(req_editor.url_table.rowCount()-2)
-                elif body_type == 'raw':
-                    req_editor.body_raw_radio.setChecked(True)
-                    req_editor.raw_text_edit.setPlainText(req_data.get('body', ''))
-                    req_editor.raw_type_combo.setCurrentText(req_data.get('raw_type', 'JSON'))
-                else:
-                    req_editor.body_none_radio.setChecked(True)
+                self.fill_request_editor(req_editor, req_data)
             tab_index = self.req_tabs.addTab(req_editor, request_path)
             self.req_tabs.tabBar().setTabData(tab_index, request_path)
+            self.path_index.bind_tab(req_editor, request_path, item)
             print(f"DEBUG: Added new tab for {request_path!r} at index {tab_index}")
             self.req_tabs.setCurrentWidget(req_editor)
             self.show_response_for_tab(tab_index)
@@ -779,71 +822,105 @@ class MainWindow(QWidget):
             pass
 
 
+    def fill_request_editor(self, req_editor, req_data):
+        """用请求数据（serialize_request 的格式）填充编辑器"""
+        req_editor.method_combo.setCurrentText(req_data.get('method', 'GET'))
+        req_editor.url_edit.setText(req_data.get('url', ''))
+        req_editor.set_http_version(req_data.get('http_version'))
+        # Params
+        req_editor.params_table.setRowCount(1)
+        for i, param in enumerate(req_data.get('params', [])):
+            if i >= req_editor.params_table.rowCount()-1:
+                req_editor.params_table.insertRow(req_editor.params_table.rowCount())
+                req_editor.add_table_row(req_editor.params_table, req_editor.params_table.rowCount()-1)
+            req_editor.params_table.setItem(i, 1, QTableWidgetItem(param.get('key', '')))
+            req_editor.params_table.setItem(i, 2, QTableWidgetItem(param.get('value', '')))
+        # Headers
+        req_editor.headers_table.setRowCount(1)
+        for i, h in enumerate(req_data.get('headers', [])):
+            if i >= req_editor.headers_table.rowCount()-1:
+                req_editor.headers_table.insertRow(req_editor.headers_table.rowCount())
+                req_editor.add_table_row(req_editor.headers_table, req_editor.headers_table.rowCount()-1)
+            req_editor.headers_table.setItem(i, 1, QTableWidgetItem(h.get('key', '')))
+            req_editor.headers_table.setItem(i, 2, QTableWidgetItem(h.get('value', '')))
+        req_editor.refresh_table_widgets(req_editor.headers_table)
+        # 只保留一个空白行
+        while req_editor.headers_table.rowCount() > len(req_data.get('headers', [])) + 1:
+            req_editor.headers_table.removeRow(req_editor.headers_table.rowCount()-2)
+        # Body
+        body_type = req_data.get('body_type', 'none')
+        if body_type == 'form-data':
+            req_editor.body_form_radio.setChecked(True)
+            req_editor.form_table.setRowCount(1)
+            for i, item in enumerate(req_data.get('body', [])):
+                if i >= req_editor.form_table.rowCount()-1:
+                    req_editor.form_table.insertRow(req_editor.form_table.rowCount())
+                    req_editor.add_table_row(req_editor.form_table, req_editor.form_table.rowCount()-1)
+                req_editor.form_table.setItem(i, 1, QTableWidgetItem(item.get('key', '')))
+                # 设置Type列QComboBox
+                type_combo = req_editor.form_table.cellWidget(i, 2)
+                type_val = item.get('type', 'Text')
+                if type_combo:
+                    idx = type_combo.findText(type_val)
+                    if idx >= 0:
+                        type_combo.setCurrentIndex(idx)
+                        req_editor.update_row_for_type(req_editor.form_table, i)
+                # 设置Value列
+                if type_val == 'File':
+                    req_editor.form_table.setItem(i, 3, QTableWidgetItem(item.get('value', '')))
+                    req_editor.update_row_for_type(req_editor.form_table, i)
+                else:
+                    req_editor.form_table.setItem(i, 3, QTableWidgetItem(item.get('value', '')))
+                # 设置Description列
+                req_editor.form_table.setItem(i, 4, QTableWidgetItem(item.get('description', '')) if 'description' in item else QTableWidgetItem(''))
+            # 只保留一个空白行
+            while req_editor.form_table.rowCount() > len(req_data.get('body', [])) + 1:
+                req_editor.form_table.removeRow(req_editor.form_table.rowCount()-2)
+        elif body_type == 'x-www-form-urlencoded':
+            req_editor.body_url_radio.setChecked(True)
+            req_editor.url_table.setRowCount(1)
+            for i, item in enumerate(req_data.get('body', [])):
+                if i >= req_editor.url_table.rowCount()-1:
+                    req_editor.url_table.insertRow(req_editor.url_table.rowCount())
+                    req_editor.add_table_row(req_editor.url_table, req_editor.url_table.rowCount()-1)
+                req_editor.url_table.setItem(i, 1, QTableWidgetItem(item.get('key', '')))
+                req_editor.url_table.setItem(i, 2, QTableWidgetItem(item.get('value', '')))
+            while req_editor.url_table.rowCount() > len(req_data.get('body', [])) + 1:
+                req_editor.url_table.removeRow(req_editor.url_table.rowCount()-2)
+        elif body_type == 'raw':
+            req_editor.body_raw_radio.setChecked(True)
+            req_editor.raw_text_edit.setPlainText(req_data.get('body', ''))
+            req_editor.raw_type_combo.setCurrentText(req_data.get('raw_type', 'JSON'))
+        else:
+            req_editor.body_none_radio.setChecked(True)
+
     def get_request_data_from_tree(self, item):
-        """从collections.json结构递归查找对应request数据，支持同名但不同路径的request"""
-        def get_path(item):
-            path = []
-            while item:
-                path.insert(0, item.text(0))
-                item = item.parent()
-            return path
-        def find_req(nodes, path):
-            if not path:
-                return None
-            for node in nodes:
-                if node.get('type') == 'request' and node.get('name') == path[-1]:
-                    # 检查上级路径是否匹配
-                    parent = node
-                    matched = True
-                    for i in range(len(path)-2, -1, -1):
-                        parent = parent.get('parent')
-                        if not parent or parent.get('name') != path[i]:
-                            matched = False
-                            break
-                    if matched:
-                        return node.get('request', {})
-                elif node.get('type') == 'collection':
-                    # 递归查找，并传递 parent
-                    for child in node.get('children', []):
-                        child['parent'] = node
-                    result = find_req(node.get('children', []), path)
-                    if result:
-                        return result
-            return None
-        # 加载collections.json数据
-        path = self.get_collections_path()
-        if not os.path.exists(path):
-            return None
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            item_path = get_path(item)
-            return find_req(data, item_path)
-        except Exception:
-            return None
+        """查找树节点对应的request数据，支持同名但不同路径的request"""
+        req_data = self.request_payload(item)
+        if req_data:
+            return req_data
+        path = []
+        while item:
+            path.insert(0, item.text(0))
+            item = item.parent()
+        return self.collection_manager.model.find_request(path)
 
     def send_request(self, editor=None):
-        """发送请求 - threading版本"""
+        """发送请求 - 交给请求调度器，每个Tab可以各自有一个进行中的请求"""
         # 修复：没有请求标签时不执行
         if not hasattr(self, 'req_tabs') or self.req_tabs is None or self.req_tabs.count() == 0:
             return
         try:
             self.ensure_req_tabs()
-            if self._sending_request:
-                print("已有请求正在发送中，忽略此次点击")
-                return
             if editor is None:
                 editor = self.req_tabs.currentWidget()
             if editor is None:
                 self.log_warning('未找到请求编辑器')
                 return
+            if self.request_scheduler.is_busy(editor):
+                print("该标签页已有请求正在发送中，忽略此次点击")
+                return
             print("开始发送新请求...")
-            if hasattr(self, '_req_worker') and self._req_worker:
-                print("停止之前的请求")
-                self._req_worker.stop()
-                self._req_worker.cleanup()  # 手动清理资源
-            self._req_worker = None
-            self._sending_request = True
             if hasattr(editor, 'send_btn'):
                 print("立即禁用Send按钮")
                 editor.send_btn.setEnabled(False)
@@ -851,355 +928,468 @@ class MainWindow(QWidget):
                 print("立即启用Stop按钮")
                 editor.stop_btn.setEnabled(True)
             self.log_info(f'发送HTTP请求: {editor.method_combo.currentText()} {editor.url_edit.text().strip()}')
-            # 拼接Params
-            params = []
-            for i in range(editor.params_table.rowCount()):
-                key_item = editor.params_table.item(i, 1)
-                value_item = editor.params_table.item(i, 2)
-                if key_item and value_item:
-                    key = key_item.text().strip()
-                    value = value_item.text().strip()
-                    if key:
-                        params.append({'key': key, 'value': value})
-            # 拼接Headers
-            headers = []
-            for i in range(editor.headers_table.rowCount()):
-                key_item = editor.headers_table.item(i, 1)
-                value_item = editor.headers_table.item(i, 2)
-                if key_item and value_item:
-                    key = key_item.text().strip()
-                    value = value_item.text().strip()
-                    if key:
-                        headers.append({'key': key, 'value': value})
-            # 检查form-data文件型，自动加Content-Type
-            auto_multipart = False
-            if editor.body_form_radio.isChecked():
-                for i in range(editor.form_table.rowCount() - 1):
-                    type_combo = editor.form_table.cellWidget(i, 2)
-                    if type_combo and type_combo.currentText() == 'File':
-                        auto_multipart = True
-                        break
-            if auto_multipart:
-                has_ct = any(h['key'].lower() == 'content-type' for h in headers)
-                if not has_ct:
-                    headers.append({'key': 'Content-Type', 'value': 'multipart/form-data'})
-            # 处理Body
-            data = None
-            json_data = None
-            files = None
-            file_handles = []  # 新增：用于记录打开的文件句柄
-            if editor.body_none_radio.isChecked():
-                pass
-            elif editor.body_form_radio.isChecked():
-                data = {}
-                files = {}
-                for i in range(editor.form_table.rowCount()):
-                    key_item = editor.form_table.item(i, 1)
-                    type_combo = editor.form_table.cellWidget(i, 2)
-                    value_item = editor.form_table.item(i, 3)
-                    if key_item and value_item:
-                        key = key_item.text().strip()
-                        value = value_item.text().strip()
-                        type_val = type_combo.currentText() if type_combo else 'Text'
-                        if key:
-                            if type_val == 'File' and value:
-                                try:
-                                    f = open(value, 'rb')
-                                    files[key] = f
-                                    file_handles.append(f)
-                                except Exception as e:
-                                    QMessageBox.warning(self, 'File Error', f'Cannot open file: {value}\n{e}')
-                                    self._sending_request = False
-                                    if hasattr(editor, 'send_btn'):
-                                        editor.send_btn.setEnabled(True)
-                                    if hasattr(editor, 'stop_btn'):
-                                        editor.stop_btn.setEnabled(False)
-                                    return
-                            else:
-                                data[key] = value
-                if not files:
-                    files = None
-            elif editor.body_url_radio.isChecked():
-                data = {}
-                for i in range(editor.url_table.rowCount()):
-                    key_item = editor.url_table.item(i, 1)
-                    value_item = editor.url_table.item(i, 2)
-                    if key_item and value_item:
-                        key = key_item.text().strip()
-                        value = value_item.text().strip()
-                        if key:
-                            data[key] = value
-            elif editor.body_raw_radio.isChecked():
-                raw_text = editor.raw_text_edit.toPlainText().strip()
-                if raw_text:
-                    raw_type = editor.raw_type_combo.currentText()
-                    if raw_type == 'JSON':
-                        try:
-                            json_data = json.loads(raw_text)
-                        except:
-                            data = raw_text
-                    else:
-                        data = raw_text
-            # 显示加载动画
-            current_tab_index = self.req_tabs.currentIndex()
-            tab_key = self.get_tab_key(current_tab_index)
-            if current_tab_index >= 0 and tab_key in self.response_widgets:
+            try:
+                prepared = self.prepare_editor_request(editor)
+            except OSError as e:
+                QMessageBox.warning(self, 'File Error', f'Cannot open file: {e.filename}\n{e}')
+                if hasattr(editor, 'send_btn'):
+                    editor.send_btn.setEnabled(True)
+                if hasattr(editor, 'stop_btn'):
+                    editor.stop_btn.setEnabled(False)
+                return
+            file_handles = prepared['file_handles']  # 请求完成后关闭
+            # 显示加载动画（显示在发起请求的Tab上）
+            tab_index = self._tab_index_for_editor(editor)
+            tab_key = self.get_tab_key(tab_index)
+            if tab_index >= 0 and tab_key in self.response_widgets:
                 overlay = self.response_widgets[tab_key]['loading_overlay']
+                overlay.loading_label.setText('Sending request...')
+                overlay.set_compact(False)
+                self.response_widgets[tab_key]['_stream_started'] = False
                 overlay.setGeometry(0, 0, overlay.parent().width(), overlay.parent().height())
                 overlay.raise_()
                 overlay.setVisible(True)
                 QApplication.processEvents()
-            # 仅在POST/PUT/PATCH等支持文件上传的方法时传递files
-            method = editor.method_combo.currentText().upper()
-            req_files = files if files and method in ['POST', 'PUT', 'PATCH'] else None
-            self._req_worker = RequestWorker(method, editor.url_edit.text().strip(), params, headers, data, json_data, req_files)
-            self._req_worker.finished.connect(self.on_request_finished)
-            self._req_worker.error.connect(self.on_request_error)
-            self._req_worker.stopped.connect(self.on_request_stopped)
-            # 新增：将file_handles保存到self，便于请求完成后关闭
-            self._file_handles_to_close = file_handles
-            print("信号连接成功")
-            self._req_worker.start()
-            self._current_editor = editor
-            print("请求已发送，等待服务器响应...")
+            method = prepared['method']
+            url = prepared['url']
+            s = load_settings()
+            worker = create_request_worker(
+                method, url, prepared['params'], prepared['headers'], prepared['data'],
+                prepared['json_data'], prepared['files'],
+                transport=s.get('request_transport', 'thread'),
+                timeouts=timeouts_from_settings(s),
+                stream=s.get('response_streaming', True),
+                chunk_size=s.get('stream_chunk_size_kb', 64) * 1024,
+                spill_threshold=s.get('stream_spill_threshold_mb', 32) * 1024 * 1024,
+                preview_limit=s.get('stream_preview_kb', 1024) * 1024,
+                http2=use_http2(prepared['http_version'], s.get('http2_enabled', False)),
+            )
+            worker.chunk_received.connect(lambda text, w=worker: self.on_request_chunk(editor, w, text))
+            worker.progress.connect(lambda received, rate, total, w=worker: self.on_request_progress(editor, w, received, rate, total))
+            # 将file_handles按编辑器保存，便于该请求完成后关闭
+            self._file_handles_to_close[editor] = file_handles
+            if s.get('history_enabled', True):
+                # 发送时的请求快照，请求结束后写入历史
+                self._history_snapshots[editor] = (editor.serialize_request(), url, time.time())
+            job = self.request_scheduler.submit(editor, worker, url, label=f'{method} {url}')
+            if job.state == job.QUEUED:
+                print("并发已达上限，请求进入队列")
+                if tab_index >= 0 and tab_key in self.response_widgets:
+                    self.response_widgets[tab_key]['loading_overlay'].loading_label.setText('Queued...')
+            else:
+                print("请求已发送，等待服务器响应...")
         except Exception as e:
             print(f"send_request 出现异常: {e}")
-            self._sending_request = False
+            self._close_file_handles(editor)
             if editor and hasattr(editor, 'send_btn'):
                 editor.send_btn.setEnabled(True)
             if editor and hasattr(editor, 'stop_btn'):
                 editor.stop_btn.setEnabled(False)
-            if hasattr(self, 'resp_loading_overlay'):
-                self.resp_loading_overlay.setVisible(False)
-
-    def _close_file_handles(self):
-        """关闭所有待关闭的文件句柄"""
-        if hasattr(self, '_file_handles_to_close') and self._file_handles_to_close:
-            for f in self._file_handles_to_close:
+            self._hide_loading_overlay(editor)
+
+    def prepare_editor_request(self, editor):
+        """读取编辑器中的请求，用 build_request 构建请求参数（集合运行器、压测使用同一逻辑）
+
+        打开上传文件失败时抛出 OSError。
+        """
+        def table_rows(table, value_column, with_type=False):
+            rows = []
+            for i in range(table.rowCount()):
+                key_item = table.item(i, 1)
+                value_item = table.item(i, value_column)
+                if key_item and value_item:
+                    row = {'key': key_item.text(), 'value': value_item.text()}
+                    if with_type:
+                        type_combo = table.cellWidget(i, 2)
+                        row['type'] = type_combo.currentText() if type_combo else 'Text'
+                    rows.append(row)
+            return rows
+        body_type = 'none'
+        body = None
+        if editor.body_form_radio.isChecked():
+            body_type = 'form-data'
+            body = table_rows(editor.form_table, 3, with_type=True)
+        elif editor.body_url_radio.isChecked():
+            body_type = 'x-www-form-urlencoded'
+            body = table_rows(editor.url_table, 2)
+        elif editor.body_raw_radio.isChecked():
+            body_type = 'raw'
+            body = editor.raw_text_edit.toPlainText()
+        return build_request(
+            editor.method_combo.currentText(), editor.url_edit.text(),
+            table_rows(editor.params_table, 2), table_rows(editor.headers_table, 2),
+            body_type, body, editor.raw_type_combo.currentText(), editor.http_version())
+
+    def _close_file_handles(self, editor=None):
+        """关闭指定编辑器请求打开的文件句柄"""
+        file_handles = self._file_handles_to_close.pop(editor, None)
+        if file_handles:
+            for f in file_handles:
                 try:
                     f.close()
                 except Exception as e:
                     print(f"关闭文件句柄出错: {e}")
-            self._file_handles_to_close = []
 
-    def on_request_finished(self, result):
-        """请求完成处理 - 最简单版本"""
+    def _tab_index_for_editor(self, editor):
+        """返回编辑器所在Tab的索引；editor为None时返回当前Tab"""
+        if not hasattr(self, 'req_tabs') or self.req_tabs is None:
+            return -1
+        try:
+            if editor is None:
+                return self.req_tabs.currentIndex()
+            return self.req_tabs.indexOf(editor)
+        except RuntimeError:
+            # req_tabs已被删除
+            return -1
+
+    def _hide_loading_overlay(self, editor):
+        """隐藏编辑器所在Tab的加载遮罩"""
+        try:
+            tab_index = self._tab_index_for_editor(editor)
+            tab_key = self.get_tab_key(tab_index) if tab_index >= 0 else None
+            if tab_key in getattr(self, 'response_widgets', {}):
+                self.response_widgets[tab_key]['loading_overlay'].setVisible(False)
+        except Exception as e:
+            print(f"隐藏遮罩层时出错: {e}")
+
+    def _restore_send_button(self, editor):
+        """恢复编辑器的Send/Stop按钮状态"""
+        try:
+            if editor is not None and hasattr(editor, 'send_btn'):
+                editor.send_btn.setEnabled(True)
+            if editor is not None and hasattr(editor, 'stop_btn'):
+                editor.stop_btn.setEnabled(False)
+        except RuntimeError:
+            # 编辑器已被删除
+            pass
+
+    def _on_job_finished(self, job, result):
+        self.on_request_finished(result, job.owner)
+
+    def _on_job_error(self, job, msg):
+        self.on_request_error(msg, job.owner)
+
+    def _on_job_stopped(self, job):
+        self.on_request_stopped(job.owner)
+
+    def _on_request_queue_changed(self):
+        """排队的请求开始执行后，更新其Tab上的加载提示"""
+        for job in self.request_scheduler.jobs():
+            if job.state != job.RUNNING:
+                continue
+            tab_index = self._tab_index_for_editor(job.owner)
+            tab_key = self.get_tab_key(tab_index) if tab_index >= 0 else None
+            if tab_key in getattr(self, 'response_widgets', {}):
+                label = self.response_widgets[tab_key]['loading_overlay'].loading_label
+                if label.text().startswith('Queued'):
+                    label.setText('Sending request...')
+
+    def _is_current_job(self, editor, worker):
+        """worker是否仍是该编辑器当前的请求（已取消的请求的信号需忽略）"""
+        job = self.request_scheduler.job_for(editor)
+        return job is not None and job.worker is worker
+
+    def on_request_chunk(self, editor, worker, text):
+        """流式下载时将一批文本追加到发起请求的Tab的响应区"""
+        if not self._is_current_job(editor, worker):
+            return
+        try:
+            tab_index = self._tab_index_for_editor(editor)
+            tab_key = self.get_tab_key(tab_index) if tab_index >= 0 else None
+            if tab_key not in self.response_widgets:
+                return
+            response_widget = self.response_widgets[tab_key]
+            body_edit = response_widget['body_edit']
+            if not response_widget.get('_stream_started'):
+                # 第一批数据：清空旧响应，关闭高亮，遮罩层缩到底部以显示已接收内容
+                response_widget['_stream_started'] = True
+                response_widget['json_formatter'].cancel()
+                response_widget['json_highlighter'].setDocument(None)
+                response_widget['large_viewer'].clear()
+                response_widget['body_stack'].setCurrentIndex(0)
+                body_edit.clear()
+                response_widget['tabs'].setCurrentIndex(0)
+                response_widget['loading_overlay'].set_compact(True)
+            cursor = QTextCursor(body_edit.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.insertText(text)
+        except Exception as e:
+            print(f"追加响应内容时出错: {e}")
+
+    def on_request_progress(self, editor, worker, received, rate, total):
+        """流式下载进度，显示在加载遮罩上"""
+        if not self._is_current_job(editor, worker):
+            return
+        try:
+            tab_index = self._tab_index_for_editor(editor)
+            tab_key = self.get_tab_key(tab_index) if tab_index >= 0 else None
+            if tab_key not in self.response_widgets:
+                return
+            mb = 1024 * 1024
+            if total:
+                text = f'Downloading... {received/mb:.1f} / {total/mb:.1f} MB   {rate/mb:.2f} MB/s'
+            else:
+                text = f'Downloading... {received/mb:.1f} MB   {rate/mb:.2f} MB/s'
+            self.response_widgets[tab_key]['loading_overlay'].loading_label.setText(text)
+        except Exception as e:
+            print(f"更新下载进度时出错: {e}")
+
+    def _set_response_body(self, response_widget, response_body):
+        """记录Tab当前的响应体存储，释放上一次响应（含临时文件）"""
+        # 取消上一次响应未完成的JSON格式化
+        response_widget['json_formatter'].cancel()
+        self._reset_format_button(response_widget)
+        old_body = response_widget.get('response_body')
+        if old_body is not None and old_body is not response_body:
+            response_widget['large_viewer'].clear()
+            old_body.close()
+        response_widget['response_body'] = response_body
+
+    def _large_body_threshold(self):
+        return max(64, int(load_settings().get('large_body_viewer_threshold_kb', 2048))) * 1024
+
+    def _show_response_text(self, response_widget, text, highlight=False):
+        """在编辑器中显示响应文本"""
+        response_widget['large_viewer'].clear()
+        response_widget['body_stack'].setCurrentIndex(0)
+        # 先卸下高亮器再填充文本，避免setPlainText时同步高亮整篇
+        response_widget['json_highlighter'].setDocument(None)
+        response_widget['body_edit'].setPlainText(text)
+        if highlight:
+            # 复用已有 highlighter
+            response_widget['json_highlighter'].setDocument(response_widget['body_edit'].document())
+        else:
+            # 关闭高亮
+            response_widget['json_highlighter'].setDocument(None)
+
+    def _show_raw_response(self, response_widget, body, response_body, size):
+        """按大小选择编辑器或虚拟化查看器显示未格式化的响应"""
+        if response_body is not None and size > self._large_body_threshold():
+            self._show_large_response(response_widget, response_body)
+        else:
+            self._show_response_text(response_widget, body)
+
+    def _json_auto_format_max(self):
+        return int(load_settings().get('json_auto_format_max_kb', 5120)) * 1024
+
+    def format_response_json(self, response_widget):
+        """在后台线程中美化响应JSON，新的响应到达时自动取消"""
+        response_body = response_widget.get('response_body')
+        if response_body is not None:
+            data = response_body.read()
+        else:
+            data = response_widget['body_edit'].toPlainText()
+        if not data:
+            return
+        response_widget['format_btn'].setEnabled(False)
+        response_widget['format_btn'].setText('Formatting...')
+        response_widget['json_formatter'].format(data)
+
+    def _on_response_json_formatted(self, response_widget, generation, text):
+        if not response_widget['json_formatter'].is_current(generation):
+            return  # 已被新的响应取消
+        self._reset_format_button(response_widget)
+        if len(text) > self._large_body_threshold():
+            self._show_large_response(response_widget, ResponseBody(data=text.encode('utf-8')))
+        else:
+            self._show_response_text(response_widget, text, highlight=True)
+
+    def _on_response_json_format_error(self, response_widget, generation, msg):
+        if not response_widget['json_formatter'].is_current(generation):
+            return
+        print(f"响应JSON格式化失败: {msg}")
+        self._reset_format_button(response_widget)
+
+    def _reset_format_button(self, response_widget):
+        response_widget['format_btn'].setVisible(False)
+        response_widget['format_btn'].setEnabled(True)
+        response_widget['format_btn'].setText('Format JSON')
+
+    def _show_large_response(self, response_widget, body):
+        """大响应体交给虚拟化查看器，只绘制可见的行"""
+        response_widget['json_highlighter'].setDocument(None)
+        response_widget['body_edit'].clear()
+        response_widget['large_viewer'].set_source(body)
+        response_widget['body_stack'].setCurrentIndex(1)
+
+    def on_request_finished(self, result, editor=None):
+        """请求完成处理 - 结果显示在发起请求的Tab上"""
         try:
-            self._close_file_handles()
+            self._close_file_handles(editor)
+            self._record_history(editor, result=result)
             print("处理请求完成")
-            self._sending_request = False
-            
+
             # 检查内存使用
             self.check_memory_usage()
-            
-            # 获取当前Tab索引
-            current_tab_index = self.req_tabs.currentIndex() if hasattr(self, 'req_tabs') else -1
-            tab_key = self.get_tab_key(current_tab_index)
-            
-            # 确保遮罩层被隐藏
-            try:
-                if current_tab_index >= 0 and tab_key in self.response_widgets:
-                    overlay = self.response_widgets[tab_key]['loading_overlay']
-                    overlay.setVisible(False)
-            except Exception as e:
-                print(f"隐藏遮罩层时出错: {e}")
-            
-            # 恢复所有可能的Send按钮
-            try:
-                current_editor = self.req_tabs.currentWidget() if hasattr(self, 'req_tabs') and self.req_tabs else None
-                if current_editor and hasattr(current_editor, 'send_btn'):
-                    print("恢复当前编辑器的Send按钮")
-                    current_editor.send_btn.setEnabled(True)
-                if current_editor and hasattr(current_editor, 'stop_btn'):
-                    current_editor.stop_btn.setEnabled(False)
-                if hasattr(self, '_current_editor') and self._current_editor and hasattr(self._current_editor, 'send_btn'):
-                    print("恢复保存的当前编辑器的Send按钮")
-                    self._current_editor.send_btn.setEnabled(True)
-                if hasattr(self, 'req_tabs') and self.req_tabs:
-                    for i in range(self.req_tabs.count()):
-                        widget = self.req_tabs.widget(i)
-                        if hasattr(widget, 'send_btn'):
-                            print(f"恢复标签页 {i} 的Send按钮")
-                            widget.send_btn.setEnabled(True)
-            except Exception as e:
-                print(f"恢复按钮状态时出错: {e}")
-            
-            # 不清理线程，让它自然结束
-            self._req_worker = None
-            self._current_editor = None
-            
+
+            # 获取发起请求的Tab索引（Tab已关闭时为-1）
+            tab_index = self._tab_index_for_editor(editor)
+            tab_key = self.get_tab_key(tab_index) if tab_index >= 0 else None
+
+            # 确保遮罩层被隐藏，恢复Send按钮
+            self._hide_loading_overlay(editor)
+            self._restore_send_button(editor)
+
             # 处理 RequestWorker 返回的结果格式
             try:
-                if current_tab_index >= 0 and tab_key in self.response_widgets:
+                if tab_index >= 0 and tab_key in self.response_widgets:
                     response_widget = self.response_widgets[tab_key]
                     status_code = result.get('status_code', 0)
                     status_text = result.get('status_text', 'Unknown')
                     elapsed = result.get('elapsed', 0) * 1000
                     body = result.get('body', '')
                     headers = result.get('headers', {})
-                    self._last_response_bytes = body.encode('utf-8') if body else b''
-                    status = f'{status_text}   {elapsed:.0f}ms   {len(self._last_response_bytes)/1024:.2f}KB'
-                    self.log_info(f'HTTP请求完成: {status_text} - 耗时: {elapsed:.0f}ms - 大小: {len(self._last_response_bytes)/1024:.2f}KB')
-                    
+                    response_body = result.get('response_body')
+                    # 大小由RequestWorker按接收的字节数给出，无需再次编码响应体
+                    size = result.get('size')
+                    if size is None:
+                        size = len(body.encode('utf-8')) if body else 0
+                    if result.get('http_version'):
+                        # 显示实际协商的协议
+                        status_text = f"{result['http_version']} {status_text}"
+                    timing = result.get('timing')
+                    if timing:
+                        status = f'{status_text}   {elapsed:.0f}ms (TTFB {timing["ttfb"]:.0f}ms)   {size/1024:.2f}KB'
+                    else:
+                        status = f'{status_text}   {elapsed:.0f}ms   {size/1024:.2f}KB'
+                    self.log_info(f'HTTP请求完成: {status_text} - 耗时: {elapsed:.0f}ms - 大小: {size/1024:.2f}KB')
+                    response_widget['_stream_started'] = False
+                    self._set_response_body(response_widget, response_body)
+
                     try:
                         content_type = headers.get('Content-Type', '')
-                        if 'application/json' in content_type:
-                            obj = json.loads(body)
-                            body = json.dumps(obj, ensure_ascii=False, indent=2)
-                            response_widget['body_edit'].document().setPlainText(body)
-                            # 复用已有 highlighter
-                            response_widget['json_highlighter'].setDocument(response_widget['body_edit'].document())
+                        large_threshold = self._large_body_threshold()
+                        if response_body is not None and response_body.is_file_backed():
+                            # 响应体在临时文件中（内存映射）：由查看器按需读取，不整体加载
+                            self._show_large_response(response_widget, response_body)
+                        elif 'application/json' in content_type:
+                            # 先显示原始内容，JSON在后台线程中美化后再替换；过大时等用户点击Format JSON
+                            self._show_raw_response(response_widget, body, response_body, size)
+                            if size <= self._json_auto_format_max():
+                                self.format_response_json(response_widget)
+                            else:
+                                response_widget['format_btn'].setVisible(True)
+                        elif response_body is not None and size > large_threshold:
+                            self._show_large_response(response_widget, response_body)
                         else:
-                            response_widget['body_edit'].setPlainText(body)
-                            # 关闭高亮
-                            response_widget['json_highlighter'].setDocument(None)
+                            self._show_response_text(response_widget, body)
                     except Exception:
-                        response_widget['body_edit'].setPlainText(body)
-                    
+                        self._show_response_text(response_widget, body)
+
                     headers_str = '\n'.join(f'{k}: {v}' for k, v in headers.items())
                     response_widget['status_label'].setText(status)
                     response_widget['headers_widget'].setPlainText(headers_str)
+                    response_widget['timing_widget'].setPlainText(format_timing(timing))
                     response_widget['tabs'].setCurrentIndex(0)
+                elif result.get('response_body') is not None:
+                    # Tab已关闭，释放无人引用的响应体
+                    result['response_body'].close()
             except Exception as e:
                 print(f"处理响应结果时出错: {e}")
         except Exception as e:
             print(f"on_request_finished 出现异常: {e}")
             try:
-                self._sending_request = False
-                current_tab_index = self.req_tabs.currentIndex() if hasattr(self, 'req_tabs') else -1
-                tab_key = self.get_tab_key(current_tab_index)
-                if current_tab_index >= 0 and tab_key in self.response_widgets:
-                    overlay = self.response_widgets[tab_key]['loading_overlay']
-                    overlay.setVisible(False)
-                current_editor = self.req_tabs.currentWidget() if hasattr(self, 'req_tabs') and self.req_tabs else None
-                if current_editor and hasattr(current_editor, 'send_btn'):
-                    current_editor.send_btn.setEnabled(True)
-                if current_editor and hasattr(current_editor, 'stop_btn'):
-                    current_editor.stop_btn.setEnabled(False)
+                self._hide_loading_overlay(editor)
+                self._restore_send_button(editor)
             except Exception as cleanup_error:
                 print(f"清理异常状态时出错: {cleanup_error}")
 
-    def on_request_error(self, msg):
-        """请求错误处理 - 最简单版本"""
+    def on_request_error(self, msg, editor=None):
+        """请求错误处理 - 错误显示在发起请求的Tab上"""
         try:
-            self._close_file_handles()
+            self._close_file_handles(editor)
+            self._record_history(editor, error=msg)
             print(f"处理请求错误: {msg}")
-            self._sending_request = False
-            
-            # 获取当前Tab索引
-            current_tab_index = self.req_tabs.currentIndex() if hasattr(self, 'req_tabs') else -1
-            tab_key = self.get_tab_key(current_tab_index)
-            
-            try:
-                if current_tab_index >= 0 and tab_key in self.response_widgets:
-                    overlay = self.response_widgets[tab_key]['loading_overlay']
-                    overlay.setVisible(False)
-            except Exception as e:
-                print(f"隐藏遮罩层时出错: {e}")
-                
-            try:
-                current_editor = self.req_tabs.currentWidget() if hasattr(self, 'req_tabs') and self.req_tabs else None
-                if current_editor and hasattr(current_editor, 'send_btn'):
-                    print("恢复当前编辑器的Send按钮")
-                    current_editor.send_btn.setEnabled(True)
-                if current_editor and hasattr(current_editor, 'stop_btn'):
-                    current_editor.stop_btn.setEnabled(False)
-                if hasattr(self, '_current_editor') and self._current_editor and hasattr(self._current_editor, 'send_btn'):
-                    print("恢复保存的当前编辑器的Send按钮")
-                    self._current_editor.send_btn.setEnabled(True)
-                if hasattr(self, 'req_tabs') and self.req_tabs:
-                    for i in range(self.req_tabs.count()):
-                        widget = self.req_tabs.widget(i)
-                        if hasattr(widget, 'send_btn'):
-                            print(f"恢复标签页 {i} 的Send按钮")
-                            widget.send_btn.setEnabled(True)
-            except Exception as e:
-                print(f"恢复按钮状态时出错: {e}")
-                
-            # 不清理线程，让它自然结束
-            self._req_worker = None
-            self._current_editor = None
-            
+
+            # 获取发起请求的Tab索引（Tab已关闭时为-1）
+            tab_index = self._tab_index_for_editor(editor)
+            tab_key = self.get_tab_key(tab_index) if tab_index >= 0 else None
+
+            self._hide_loading_overlay(editor)
+            self._restore_send_button(editor)
+
             try:
-                if current_tab_index >= 0 and tab_key in self.response_widgets:
+                if tab_index >= 0 and tab_key in self.response_widgets:
                     response_widget = self.response_widgets[tab_key]
                     response_widget['status_label'].setText(f'Error: {msg}')
-                    response_widget['body_edit'].setPlainText(f'Request failed: {msg}')
+                    response_widget['timing_widget'].setPlainText('')
+                    self._show_response_text(response_widget, f'Request failed: {msg}')
                     response_widget['tabs'].setCurrentIndex(0)
             except Exception as e:
                 print(f"显示错误信息时出错: {e}")
         except Exception as e:
             print(f"on_request_error 出现异常: {e}")
             try:
-                self._sending_request = False
-                current_tab_index = self.req_tabs.currentIndex() if hasattr(self, 'req_tabs') else -1
-                tab_key = self.get_tab_key(current_tab_index)
-                if current_tab_index >= 0 and tab_key in self.response_widgets:
-                    overlay = self.response_widgets[tab_key]['loading_overlay']
-                    overlay.setVisible(False)
-                current_editor = self.req_tabs.currentWidget() if hasattr(self, 'req_tabs') and self.req_tabs else None
-                if current_editor and hasattr(current_editor, 'send_btn'):
-                    current_editor.send_btn.setEnabled(True)
-                if current_editor and hasattr(current_editor, 'stop_btn'):
-                    current_editor.stop_btn.setEnabled(False)
+                self._hide_loading_overlay(editor)
+                self._restore_send_button(editor)
             except Exception as cleanup_error:
                 print(f"清理异常状态时出错: {cleanup_error}")
 
-    def on_request_stopped(self):
-        """请求停止处理 - 最简单版本"""
+    def on_request_stopped(self, editor=None):
+        """请求停止处理"""
         try:
-            self._close_file_handles()
+            self._close_file_handles(editor)
+            self._history_snapshots.pop(editor, None)
             print("处理请求停止")
-            self._sending_request = False
-            
-            # 获取当前Tab索引
-            current_tab_index = self.req_tabs.currentIndex() if hasattr(self, 'req_tabs') else -1
-            tab_key = self.get_tab_key(current_tab_index)
-            
-            # 立即恢复Send按钮状态
-            try:
-                current_editor = self.req_tabs.currentWidget() if hasattr(self, 'req_tabs') and self.req_tabs else None
-                if current_editor and hasattr(current_editor, 'send_btn'):
-                    print("立即恢复当前编辑器的Send按钮")
-                    current_editor.send_btn.setEnabled(True)
-                if current_editor and hasattr(current_editor, 'stop_btn'):
-                    current_editor.stop_btn.setEnabled(False)
-                    
-                # 恢复所有标签页的Send按钮
-                if hasattr(self, 'req_tabs') and self.req_tabs:
-                    for i in range(self.req_tabs.count()):
-                        widget = self.req_tabs.widget(i)
-                        if hasattr(widget, 'send_btn'):
-                            print(f"立即恢复标签页 {i} 的Send按钮")
-                            widget.send_btn.setEnabled(True)
-            except Exception as e:
-                print(f"恢复按钮状态时出错: {e}")
-            
-            # 确保遮罩层被隐藏
-            try:
-                if current_tab_index >= 0 and tab_key in self.response_widgets:
-                    overlay = self.response_widgets[tab_key]['loading_overlay']
-                    overlay.setVisible(False)
-            except Exception as e:
-                print(f"隐藏遮罩层时出错: {e}")
-                
-            # 不清理线程，让它自然结束
-            self._req_worker = None
-            self._current_editor = None
-            
+            # 立即恢复Send按钮状态，隐藏遮罩层
+            self._restore_send_button(editor)
+            self._hide_loading_overlay(editor)
             print("请求停止处理完成")
-            print("Send按钮已立即恢复，可以再次点击")
-            print("程序继续运行...")
         except Exception as e:
             print(f"处理请求停止时出错: {e}")
-            try:
-                current_tab_index = self.req_tabs.currentIndex() if hasattr(self, 'req_tabs') else -1
-                tab_key = self.get_tab_key(current_tab_index)
-                if current_tab_index >= 0 and tab_key in self.response_widgets:
-                    overlay = self.response_widgets[tab_key]['loading_overlay']
-                    overlay.setVisible(False)
-            except Exception as cleanup_error:
-                print(f"清理异常状态时出错: {cleanup_error}")
+            self._hide_loading_overlay(editor)
+
+    def _record_history(self, editor, result=None, error=None):
+        """把结束的请求写入历史（压缩和写入在历史存储的后台线程中进行）"""
+        snapshot = self._history_snapshots.pop(editor, None)
+        if snapshot is None:
+            return
+        request, url, sent_at = snapshot
+        try:
+            body = None
+            if result is not None:
+                response_body = result.get('response_body')
+                if response_body is not None:
+                    if response_body.size <= self.history_store.max_body_bytes:
+                        body = response_body.read()
+                elif result.get('body'):
+                    body = result['body'].encode('utf-8')
+            self.history_store.record(request, url, result, body, error, ts=sent_at)
+        except Exception as e:
+            print(f"记录请求历史出错: {e}")
+
+    def open_history_entry(self, entry_id):
+        """在新Tab中打开历史请求，并显示当时的响应"""
+        entry = self.history_store.get(entry_id)
+        if entry is None:
+            return
+        self.ensure_req_tabs()
+        title = f'History #{entry_id}'
+        for i in range(self.req_tabs.count()):
+            if self.get_tab_key(i) == title:
+                self.req_tabs.setCurrentIndex(i)
+                return
+        req_editor = RequestEditor(self, req_name=title)
+        self.fill_request_editor(req_editor, entry['request'])
+        tab_index = self.req_tabs.addTab(req_editor, title)
+        self.req_tabs.setCurrentWidget(req_editor)
+        self.show_response_for_tab(tab_index)
+        if entry['error']:
+            self.on_request_error(entry['error'], req_editor)
+            return
+        body = entry['body'] or b''
+        encoding = get_encoding_from_headers(CaseInsensitiveDict(entry['headers'])) or 'utf-8'
+        response_body = ResponseBody.from_bytes(
+            body, load_settings().get('stream_spill_threshold_mb', 32) * 1024 * 1024, encoding)
+        self.on_request_finished({
+            'status_code': entry['status'],
+            'status_text': entry['status_text'] or str(entry['status']),
+            'headers': entry['headers'],
+            'body': '' if response_body.is_file_backed() else response_body.text(),
+            'response_body': response_body,
+            'size': entry['size'] if entry['size'] is not None else len(body),
+            'elapsed': entry['elapsed'] or 0,
+        }, req_editor)
 
     def save_response_to_file(self, tab_index=None):
         """保存响应到文件"""
@@ -1210,6 +1400,22 @@ class MainWindow(QWidget):
             QMessageBox.warning(self, 'No Response', '没有找到对应的响应区域！')
             return
         response_widget = self.response_widgets[tab_key]
+        response_body = response_widget.get('response_body')
+        if response_body is not None and response_body.size > 0:
+            # 直接保存原始响应字节；文件存储时为文件复制，不经过编辑器文本
+            # 扩展名为 .gz/.zst 时压缩保存
+            fname, _ = QFileDialog.getSaveFileName(
+                self, 'Save Response', '', 'All Files (*);;Gzip (*.gz);;Zstandard (*.zst)')
+            if fname:
+                try:
+                    written = response_body.save_to(fname)
+                    if written:
+                        self.log_info(f'Saved response to file: {fname} ({written / 1024:.2f}KB)')
+                    else:
+                        self.log_info(f'Response unchanged, file not rewritten: {fname}')
+                except Exception as e:
+                    QMessageBox.warning(self, 'Save Failed', f'保存失败: {e}')
+            return
         body_edit = response_widget['body_edit']
         text = body_edit.toPlainText()
         if not text.strip():
@@ -1237,9 +1443,12 @@ class MainWindow(QWidget):
         headers_widget = response_widget['headers_widget']
         tabs = response_widget['tabs']
         body_edit.clear()
+        self._set_response_body(response_widget, None)
+        response_widget['body_stack'].setCurrentIndex(0)
         status_label.setText('Click Send to get a response')
         tabs.setTabText(0, 'Body')
         headers_widget.setPlainText('')
+        response_widget['timing_widget'].setPlainText('')
 
     def on_req_tab_changed(self, idx):
         self.ensure_req_tabs()
@@ -1248,26 +1457,17 @@ class MainWindow(QWidget):
             # 切换Response区域
             self.show_response_for_tab(idx)
 
-            # 获取当前Tab的完整路径
-            tab_path = self.req_tabs.tabText(idx)
-            # 去掉星号
-            if tab_path.endswith('*'):
-                tab_path = tab_path[:-1]
-
-            # 遍历树，找到路径完全匹配的节点
-            def find_and_select_by_path(item, target_path):
-                current_path = self.build_item_path(item)
-                if current_path == target_path:
-                    self.collection_tree.setCurrentItem(item)
-                    return True
-                for i in range(item.childCount()):
-                    if find_and_select_by_path(item.child(i), target_path):
-                        return True
-                return False
-
-            for i in range(self.collection_tree.topLevelItemCount()):
-                if find_and_select_by_path(self.collection_tree.topLevelItem(i), tab_path):
-                    break
+            # 通过路径索引找到Tab对应的树节点（不遍历整棵树）
+            editor = self.req_tabs.widget(idx)
+            item = self.path_index.item_for_tab(editor)
+            if item is None and self.path_index.path_for_tab(editor) is None:
+                # 未登记的Tab，按Tab标题（去掉星号）的路径查找
+                tab_path = self.req_tabs.tabText(idx)
+                if tab_path.endswith('*'):
+                    tab_path = tab_path[:-1]
+                item = self.path_index.item_for_path(tab_path)
+            if item is not None:
+                self.collection_tree.setCurrentItem(item)
 
     def on_req_tab_closed(self, idx):
         """Tab关闭事件"""
@@ -1287,10 +1487,14 @@ class MainWindow(QWidget):
             if choice == QMessageBox.No:
                 return  # 取消关闭
         
+        # 取消该Tab进行中或排队中的请求
+        self.request_scheduler.cancel(self.req_tabs.widget(idx))
+        
         # 移除对应的Response区域
         self.remove_response_for_tab(idx)
         
         # 移除Tab
+        self.path_index.unbind_tab(self.req_tabs.widget(idx))
         self.req_tabs.removeTab(idx)
         
         # 检查是否还有Tab
@@ -1307,6 +1511,8 @@ class MainWindow(QWidget):
         close_action = menu.addAction(get_text('context_close_tab'))
         close_other_action = menu.addAction(get_text('context_close_other_tabs'))
         close_all_action = menu.addAction(get_text('context_close_all_tabs'))
+        menu.addSeparator()
+        load_test_action = menu.addAction(get_text('context_load_test'))
         
         action = menu.exec_(self.req_tabs.mapToGlobal(pos))
         
@@ -1316,6 +1522,8 @@ class MainWindow(QWidget):
             self.close_other_tabs(self.req_tabs.currentIndex())
         elif action == close_all_action:
             self.close_all_tabs()
+        elif action == load_test_action:
+            self.show_load_test(self.req_tabs.currentWidget())
 
     def close_tab_with_confirm(self, tab_index):
         self.ensure_req_tabs()
@@ -1337,6 +1545,8 @@ class MainWindow(QWidget):
                 if choice == QMessageBox.No:
                     return  # 取消关闭
             
+            self.request_scheduler.cancel(self.req_tabs.widget(tab_index))
+            self.path_index.unbind_tab(self.req_tabs.widget(tab_index))
             self.req_tabs.removeTab(tab_index)
 
     def close_other_tabs(self, keep_index):
@@ -1379,7 +1589,9 @@ class MainWindow(QWidget):
             if tab_text.endswith('*'):
                 tab_text = tab_text[:-1]
             if tab_text in to_close:
+                self.request_scheduler.cancel(self.req_tabs.widget(i))
                 self.remove_response_for_tab(i)
+                self.path_index.unbind_tab(self.req_tabs.widget(i))
                 self.req_tabs.removeTab(i)
 
         # 关闭后，确保Response区和当前Tab同步
@@ -1413,6 +1625,7 @@ class MainWindow(QWidget):
             if choice == QMessageBox.No:
                 return  # 取消关闭
         
+        self.request_scheduler.cancel_all()
         self.req_tabs.clear()
         self.check_and_show_welcome_page()
 
@@ -1432,21 +1645,12 @@ class MainWindow(QWidget):
             self.right_widget.layout().addWidget(self.welcome_page)
 
     def on_stop_request(self):
-        """停止请求"""
+        """停止当前Tab的请求"""
         try:
             print("停止请求")
-            # 调用RequestWorker的stop方法
-            if hasattr(self, '_req_worker') and self._req_worker:
-                print("调用RequestWorker.stop()")
-                self._req_worker.stop()
-            
-            # 立即隐藏当前Tab的遮罩层
-            current_tab_index = self.req_tabs.currentIndex() if hasattr(self, 'req_tabs') else -1
-            tab_key = self.get_tab_key(current_tab_index)
-            if current_tab_index >= 0 and tab_key in self.response_widgets:
-                overlay = self.response_widgets[tab_key]['loading_overlay']
-                overlay.setVisible(False)
-            
+            editor = self.req_tabs.currentWidget() if hasattr(self, 'req_tabs') and self.req_tabs else None
+            if editor is not None and not self.request_scheduler.cancel(editor):
+                self._hide_loading_overlay(editor)
             print("停止请求完成")
         except Exception as e:
             print(f"停止请求时出错: {e}")
@@ -1455,40 +1659,26 @@ class MainWindow(QWidget):
         """安全的停止请求方法 - 快速恢复版本"""
         try:
             print("安全停止请求")
-            # 立即重置发送状态
-            self._sending_request = False
-            print("重置发送状态为False")
-            
-            # 立即恢复Send按钮状态
-            try:
-                current_editor = self.req_tabs.currentWidget() if hasattr(self, 'req_tabs') and self.req_tabs else None
-                if current_editor and hasattr(current_editor, 'send_btn'):
-                    print("立即恢复Send按钮")
-                    current_editor.send_btn.setEnabled(True)
-                if current_editor and hasattr(current_editor, 'stop_btn'):
-                    current_editor.stop_btn.setEnabled(False)
-            except Exception as e:
-                print(f"恢复按钮状态时出错: {e}")
-            
-            # 调用RequestWorker的stop方法
-            if hasattr(self, '_req_worker') and self._req_worker:
-                print("调用RequestWorker.stop()")
-                self._req_worker.stop()
-            
-            # 立即隐藏当前Tab的遮罩层
-            current_tab_index = self.req_tabs.currentIndex() if hasattr(self, 'req_tabs') else -1
-            tab_key = self.get_tab_key(current_tab_index)
-            if current_tab_index >= 0 and tab_key in self.response_widgets:
-                overlay = self.response_widgets[tab_key]['loading_overlay']
-                overlay.setVisible(False)
+            editor = self.req_tabs.currentWidget() if hasattr(self, 'req_tabs') and self.req_tabs else None
+            # 调度器立即释放该Tab的名额并发出停止信号，Send按钮随之恢复
+            if editor is not None and not self.request_scheduler.cancel(editor):
+                self._restore_send_button(editor)
+                self._hide_loading_overlay(editor)
             print("安全停止请求完成")
-            print("Send按钮已立即恢复")
         except Exception as e:
             print(f"安全停止请求时出错: {e}")
 
     # 集合相关功能
     def load_collections(self):
         """加载集合数据"""
+        if self._collection_store is not None and self._collection_store.exists():
+            try:
+                self.populate_collections_from_store()
+                self.log_info("加载分片集合数据成功")
+            except Exception as e:
+                QMessageBox.warning(self, 'Load Failed', f'加载失败: {e}')
+                self.log_error(f"加载分片集合数据失败: {e}")
+            return
         user_data_dir = os.path.join(self._workspace_dir, 'user-data')
         path = os.path.join(user_data_dir, 'collections.json')
         if not os.path.exists(path):
@@ -1497,8 +1687,11 @@ class MainWindow(QWidget):
         try:
             with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
+            self.collection_manager.model.set_data(data)
             self.populate_collections(data)
             self.log_info("加载集合数据成功")
+            if self._collection_store is not None:
+                self.save_all()  # 首次启用分片存储，由单个文件迁移为分片
         except Exception as e:
             QMessageBox.warning(self, 'Load Failed', f'加载失败: {e}')
             self.log_error(f"加载集合数据失败: {e}")
@@ -1506,27 +1699,116 @@ class MainWindow(QWidget):
     def populate_collections(self, data):
         """填充集合树"""
         self.collection_tree.clear()
-        
-        def add_items(parent, nodes):
-            for node in nodes:
-                if node.get('type') == 'collection':
-                    item = QTreeWidgetItem([node.get('name', 'Unnamed Collection')])
-                    item.setIcon(0, self.folder_icon)
-                    if parent:
-                        parent.addChild(item)
-                    else:
-                        self.collection_tree.addTopLevelItem(item)
-                    add_items(item, node.get('children', []))
-                elif node.get('type') == 'request':
-                    item = QTreeWidgetItem([node.get('name', 'Unnamed Request')])
-                    item.setIcon(0, self.file_icon)
-                    item.setData(0, Qt.UserRole, node.get('request', {}))
-                    if parent:
-                        parent.addChild(item)
-        
-        add_items(None, data)
+        self.add_collection_items(None, data)
         self.collection_tree.collapseAll()
 
+    def add_collection_items(self, parent, nodes):
+        """按集合数据创建树节点，parent 为 None 时添加为顶级节点
+
+        集合的子节点在首次展开时才创建（见 ensure_collection_loaded）；
+        请求数据保存在集合模型中，树节点只保存其编号。
+        """
+        items = []
+        for node in nodes:
+            if node.get('type') == 'collection':
+                item = QTreeWidgetItem([node.get('name', 'Unnamed Collection')])
+                item.setIcon(0, self.folder_icon)
+                item.setData(0, NODE_KIND_ROLE, NODE_COLLECTION)
+                children = node.get('children', [])
+                if children:
+                    key = self._next_lazy_key
+                    self._next_lazy_key += 1
+                    self._lazy_children[key] = children
+                    item.setData(0, LAZY_ROLE, key)
+                    item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            elif node.get('type') == 'request':
+                item = QTreeWidgetItem([node.get('name', 'Unnamed Request')])
+                item.setIcon(0, self.file_icon)
+                item.setData(0, NODE_KIND_ROLE, NODE_REQUEST)
+                self.set_request_payload(item, node.get('request', {}))
+                if not parent:
+                    continue  # 请求只能位于集合中
+            else:
+                continue
+            items.append(item)
+        if parent:
+            parent.addChildren(items)
+        else:
+            self.collection_tree.addTopLevelItems(items)
+
+    def request_payload(self, item):
+        """树节点对应的请求数据（保存在集合模型中），未保存的请求返回 None"""
+        key = item.data(0, Qt.UserRole)
+        if isinstance(key, int):
+            return self.collection_manager.model.payload(key)
+        return key if isinstance(key, dict) else None
+
+    def set_request_payload(self, item, data):
+        """更新树节点对应的请求数据"""
+        key = item.data(0, Qt.UserRole)
+        if isinstance(key, int):
+            self.collection_manager.model.set_payload(key, data)
+        else:
+            item.setData(0, Qt.UserRole, self.collection_manager.model.add_payload(data))
+
+    def populate_collections_from_store(self):
+        """从分片存储填充集合树：只读取上次展开的集合的分片，其余集合展开时再读取"""
+        self.collection_tree.clear()
+        nodes = []
+        for entry in self._collection_store.load_manifest():
+            name = entry.get('name') or 'Unnamed Collection'
+            if entry.get('expanded'):
+                try:
+                    node = self._collection_store.load_shard(entry['file'], name)
+                except Exception as e:
+                    self.log_error(f"读取集合分片失败: {entry['file']}: {e}")
+                else:
+                    self.add_collection_items(None, [node])
+                    self.collection_tree.topLevelItem(self.collection_tree.topLevelItemCount() - 1).setExpanded(True)
+                    nodes.append(node)
+                    continue
+            item = QTreeWidgetItem(self.collection_tree, [name])
+            item.setIcon(0, self.folder_icon)
+            item.setData(0, NODE_KIND_ROLE, NODE_COLLECTION)
+            item.setData(0, SHARD_ROLE, entry['file'])
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+            nodes.append({'name': name, 'type': 'collection', 'shard': entry['file']})
+        self.collection_manager.model.set_data(nodes)
+
+    def ensure_collection_loaded(self, item):
+        """为尚未创建子节点的集合创建子节点；分片存储的集合先读取分片"""
+        if item is None:
+            return
+        shard = item.data(0, SHARD_ROLE)
+        lazy_key = item.data(0, LAZY_ROLE)
+        if shard and self._collection_store is not None:
+            try:
+                node = self._collection_store.load_shard(shard, item.text(0))
+            except Exception as e:
+                self.log_error(f"读取集合分片失败: {shard}: {e}")
+                return
+            item.setData(0, SHARD_ROLE, None)
+            children = node.get('children', [])
+            # 用读取的数据替换内存模型中的占位节点
+            nodes = list(self.collection_manager.model.nodes())
+            for i, n in enumerate(nodes):
+                if n.get('shard') == shard and 'children' not in n:
+                    nodes[i] = node
+                    break
+            self.collection_manager.model.set_data(nodes)
+        elif lazy_key is not None and lazy_key in self._lazy_children:
+            children = self._lazy_children.pop(lazy_key)
+            item.setData(0, LAZY_ROLE, None)
+        else:
+            return
+        item.setChildIndicatorPolicy(QTreeWidgetItem.DontShowIndicatorWhenChildless)
+        self.add_collection_items(item, children)
+
+    def load_all_collections(self):
+        """读取所有尚未读取的分片（导出等需要完整数据的操作前调用）"""
+        for i in range(self.collection_tree.topLevelItemCount()):
+            self.ensure_collection_loaded(self.collection_tree.topLevelItem(i))
+
     def open_collection(self):
         """从File菜单打开集合文件"""
         fname, _ = QFileDialog.getOpenFileName(
@@ -1586,23 +1868,7 @@ class MainWindow(QWidget):
 
     def merge_collections(self, new_data):
         """合并新集合到现有集合"""
-        def add_collection_to_tree(parent, collection_data):
-            item = QTreeWidgetItem([collection_data.get('name', 'Unnamed Collection')])
-            item.setIcon(0, self.folder_icon)
-            if parent:
-                parent.addChild(item)
-            else:
-                self.collection_tree.addTopLevelItem(item)
-            for child in collection_data.get('children', []):
-                if child.get('type') == 'collection':
-                    add_collection_to_tree(item, child)
-                elif child.get('type') == 'request':
-                    req_item = QTreeWidgetItem([child.get('name', 'Unnamed Request')])
-                    req_item.setIcon(0, self.file_icon)
-                    req_item.setData(0, Qt.UserRole, child.get('request', {}))
-                    item.addChild(req_item)
-        for collection in new_data:
-            add_collection_to_tree(None, collection)
+        self.add_collection_items(None, new_data)
 
     def create_collection(self):
         """从File菜单创建新集合"""
@@ -1632,7 +1898,7 @@ class MainWindow(QWidget):
         # 创建集合节点
         new_item = QTreeWidgetItem([name])
         new_item.setIcon(0, self.folder_icon)
-        new_item.setData(0, Qt.UserRole+1, 'collection')
+        new_item.setData(0, NODE_KIND_ROLE, NODE_COLLECTION)
         self.collection_tree.addTopLevelItem(new_item)
         
         # 保存到collections.json
@@ -1656,6 +1922,7 @@ class MainWindow(QWidget):
             return
             
         try:
+            self.load_all_collections()
             data = self.serialize_collections()
             
             if not data:
@@ -1680,26 +1947,28 @@ class MainWindow(QWidget):
     def serialize_collections(self):
         """序列化集合数据"""
         def serialize_item(item):
-            # 用和 is_request 一样的逻辑判断
-            def is_request(item):
-                return (
-                    item is not None and
-                    item.childCount() == 0 and
-                    item.parent() is not None and
-                    item.icon(0).cacheKey() == self.file_icon.cacheKey()
-                )
-            if is_request(item):
-                req_data = item.data(0, Qt.UserRole)
+            if item.parent() is not None and self.is_request_node(item):
+                req_data = self.request_payload(item)
                 if not req_data:
                     return None  # 未保存的request不导出
+                payload_keys.append(item.data(0, Qt.UserRole))
                 return {
                     'name': item.text(0),
                     'type': 'request',
                     'request': req_data
                 }
             else:
+                shard = item.data(0, SHARD_ROLE)
+                if shard:
+                    # 尚未读取的分片集合，保存时沿用原分片文件
+                    return {'name': item.text(0), 'type': 'collection', 'shard': shard}
                 # Collection节点，即使没有子项也要保存
                 children = []
+                lazy_key = item.data(0, LAZY_ROLE)
+                if lazy_key in self._lazy_children:
+                    # 尚未创建树节点的子节点直接使用原数据
+                    lazy_keys.append(lazy_key)
+                    children.extend(self._lazy_children[lazy_key])
                 for i in range(item.childCount()):
                     child_result = serialize_item(item.child(i))
                     if child_result:
@@ -1709,78 +1978,52 @@ class MainWindow(QWidget):
                     'type': 'collection',
                     'children': children
                 }
+        payload_keys = []
+        lazy_keys = []
         data = []
         for i in range(self.collection_tree.topLevelItemCount()):
             node = serialize_item(self.collection_tree.topLevelItem(i))
             if node:
                 data.append(node)
+        # 释放已删除节点的请求数据和待创建子节点
+        self.collection_manager.model.retain_payloads(payload_keys)
+        self._lazy_children = {k: self._lazy_children[k] for k in lazy_keys}
         return data
 
-    def save_all(self):
-        """保存所有数据到collections.json"""
+    def save_all(self, immediate=False):
+        """保存所有数据到collections.json
+
+        立即序列化集合树并更新内存模型，文件写入交给 CollectionSaver：
+        默认防抖后在后台写入；immediate=True 时同步写入，失败时抛出异常。
+        """
         try:
             data = self.serialize_collections()
-            # 确保user-data目录存在
-            user_data_dir = os.path.join(self._workspace_dir, 'user-data')
-            if not os.path.exists(user_data_dir):
-                os.makedirs(user_data_dir)
-            
+            # 内存模型与树保持一致，点击请求时不再重新读取文件
+            self.collection_manager.model.set_data(data)
             path = self.get_collections_path()
-            coll_dir = os.path.dirname(path)
-            if not os.path.exists(coll_dir):
-                os.makedirs(coll_dir, exist_ok=True)
-            
-            # 记录保存前的数据统计
-            total_collections = 0
-            total_requests = 0
-            
-            def count_items(items):
-                nonlocal total_collections, total_requests
-                for item in items:
-                    if item.get('type') == 'collection':
-                        total_collections += 1
-                        if 'children' in item:
-                            count_items(item['children'])
-                    elif item.get('type') == 'request':
-                        total_requests += 1
-            
-            count_items(data)
-            
-            # 立即写入文件
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            
-            # 强制刷新文件系统缓存
-            if hasattr(os, 'sync'):  # Unix系统
-                os.sync()
-            
-            self._unsaved_changes = False
-            self.log_info(f"✅ 数据持久化成功: {total_collections} 个集合, {total_requests} 个请求")
-            
-            # 验证保存的文件
-            if os.path.exists(path):
-                file_size = os.path.getsize(path)
-                self.log_info(f"📁 collections.json 文件大小: {file_size} 字节")
-                
-                # 验证文件内容
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        verify_data = json.load(f)
-                    if len(verify_data) == len(data):
-                        self.log_info("✅ 文件内容验证成功")
-                    else:
-                        self.log_warning("⚠️ 文件内容验证失败：数据长度不匹配")
-                except Exception as verify_e:
-                    self.log_warning(f"⚠️ 文件内容验证失败: {verify_e}")
+            if self._collection_store is not None:
+                tree = self.collection_tree
+                self._collection_store.set_expanded(
+                    tree.topLevelItem(i).text(0) for i in range(tree.topLevelItemCount())
+                    if tree.topLevelItem(i).isExpanded())
+            if immediate:
+                self.collection_saver.save_now(path, data)
             else:
-                self.log_warning("❌ collections.json 文件未创建")
-                
+                self.collection_saver.schedule(path, data)
+            self._unsaved_changes = False
         except Exception as e:
             self.log_error(f"❌ 保存数据失败: {e}")
             import traceback
             self.log_error(f"错误详情: {traceback.format_exc()}")
             raise  # 重新抛出异常，让调用者知道保存失败
 
+    def _on_collections_saved(self, path, size):
+        total_collections, total_requests = self.collection_manager.model.counts()
+        self.log_info(f"✅ 数据持久化成功: {total_collections} 个集合, {total_requests} 个请求, {size} 字节 -> {path}")
+
+    def _on_collections_save_failed(self, path, error):
+        self.log_error(f"❌ 保存数据失败: {path}: {error}")
+
     # 菜单事件处理
     def show_about(self):
         from ui.dialogs.about_dialog import AboutDialog
@@ -1807,29 +2050,23 @@ class MainWindow(QWidget):
                     break
     
     def update_tab_title_for_request_rename(self, old_path, new_path):
-        """专门用于Request重命名时的Tab标题更新（用完整路径替换，兼容星号，遍历所有Tab）"""
-        print(f"调用 update_tab_title_for_request_rename: old_path={old_path}, new_path={new_path}", flush=True)
-        self.ensure_req_tabs()
+        """Request或Collection重命名后更新相关Tab的标题和tabData（保留星号）"""
         if not hasattr(self, 'req_tabs') or self.req_tabs is None:
-            print("req_tabs is None，跳过Tab标题更新", flush=True)
             return
-        updated = False
-        for i in range(self.req_tabs.count()):
+        self.set_tab_paths(self.path_index.rename(old_path, new_path))
+        self.log_info(f'update_tab_title_for_request_rename: old_path={old_path}, new_path={new_path}')
+
+    def set_tab_paths(self, changes):
+        """按 [(编辑器, 新路径)] 更新Tab标题和tabData，保留未保存的星号"""
+        for editor, path in changes:
+            i = self.req_tabs.indexOf(editor)
+            if i < 0:
+                continue
             tab_text = self.req_tabs.tabText(i)
-            has_star = tab_text.endswith('*')
-            tab_text_core = tab_text[:-1] if has_star else tab_text
-            if old_path in tab_text_core:
-                new_tab_text = tab_text_core.replace(old_path, new_path)
-                if has_star:
-                    new_tab_text += '*'
-                self.req_tabs.setTabText(i, new_tab_text)
-                # 同步更新tabData
-                self.req_tabs.tabBar().setTabData(i, new_tab_text)
-                print(f'Updated tab after request rename: "{tab_text}" -> "{new_tab_text}" (old_path={old_path}, new_path={new_path})', flush=True)
-                self.log_info(f'Updated tab after request rename: "{tab_text}" -> "{new_tab_text}" (old_path={old_path}, new_path={new_path})')
-                updated = True
-        print(f'update_tab_title_for_request_rename called: old_path={old_path}, new_path={new_path}, updated={updated}', flush=True)
-        self.log_info(f'update_tab_title_for_request_rename called: old_path={old_path}, new_path={new_path}, updated={updated}')
+            new_tab_text = path + '*' if tab_text.endswith('*') else path
+            self.req_tabs.setTabText(i, new_tab_text)
+            self.req_tabs.tabBar().setTabData(i, path)
+            self.log_info(f'Updated tab: "{tab_text}" -> "{new_tab_text}"')
 
     def show_doc(self):
         """显示用户手册对话框"""
@@ -1998,16 +2235,12 @@ Thank you for using PostSuperman!'''
         """显示集合右键菜单"""
         from ui.utils.i18n import get_text
         item = self.collection_tree.itemAt(pos)
+        self.ensure_collection_loaded(item)  # 新建、删除等操作需要完整的子节点
         menu = QMenu(self)
         
         # 判断节点类型
         def is_request(item):
-            return (
-                item is not None and
-                item.childCount() == 0 and
-                item.parent() is not None and
-                item.icon(0).cacheKey() == self.file_icon.cacheKey()
-            )
+            return item is not None and item.parent() is not None and self.is_request_node(item)
         def is_collection(item):
             return item is not None and not is_request(item)
         
@@ -2025,6 +2258,8 @@ Thank you for using PostSuperman!'''
             new_collection_action = menu.addAction(get_text('context_new_collection'))
             new_req_action = menu.addAction(get_text('context_new_request'))
             new_req_action.triggered.connect(self.create_new_request)
+            run_action = menu.addAction(get_text('context_run_collection'))
+            run_action.triggered.connect(lambda: self.run_collection(item))
             menu.addSeparator()
             rename_action = menu.addAction(get_text('context_rename'))
             delete_action = menu.addAction(get_text('context_delete'))
@@ -2057,6 +2292,7 @@ Thank you for using PostSuperman!'''
                 return
             item = QTreeWidgetItem(self.collection_tree, [name])
             item.setIcon(0, self.folder_icon)
+            item.setData(0, NODE_KIND_ROLE, NODE_COLLECTION)
             self.save_all()
             self.log_info(f'Create Collection: "{name}"')
             return
@@ -2075,6 +2311,7 @@ Thank you for using PostSuperman!'''
                     return
             new_item = QTreeWidgetItem(item, [name])
             new_item.setIcon(0, self.folder_icon)
+            new_item.setData(0, NODE_KIND_ROLE, NODE_COLLECTION)
             item.setExpanded(True)
             self.save_all()
             return
@@ -2111,13 +2348,13 @@ Thank you for using PostSuperman!'''
                 self.update_tab_title_for_request_rename(old_path, new_path)
                 self.log_info(f'Rename Request: "{old_path}" -> "{new_path}"')
             elif self.is_collection_node(item):
-                self.update_tabs_for_collection_rename(old_name, name)
+                self.update_tab_title_for_request_rename(old_path, self.build_item_path(item))
                 self.log_info(f'Rename Collection: "{old_name}" -> "{name}"')
             self.save_all()
             return
         elif delete_action and action == delete_action:
             # 判断是否为Collection节点
-            if item.childCount() > 0:
+            if self.is_collection_node(item):
                 # 这是Collection节点，需要确认删除
                 child_count = item.childCount()
                 choice = QMessageBox.question(
@@ -2129,6 +2366,7 @@ Thank you for using PostSuperman!'''
                 )
                 
                 if choice == QMessageBox.Yes:
+                    self.path_index.remove(self.build_item_path(item))
                     # 删除Collection及其所有子节点
                     if item.parent() is None:
                         # 删除顶级集合
@@ -2143,22 +2381,18 @@ Thank you for using PostSuperman!'''
                 # 这是Request节点，直接删除
                 # 先关闭右侧Tab
                 path = self.build_item_path(item)
-                tabs_to_close = []
-                has_unsaved = False
-                for i in range(self.req_tabs.count()-1, -1, -1):
-                    tab_text = self.req_tabs.tabText(i)
-                    if tab_text.rstrip('*') == path:
-                        tabs_to_close.append((i, tab_text))
-                        if tab_text.endswith('*'):
-                            has_unsaved = True
+                editor = self.path_index.tab_for_path(path)
+                has_unsaved = editor is not None and self.req_tabs.tabText(self.req_tabs.indexOf(editor)).endswith('*')
                 if has_unsaved:
                     reply = QMessageBox.question(self, get_text('dialog_unsaved_changes'),
                         get_text('msg_delete_request_unsaved'),
                         QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
                     if reply != QMessageBox.Yes:
                         return
-                for idx, _ in tabs_to_close:
-                    self.req_tabs.removeTab(idx)
+                if editor is not None:
+                    self.path_index.unbind_tab(editor)
+                    self.req_tabs.removeTab(self.req_tabs.indexOf(editor))
+                self.path_index.remove(path)
                 if item.parent() is None:
                     # 删除顶级集合
                     self.collection_tree.takeTopLevelItem(self.collection_tree.indexOfTopLevelItem(item))
@@ -2176,100 +2410,70 @@ Thank you for using PostSuperman!'''
         
 
             
-    def get_item_paths_for_tabs(self, item):
-        """获取项的所有可能路径，用于Tab更新"""
-        paths = []
-        
-        def get_path(current_item):
-            path_parts = []
-            current = current_item
-            while current is not None:
-                path_parts.insert(0, current.text(0))
-                current = current.parent()
-            return '/'.join(path_parts)
-            
-        # 获取当前路径
-        current_path = get_path(item)
-        paths.append(current_path)
-        
-        # 如果是Collection，获取所有子Request的路径
-        if item.childCount() > 0:
-            for i in range(item.childCount()):
-                child_path = get_path(item.child(i))
-                paths.append(child_path)
-                
-        return paths
-        
-    def update_tabs_after_drag(self, moved_item, old_paths):
-        """拖拽后更新Tab路径"""
-        if not hasattr(self, 'req_tabs') or self.req_tabs is None:
-            return
-            
-        # 获取新的路径
-        new_paths = self.get_item_paths_for_tabs(moved_item)
-        
-        # 更新Tab标题
-        for i in range(self.req_tabs.count()):
-            tab_text = self.req_tabs.tabText(i)
-            
-            # 检查是否需要更新
-            for old_path in old_paths:
-                if old_path in tab_text:
-                    # 找到对应的新路径
-                    for new_path in new_paths:
-                        if self.get_request_name_from_path(old_path) == self.get_request_name_from_path(new_path):
-                            # 更新Tab标题
-                            new_tab_text = tab_text.replace(old_path, new_path)
-                            self.req_tabs.setTabText(i, new_tab_text)
-                            self.log_info(f'Updated tab after drag: "{tab_text}" -> "{new_tab_text}"')
-                            break
-
     def update_all_tabs_after_drag(self):
-        """拖拽后更新所有Tab路径 - 重新扫描整个树结构"""
+        """拖拽后按各Tab对应的树节点更新Tab路径"""
         if not hasattr(self, 'req_tabs') or self.req_tabs is None:
             return
-        
-        # 遍历所有Tab，重新构建路径
-        for i in range(self.req_tabs.count()):
-            tab_text = self.req_tabs.tabText(i)
-            
-            # 提取请求名称（最后一个斜杠后的部分）
-            if '/' in tab_text:
-                request_name = tab_text.split('/')[-1]
-                
-                # 在树中查找这个请求
-                found_item = self.find_request_in_tree(request_name)
-                if found_item:
-                    # 重新构建完整路径
-                    new_path = self.build_item_path(found_item)
-                    new_tab_text = new_path
-                    
-                    if new_tab_text != tab_text:
-                        self.req_tabs.setTabText(i, new_tab_text)
-                        self.log_info(f'Updated tab after drag: "{tab_text}" -> "{new_tab_text}"')
+        self.set_tab_paths(self.path_index.refresh_tabs())
 
     def find_request_in_tree(self, request_name):
-        """在树中查找指定名称的请求"""
-        def search_item(item):
-            # 检查当前项
-            if item.text(0) == request_name and item.childCount() == 0:
-                return item
-            
-            # 递归搜索子项
-            for i in range(item.childCount()):
-                result = search_item(item.child(i))
-                if result:
-                    return result
-            return None
-        
-        # 搜索所有顶级项
-        for i in range(self.collection_tree.topLevelItemCount()):
-            result = search_item(self.collection_tree.topLevelItem(i))
-            if result:
-                return result
-        
+        """在树中查找指定名称的请求（按全文索引查找，按需创建树节点）"""
+        model = self.collection_manager.model
+        paths = model.search.search(request_name) if tokenize(request_name) else model.request_paths()
+        for path in paths:
+            if path.rsplit('/', 1)[-1] == request_name:
+                item = self.path_index.item_for_path(path)
+                if item is not None and self.is_request_node(item):
+                    return item
         return None
 
+    SEARCH_EXPAND_LIMIT = 200  # 过滤时最多自动展开的匹配项数
+
+    def filter_collection_tree(self):
+        """按搜索框内容过滤集合树：只显示匹配的请求及其所在的集合"""
+        query = self.collection_search_edit.text().strip()
+        if not query:
+            if self._search_visible is not None:
+                self._search_visible = None
+                for item in self._walk_tree_items():
+                    item.setHidden(False)
+            return
+        paths = self.collection_manager.model.search.search(query)
+        visible = set()
+        for path in paths:
+            parts = path.split('/')
+            for i in range(1, len(parts) + 1):
+                visible.add('/'.join(parts[:i]))
+        self._search_visible = visible
+        tree = self.collection_tree
+        stack = [(tree.topLevelItem(i), tree.topLevelItem(i).text(0)) for i in range(tree.topLevelItemCount())]
+        while stack:
+            item, path = stack.pop()
+            item.setHidden(path not in visible)
+            stack.extend((item.child(i), path + '/' + item.child(i).text(0)) for i in range(item.childCount()))
+        # 展开前若干个匹配项所在的集合（展开时创建的子节点由 _apply_search_filter_to_children 过滤）
+        for path in paths[:self.SEARCH_EXPAND_LIMIT]:
+            if '/' not in path:
+                continue
+            chain = []
+            item = self.path_index.item_for_path(path.rsplit('/', 1)[0])
+            while item is not None:
+                chain.append(item)
+                item = item.parent()
+            for item in reversed(chain):
+                if not item.isExpanded():
+                    item.setExpanded(True)
+        self.log_info(f'Search "{query}": {len(paths)} requests')
+
+    def _apply_search_filter_to_children(self, item):
+        """过滤状态下展开集合时，隐藏不匹配的子节点"""
+        if self._search_visible is None:
+            return
+        path = self.build_item_path(item)
+        for i in range(item.childCount()):
+            child = item.child(i)
+            child.setHidden(path + '/' + child.text(0) not in self._search_visible)
+
     def build_item_path(self, item):
         """构建项的完整路径"""
         path_parts = []
@@ -2319,7 +2523,7 @@ Thank you for using PostSuperman!'''
             if choice == QMessageBox.Yes:
                 # 保存所有更改
                 try:
-                    self.save_all()
+                    self.save_all(immediate=True)
                     event.accept()
                 except Exception as e:
                     QMessageBox.warning(self, 'Save Failed', f'Failed to save changes: {e}')
@@ -2333,6 +2537,19 @@ Thank you for using PostSuperman!'''
         else:
             # 没有未保存的更改，直接退出
             event.accept()
+        if event.isAccepted():
+            # 退出前写入尚未保存的集合数据，取消所有请求，删除响应体临时文件
+            if self._collection_store is not None:
+                try:
+                    self.save_all()  # 记录各集合的展开状态，内容未变的分片不会重写
+                except Exception:
+                    pass
+            self.collection_saver.flush()
+            self.request_scheduler.cancel_all()
+            close_session_pool()
+            self.history_store.close()
+            for response_widget in getattr(self, 'response_widgets', {}).values():
+                self._set_response_body(response_widget, None)
 
     def import_request_dialog(self):
         from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QRadioButton, QButtonGroup, QTextEdit, QPushButton, QLabel, QFileDialog, QWidget, QMessageBox, QTableWidgetItem
@@ -2628,28 +2845,13 @@ Thank you for using PostSuperman!'''
         dlg.exec_()
 
     def _cleanup_previous_request(self):
-        """清理之前的请求 - 最简单版本"""
+        """取消所有进行中和排队中的请求"""
         try:
-            print("清理之前的请求")
-            # 只设置停止标志，不等待线程
-            if hasattr(self, '_req_worker') and self._req_worker:
-                print("设置之前请求的停止标志")
-                try:
-                    self._req_worker._stop_flag = True
-                except Exception as e:
-                    print(f"设置停止标志时出错: {e}")
-                self._req_worker = None
-            # 不等待线程，直接清理引用
-            self._req_thread = None
-            self._sending_request = False
-            self._current_editor = None
+            print("清理所有请求")
+            self.request_scheduler.cancel_all()
             print("清理完成")
         except Exception as e:
-            print(f"清理之前请求时出错: {e}")
-            self._sending_request = False
-            self._req_worker = None
-            self._req_thread = None
-            self._current_editor = None 
+            print(f"清理请求时出错: {e}")
 
     def show_curl_code(self):
         from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTextEdit, QPushButton, QHBoxLayout, QLabel, QApplication
@@ -2842,81 +3044,80 @@ Thank you for using PostSuperman!'''
         
         return html
 
-    def update_tabs_for_collection_rename(self, old_name, new_name):
-        """更新集合重命名后的所有相关标签页标题"""
-        if not hasattr(self, 'req_tabs') or self.req_tabs is None:
-            return
-            
-        for i in range(self.req_tabs.count()):
-            tab_text = self.req_tabs.tabText(i)
-            # 检查Tab标题是否包含旧的Collection名称
-            if old_name in tab_text:
-                # 替换路径中的Collection名称
-                new_tab_text = tab_text.replace(old_name, new_name)
-                self.req_tabs.setTabText(i, new_tab_text)
-                self.log_info(f'Updated tab title: "{tab_text}" -> "{new_tab_text}"')
-
-    def _get_parent_map(self):
-        """获取父子关系映射，使用项的文本作为键"""
-        parent_map = {}
-        def recurse(item):
-            for i in range(item.childCount()):
-                child = item.child(i)
-                # 使用项的文本作为键，因为QTreeWidgetItem不可哈希
-                child_key = self._get_item_key(child)
-                parent_key = self._get_item_key(item) if item else None
-                parent_map[child_key] = parent_key
-                recurse(child)
-        for i in range(self.collection_tree.topLevelItemCount()):
-            top = self.collection_tree.topLevelItem(i)
-            top_key = self._get_item_key(top)
-            parent_map[top_key] = None
-            recurse(top)
-        return parent_map
-    
-    def _get_item_key(self, item):
-        """为QTreeWidgetItem生成唯一键"""
-        if item is None:
-            return None
-        
-        # 生成唯一标识符：路径 + 类型
-        path_parts = []
-        current = item
-        while current is not None:
-            path_parts.insert(0, current.text(0))
-            current = current.parent()
-        
-        # 添加类型标识
-        item_type = "collection" if item.childCount() > 0 else "request"
-        return f"{'/'.join(path_parts)}:{item_type}"
-
     def is_request_node(self, item):
-        return item.icon(0) is not None and item.icon(0).pixmap(16, 16).toImage() == self.file_icon.pixmap(16, 16).toImage()
+        return item is not None and node_kind(item) == NODE_REQUEST
 
     def is_collection_node(self, item):
-        return item.icon(0) is not None and item.icon(0).pixmap(16, 16).toImage() == self.folder_icon.pixmap(16, 16).toImage()
+        return item is not None and node_kind(item) == NODE_COLLECTION
+
+    def _walk_tree_items(self):
+        """遍历已创建的所有树节点（非递归）"""
+        stack = [self.collection_tree.topLevelItem(i) for i in range(self.collection_tree.topLevelItemCount())]
+        while stack:
+            item = stack.pop()
+            yield item
+            stack.extend(item.child(i) for i in range(item.childCount()))
 
     def fix_all_collection_icons(self):
-        """全局修正所有Collection节点icon为folder_icon"""
-        def fix_icon(item):
-            if (item.childCount() > 0 or item.parent() is None) and (item.icon(0) is None or item.icon(0).cacheKey() != self.folder_icon.cacheKey()):
-                item.setIcon(0, self.folder_icon)
-            for i in range(item.childCount()):
-                fix_icon(item.child(i))
-        for i in range(self.collection_tree.topLevelItemCount()):
-            fix_icon(self.collection_tree.topLevelItem(i))
+        """全局按节点类型修正icon：Collection为folder_icon，Request为file_icon"""
+        folder_key = self.folder_icon.cacheKey()
+        file_key = self.file_icon.cacheKey()
+        for item in self._walk_tree_items():
+            if node_kind(item) == NODE_COLLECTION:
+                if item.icon(0).cacheKey() != folder_key:
+                    item.setIcon(0, self.folder_icon)
+            elif item.icon(0).cacheKey() != file_key:
+                item.setIcon(0, self.file_icon)
 
     def fix_all_node_types(self):
-        """递归修正所有节点类型标记"""
-        def fix_type(item):
-            if item.childCount() > 0 or item.parent() is None:
-                item.setData(0, Qt.UserRole+1, 'collection')
+        """为没有类型标记的节点补上类型（按icon判断，无icon时按结构推断）"""
+        file_key = self.file_icon.cacheKey()
+        folder_key = self.folder_icon.cacheKey()
+        for item in self._walk_tree_items():
+            if item.data(0, NODE_KIND_ROLE) in (NODE_COLLECTION, NODE_REQUEST):
+                continue
+            icon_key = item.icon(0).cacheKey()
+            if icon_key == file_key:
+                item.setData(0, NODE_KIND_ROLE, NODE_REQUEST)
+            elif icon_key == folder_key:
+                item.setData(0, NODE_KIND_ROLE, NODE_COLLECTION)
             else:
-                item.setData(0, Qt.UserRole+1, 'request')
-            for i in range(item.childCount()):
-                fix_type(item.child(i))
-        for i in range(self.collection_tree.topLevelItemCount()):
-            fix_type(self.collection_tree.topLevelItem(i))
+                item.setData(0, NODE_KIND_ROLE, node_kind(item))
+
+    def run_collection(self, item):
+        """打开集合运行对话框，运行集合（含子集合）中所有已保存的请求"""
+        from ui.dialogs.collection_runner_dialog import CollectionRunnerDialog
+        from ui.utils.collection_runner import collect_requests
+        self.ensure_collection_loaded(item)
+        self.save_all()  # 运行的是内存模型中的数据，先与树同步
+        path = self.build_item_path(item)
+        node = self.collection_manager.model.find(path)
+        requests = collect_requests(node, path) if node is not None else []
+        if not requests:
+            QMessageBox.information(self, get_text('context_run_collection'),
+                                    get_text('msg_collection_no_requests').format(name=item.text(0)))
+            return
+        dialog = CollectionRunnerDialog(path, requests, self)
+        dialog.show()
+
+    def show_load_test(self, editor):
+        """打开压测对话框；每次开始时按编辑器当前内容构建请求"""
+        from ui.dialogs.load_test_dialog import LoadTestDialog
+        if editor is None:
+            return
+        label = f'{editor.method_combo.currentText()} {editor.url_edit.text().strip()}'
+        dialog = LoadTestDialog(lambda: self.prepare_editor_request(editor), label, self)
+        dialog.show()
+
+    def show_request_queue(self):
+        """显示请求队列（非模态）"""
+        from ui.dialogs.request_queue_dialog import RequestQueueDialog
+        if self._request_queue_dialog is None:
+            self._request_queue_dialog = RequestQueueDialog(self.request_scheduler, self)
+        self._request_queue_dialog.refresh()
+        self._request_queue_dialog.show()
+        self._request_queue_dialog.raise_()
+        self._request_queue_dialog.activateWindow()
 
     def show_preferences_dialog(self):
         dlg = SettingsDialog(self)
@@ -2939,11 +3140,16 @@ Thank you for using PostSuperman!'''
             file_menu.actions()[6].setText(get_text('save_all'))
             file_menu.actions()[8].setText(get_text('preferences'))
             file_menu.actions()[10].setText(get_text('exit'))
-            help_menu = menubar.actions()[1].menu()
+            view_menu = menubar.actions()[1].menu()
+            view_menu.setTitle(get_text('menu_view'))
+            view_menu.actions()[0].setText(get_text('request_queue'))
+            help_menu = menubar.actions()[2].menu()
             help_menu.setTitle(get_text('menu_help'))
             help_menu.actions()[0].setText(get_text('menu_about'))
             help_menu.actions()[1].setText(get_text('manual'))
             help_menu.actions()[2].setText(get_text('contact'))
+        if hasattr(self, 'history_panel'):
+            self.history_panel.refresh_texts()
         # 顶部标题
         topbar = self.findChild(QFrame)
         if topbar:
@@ -2976,10 +3182,10 @@ Thank you for using PostSuperman!'''
                     return
                 # 判断是否为request节点（data为dict或类型标记为'request'）
                 key = item.data(0, Qt.UserRole)
-                type_flag = item.data(0, Qt.UserRole+1)
+                type_flag = item.data(0, NODE_KIND_ROLE)
                 if isinstance(key, str):
                     item.setText(0, get_text(key))
-                elif type_flag == 'collection':
+                elif type_flag == NODE_COLLECTION:
                     # 仅collection节点允许用key（如多语言key）
                     if isinstance(key, str):
                         item.setText(0, get_text(key))
@@ -5,6 +5,123 @@ import json
 import os
 from typing import Dict, List, Optional
 from PyQt5.QtCore import Qt
+from ui.models.search_index import SearchIndex, tokenize
+
+
+NODE_KIND_ROLE = Qt.UserRole + 1  # 树节点类型，与序列化数据中的 'type' 一致
+NODE_COLLECTION = 'collection'
+NODE_REQUEST = 'request'
+
+
+def node_kind(item) -> str:
+    """树节点类型；没有类型标记的旧节点按结构推断（顶级或有子节点的为集合）"""
+    kind = item.data(0, NODE_KIND_ROLE)
+    if kind in (NODE_COLLECTION, NODE_REQUEST):
+        return kind
+    return NODE_COLLECTION if item.parent() is None or item.childCount() > 0 else NODE_REQUEST
+
+
+def join_path(parts) -> str:
+    """集合路径各级名称以 / 连接，与Tab标签路径一致"""
+    return '/'.join(parts)
+
+
+class CollectionModel:
+    """内存中的集合数据模型
+
+    保存 collections.json 结构的节点列表，并建立 路径 -> 节点 的索引。
+    父节点关系保存在模型中（按节点id），不写入节点本身，序列化结果保持不变。
+    请求数据按编号保存在模型中，集合树的节点只保存编号，不保存请求数据本身。
+    search 为请求的全文索引，随 set_data 增量更新。
+    """
+
+    def __init__(self, data: Optional[List[Dict]] = None):
+        self._nodes = []  # type: List[Dict]
+        self._index = {}  # type: Dict[str, Dict]
+        self._parents = {}  # type: Dict[int, Optional[Dict]]
+        self._paths = {}  # type: Dict[int, str]
+        self._collection_count = 0
+        self._request_count = 0
+        self._payloads = {}  # type: Dict[int, Dict]  # 编号 -> 请求数据
+        self._next_payload_key = 1
+        self.search = SearchIndex()
+        if data is not None:
+            self.set_data(data)
+
+    def set_data(self, data: List[Dict]):
+        """替换全部数据并重建索引"""
+        self._nodes = data if isinstance(data, list) else []
+        self._index = {}
+        self._parents = {}
+        self._paths = {}
+        self._collection_count = 0
+        self._request_count = 0
+        stack = [(node, None, []) for node in reversed(self._nodes)]
+        while stack:
+            node, parent, parent_parts = stack.pop()
+            if not isinstance(node, dict):
+                continue
+            parts = parent_parts + [node.get('name', '')]
+            path = join_path(parts)
+            # 同一路径出现多次时保留第一个（与原先按顺序递归查找的结果一致）
+            self._index.setdefault(path, node)
+            self._parents[id(node)] = parent
+            self._paths[id(node)] = path
+            if node.get('type') == 'collection':
+                self._collection_count += 1
+                for child in reversed(node.get('children', [])):
+                    stack.append((child, node, parts))
+            elif node.get('type') == 'request':
+                self._request_count += 1
+        self.search.update(self._nodes)
+
+    def nodes(self) -> List[Dict]:
+        return self._nodes
+
+    def find(self, path) -> Optional[Dict]:
+        """按路径查找节点，path 可以是 'A/B/req' 或名称列表"""
+        if not isinstance(path, str):
+            path = join_path(path)
+        return self._index.get(path)
+
+    def find_request(self, path) -> Optional[Dict]:
+        """按路径查找请求数据"""
+        node = self.find(path)
+        if node is None or node.get('type') != 'request':
+            return None
+        return node.get('request', {})
+
+    def request_paths(self) -> List[str]:
+        """所有请求的路径（按树中的顺序）"""
+        return [path for path, node in self._index.items() if node.get('type') == 'request']
+
+    def parent_of(self, node: Dict) -> Optional[Dict]:
+        return self._parents.get(id(node))
+
+    def path_of(self, node: Dict) -> Optional[str]:
+        return self._paths.get(id(node))
+
+    def counts(self):
+        """返回 (集合数, 请求数)"""
+        return self._collection_count, self._request_count
+
+    def add_payload(self, request: Dict) -> int:
+        """保存请求数据，返回编号"""
+        key = self._next_payload_key
+        self._next_payload_key += 1
+        self._payloads[key] = request
+        return key
+
+    def payload(self, key: int) -> Optional[Dict]:
+        return self._payloads.get(key)
+
+    def set_payload(self, key: int, request: Dict):
+        self._payloads[key] = request
+
+    def retain_payloads(self, keys):
+        """只保留仍被树节点引用的请求数据（节点删除后释放）"""
+        keys = set(keys)
+        self._payloads = {k: v for k, v in self._payloads.items() if k in keys}
 
 
 class CollectionManager:
@@ -12,6 +129,7 @@ class CollectionManager:
     
     def __init__(self, workspace_dir: str):
         self.workspace_dir = workspace_dir
+        self.model = CollectionModel()
         # 确保user-data目录存在
         user_data_dir = os.path.join(workspace_dir, 'user-data')
         if not os.path.exists(user_data_dir):
@@ -25,65 +143,29 @@ class CollectionManager:
             
         try:
             with open(self.collections_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                data = json.load(f)
         except Exception:
             return []
+        self.model.set_data(data)
+        return data
             
     def save_collections(self, collections: List[Dict]) -> bool:
         """保存集合数据"""
         try:
             with open(self.collections_file, 'w', encoding='utf-8') as f:
                 json.dump(collections, f, ensure_ascii=False, indent=2)
+            self.model.set_data(collections)
             return True
         except Exception:
             return False
             
     def find_request_by_name(self, name: str, collections: List[Dict]) -> Optional[Dict]:
-        """根据名称查找请求"""
-        def search_in_collection(collection):
-            for item in collection.get('children', []):
-                if item.get('type') == 'request' and item.get('name') == name:
-                    return item.get('request')
-                elif item.get('type') == 'collection':
-                    result = search_in_collection(item)
-                    if result:
-                        return result
-            return None
-            
-        for collection in collections:
-            result = search_in_collection(collection)
-            if result:
-                return result
+        """根据名称查找请求（按树中的顺序返回第一个同名请求）"""
+        if collections is not self.model.nodes():
+            self.model.set_data(collections)
+        paths = self.model.search.search(name) if tokenize(name) else self.model.request_paths()
+        for path in paths:
+            node = self.model.find(path)
+            if node is not None and node.get('type') == 'request' and node.get('name') == name:
+                return node.get('request')
         return None
-        
-    def serialize_collections(self, tree_items) -> List[Dict]:
-        """序列化集合树"""
-        def serialize_item(item):
-            if item.childCount() == 0:  # request
-                req_data = item.data(0, Qt.UserRole)
-                if not req_data:
-                    return None  # 未保存的request不导出
-                return {
-                    'name': item.text(0),
-                    'type': 'request',
-                    'request': req_data
-                }
-            else:
-                # Collection节点，即使没有子项也要保存
-                children = []
-                for i in range(item.childCount()):
-                    child_result = serialize_item(item.child(i))
-                    if child_result:
-                        children.append(child_result)
-                return {
-                    'name': item.text(0),
-                    'type': 'collection',
-                    'children': children
-                }
-                
-        data = []
-        for i in range(tree_items.topLevelItemCount()):
-            node = serialize_item(tree_items.topLevelItem(i))
-            if node:
-                data.append(node)
-        return data 
\ No newline at end of file
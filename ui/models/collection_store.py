@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+from ui.utils.collection_saver import write_text_atomic
+
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+def shard_directory(collections_path: str) -> str:
+    """分片存储目录：.../collections.json -> .../collections.d"""
+    return os.path.splitext(os.path.abspath(collections_path))[0] + '.d'
+
+
+def is_unloaded(node: Dict) -> bool:
+    """尚未读取分片的集合节点：只有名称和分片文件名，没有 children"""
+    return node.get('type') == 'collection' and 'children' not in node and 'shard' in node
+
+
+class ShardedCollectionStore:
+    """目录形式的集合存储
+
+    manifest.json 记录顶级集合的顺序、分片文件名、内容摘要和展开状态，
+    每个顶级集合单独保存为一个分片文件。保存时只重写内容有变化的分片，
+    启动时只需读取清单和展开的集合的分片，其余分片在集合展开时再读取。
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._entries = []  # type: List[Dict]  # 最近一次读取或写入的清单条目
+        self._expanded = frozenset()  # 展开的顶级集合名称，只写入清单
+
+    def exists(self) -> bool:
+        return os.path.exists(os.path.join(self.directory, MANIFEST_NAME))
+
+    def load_manifest(self) -> List[Dict]:
+        """读取清单，返回条目列表（name, file, digest, expanded）"""
+        with open(os.path.join(self.directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        entries = [e for e in manifest.get('collections', []) if isinstance(e, dict) and e.get('file')]
+        with self._lock:
+            self._entries = [dict(e) for e in entries]
+        return [dict(e) for e in entries]
+
+    def load_shard(self, shard: str, name: Optional[str] = None) -> Dict:
+        """读取一个分片，返回集合节点；name 不为空时以它为准（分片读取前可能已被重命名）"""
+        with open(os.path.join(self.directory, shard), 'r', encoding='utf-8') as f:
+            node = json.load(f)
+        if name is not None:
+            node['name'] = name
+        node.setdefault('type', 'collection')
+        node.setdefault('children', [])
+        return node
+
+    def set_expanded(self, names):
+        """记录展开的顶级集合，下次保存时写入清单"""
+        self._expanded = frozenset(names)
+
+    def save(self, nodes: List[Dict], compact: bool = False) -> int:
+        """保存顶级集合列表，返回写入的字节数
+
+        未加载的集合（is_unloaded）沿用原分片文件；其余集合按内容摘要比较，
+        只重写有变化的分片，不再引用的分片文件会被删除。
+        读取嵌套的未加载集合的分片失败时抛出异常，不写入也不删除任何文件。
+        """
+        expanded_names = self._expanded
+        with self._lock:
+            old = {e['file']: e for e in self._entries}
+            file_by_name = {}
+            for e in self._entries:
+                file_by_name.setdefault(e.get('name'), e['file'])
+            used = set()
+            entries = []
+            writes = []  # 所有集合都处理成功后再写入
+            written = 0
+            for node in nodes:
+                name = node.get('name', '')
+                expanded = name in expanded_names
+                if is_unloaded(node) and node['shard'] in old and node['shard'] not in used:
+                    entry = dict(old[node['shard']])
+                    entry['name'] = name
+                    entry['expanded'] = expanded
+                    entries.append(entry)
+                    used.add(entry['file'])
+                    continue
+                node = self._resolve(node)
+                text = _dumps(node, compact)
+                digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+                shard = file_by_name.get(name)
+                if shard is None or shard in used:
+                    shard = self._new_shard_name(name, used | set(old) | {MANIFEST_NAME})
+                prev = old.get(shard)
+                path = os.path.join(self.directory, shard)
+                if prev is None or prev.get('digest') != digest or not os.path.exists(path):
+                    writes.append((path, text))
+                entries.append({'name': name, 'file': shard, 'digest': digest, 'expanded': expanded})
+                used.add(shard)
+            for path, text in writes:
+                written += write_text_atomic(path, text)
+            if entries != self._entries or not self.exists():
+                manifest = {'version': MANIFEST_VERSION, 'collections': entries}
+                written += write_text_atomic(os.path.join(self.directory, MANIFEST_NAME),
+                                             json.dumps(manifest, ensure_ascii=False, indent=2))
+            for shard in set(old) - used:
+                try:
+                    os.remove(os.path.join(self.directory, shard))
+                except OSError as e:
+                    print(f"ShardedCollectionStore: 删除分片 {shard} 失败: {e}")
+            self._entries = entries
+        return written
+
+    def _resolve(self, node: Dict) -> Dict:
+        """返回节点的副本，其中嵌套的未加载集合替换为分片内容（例如未加载的集合被拖入其他集合）
+
+        分片读取失败时抛出异常：不能用空集合代替，否则保存后原分片被删除，数据丢失。
+        """
+        if is_unloaded(node):
+            try:
+                return self._resolve(self.load_shard(node['shard'], node.get('name')))
+            except Exception as e:
+                print(f"ShardedCollectionStore: 读取分片 {node['shard']} 失败: {e}")
+                raise
+        if node.get('type') != 'collection':
+            return node
+        resolved = dict(node)
+        resolved['children'] = [self._resolve(child) for child in node.get('children', [])]
+        return resolved
+
+    @staticmethod
+    def _new_shard_name(name: str, taken) -> str:
+        slug = re.sub(r'[^\w\-]+', '_', name, flags=re.UNICODE).strip('_')[:40] or 'collection'
+        taken_lower = {t.lower() for t in taken}  # 兼容不区分大小写的文件系统
+        candidate = f'{slug}.json'
+        n = 1
+        while candidate.lower() in taken_lower:
+            n += 1
+            candidate = f'{slug}-{n}.json'
+        return candidate
+
+
+def _dumps(data, compact):
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(data, ensure_ascii=False, indent=2)
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+from ui.utils.blob_store import BlobStore, decompress_body
+
+
+HISTORY_DB_NAME = 'history.db'
+SCHEMA_VERSION = 1
+# 写入线程一次事务最多合并的记录数
+WRITE_BATCH_SIZE = 200
+# 超出大小上限时每轮删除的最旧记录数
+EVICT_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    host TEXT NOT NULL,
+    path TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    status_text TEXT,
+    elapsed REAL,
+    size INTEGER,
+    error TEXT,
+    request TEXT,
+    request_body_hash TEXT,
+    response_headers TEXT,
+    body_hash TEXT
+);
+CREATE INDEX IF NOT EXISTS history_ts ON history(ts);
+CREATE INDEX IF NOT EXISTS history_host ON history(host);
+CREATE INDEX IF NOT EXISTS history_path ON history(path);
+CREATE INDEX IF NOT EXISTS history_status ON history(status);
+"""
+
+# 引用 bodies 表内容的列
+_BODY_COLUMNS = ('body_hash', 'request_body_hash')
+
+# 列表只读取摘要列，不读取请求快照和响应头
+_SUMMARY_COLUMNS = 'id, ts, method, url, status, status_text, elapsed, size, error'
+
+
+def history_path_for(collections_path: str) -> str:
+    """历史数据库与集合文件放在同一目录"""
+    return os.path.join(os.path.dirname(os.path.abspath(collections_path)), HISTORY_DB_NAME)
+
+
+def parse_history_filter(text: str) -> Dict:
+    """解析过滤文本：status:404 / status:4xx / host:xxx / path:/api / method:POST，其余为URL关键字"""
+    result = {'keywords': []}
+    for token in (text or '').split():
+        key, sep, value = token.partition(':')
+        key = key.lower()
+        if sep and value and key in ('status', 'host', 'path', 'method'):
+            result[key] = value
+        else:
+            result['keywords'].append(token)
+    return result
+
+
+class HistoryStore:
+    """请求历史的SQLite存储
+
+    每次发送的请求快照、状态、响应头、耗时和响应体都追加到 history 表；
+    时间、主机、路径、状态码都有索引，列表按 id 倒序分页读取（id < 上一页最后一个），
+    与记录总数无关。请求体和响应体存入 bodies 表（BlobStore：按 SHA-256 去重、
+    压缩、引用计数），删除历史记录时触发器释放不再引用的内容。
+
+    写入在单独的线程中进行，record() 只入队，不阻塞界面；每批写入后按
+    保留天数、最大条数、数据库大小淘汰最旧的记录。读取使用另一个连接（WAL模式下
+    读写互不阻塞）。
+    """
+
+    def __init__(self, path: str, max_entries: int = 100000, max_days: int = 30,
+                 max_mb: int = 512, max_body_kb: int = 1024,
+                 on_recorded: Optional[Callable[[List[Dict]], None]] = None):
+        self.path = path
+        self.on_recorded = on_recorded  # 写入后在写入线程中调用，参数为新记录的摘要
+        self.configure(max_entries, max_days, max_mb, max_body_kb)
+        self._queue = queue.Queue()
+        self._read_lock = threading.Lock()
+        self._reader = None
+        self._count = None  # 记录数，只在写入线程中维护
+        self.bodies = BlobStore('bodies')
+        self._thread = threading.Thread(target=self._write_loop, name='history-writer')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def configure(self, max_entries=None, max_days=None, max_mb=None, max_body_kb=None):
+        """更新保留策略；0 表示不限制。下一次写入时生效"""
+        if max_entries is not None:
+            self.max_entries = max(0, int(max_entries))
+        if max_days is not None:
+            self.max_days = max(0, int(max_days))
+        if max_mb is not None:
+            self.max_bytes = max(0, int(max_mb)) * 1024 * 1024
+        if max_body_kb is not None:
+            self.max_body_bytes = max(0, int(max_body_kb)) * 1024
+
+    # ---- 写入 ----
+
+    def record(self, request: Dict, url: str, result: Optional[Dict] = None,
+               body: Optional[bytes] = None, error: Optional[str] = None, ts: Optional[float] = None):
+        """追加一条历史（异步写入）
+
+        request 为 RequestEditor.serialize_request() 的快照，url 为实际发送的地址，
+        result 为请求结果（status_code、status_text、headers、elapsed、size），
+        body 为响应体字节，超过 max_body_kb 时不保存。
+        """
+        if body is not None and len(body) > self.max_body_bytes:
+            body = None
+        self._queue.put(('record', {
+            'ts': ts if ts is not None else time.time(),
+            'request': request,
+            'url': url,
+            'result': result or {},
+            'body': body,
+            'error': error,
+        }))
+
+    def delete(self, entry_ids: List[int]):
+        self._queue.put(('call', lambda conn: self._delete_ids(conn, entry_ids)))
+
+    def clear(self):
+        """删除所有历史并收缩数据库文件"""
+        self._queue.put(('call', self._clear))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待已入队的写入完成"""
+        done = threading.Event()
+        self._queue.put(('flush', done))
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _write_loop(self):
+        try:
+            conn = self._connect()
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version < SCHEMA_VERSION:
+                conn.executescript(_SCHEMA + self.bodies.schema() + self.bodies.release_trigger(
+                    'history_release_bodies', 'history', *_BODY_COLUMNS))
+                conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+                conn.commit()
+            self._count = conn.execute('SELECT COUNT(*) FROM history').fetchone()[0]
+        except Exception as e:
+            print(f"HistoryStore: 打开历史数据库出错 {e}")
+            conn = None
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            stop = None in batch
+            batch = [b for b in batch if b is not None]
+            if conn is not None:
+                self._write_batch(conn, [b for b in batch if b[0] != 'flush'])
+            # 数据库不可用或写入失败时也要唤醒 flush() 的等待者
+            for kind, payload in batch:
+                if kind == 'flush':
+                    payload.set()
+            if stop:
+                break
+        if conn is not None:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List):
+        recorded = []
+        try:
+            with conn:
+                for kind, payload in batch:
+                    if kind == 'record':
+                        recorded.append(self._insert(conn, payload))
+                    else:
+                        payload(conn)
+                if recorded:
+                    self._evict(conn)
+        except Exception as e:
+            print(f"HistoryStore: 写入历史出错 {e}")
+            recorded = []
+            self._count = conn.execute('SELECT COUNT(*) FROM history').fetchone()[0]
+        if recorded and self.on_recorded is not None:
+            try:
+                self.on_recorded(recorded)
+            except Exception as e:
+                print(f"HistoryStore: 通知新记录出错 {e}")
+
+    def _insert(self, conn: sqlite3.Connection, entry: Dict) -> Dict:
+        request = dict(entry['request'] or {})
+        request_body_hash = None
+        raw_body = request.get('body')
+        if isinstance(raw_body, str) and raw_body:
+            # 原始文本请求体单独去重保存，快照中只保留引用
+            request_body_hash = self.bodies.put(conn, raw_body.encode('utf-8'))
+            request['body'] = ''
+        body_hash = self.bodies.put(conn, entry['body']) if entry['body'] is not None else None
+        result = entry['result']
+        url = entry['url'] or request.get('url', '')
+        parts = urlsplit(url if '://' in url else 'http://' + url)
+        summary = {
+            'ts': entry['ts'],
+            'method': (request.get('method') or 'GET').upper(),
+            'url': url,
+            'status': int(result.get('status_code') or 0),
+            'status_text': result.get('status_text'),
+            'elapsed': result.get('elapsed'),
+            'size': result.get('size'),
+            'error': entry['error'],
+        }
+        cursor = conn.execute(
+            'INSERT INTO history (ts, method, url, host, path, status, status_text, elapsed, size, error,'
+            ' request, request_body_hash, response_headers, body_hash) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)',
+            (summary['ts'], summary['method'], url, (parts.hostname or '').lower(), parts.path or '/',
+             summary['status'], summary['status_text'], summary['elapsed'], summary['size'], summary['error'],
+             json.dumps(request, ensure_ascii=False), request_body_hash,
+             json.dumps(dict(result.get('headers') or {}), ensure_ascii=False), body_hash))
+        summary['id'] = cursor.lastrowid
+        self._count += 1
+        return summary
+
+    def _evict(self, conn: sqlite3.Connection):
+        """按保留天数、最大条数、数据库大小删除最旧的记录"""
+        if self.max_days:
+            cursor = conn.execute('DELETE FROM history WHERE ts < ?', (time.time() - self.max_days * 86400,))
+            self._count -= max(0, cursor.rowcount)
+        if self.max_entries and self._count > self.max_entries:
+            self._delete_oldest(conn, self._count - self.max_entries)
+        if self.max_bytes:
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+            while self._count > 0:
+                # 已使用的页（删除后空出的页会被后续写入复用，文件大小保持在上限附近）
+                used = (conn.execute('PRAGMA page_count').fetchone()[0]
+                        - conn.execute('PRAGMA freelist_count').fetchone()[0]) * page_size
+                if used <= self.max_bytes:
+                    break
+                self._delete_oldest(conn, min(self._count, max(EVICT_BATCH_SIZE, self._count // 20)))
+
+    def _delete_oldest(self, conn: sqlite3.Connection, n: int):
+        cursor = conn.execute(
+            'DELETE FROM history WHERE id IN (SELECT id FROM history ORDER BY id LIMIT ?)', (n,))
+        self._count -= max(0, cursor.rowcount)
+
+    def _delete_ids(self, conn: sqlite3.Connection, entry_ids: List[int]):
+        for entry_id in entry_ids:
+            cursor = conn.execute('DELETE FROM history WHERE id = ?', (entry_id,))
+            self._count -= max(0, cursor.rowcount)
+
+    def _clear(self, conn: sqlite3.Connection):
+        conn.execute('DELETE FROM history')
+        conn.execute('DELETE FROM bodies')
+        self._count = 0
+        conn.commit()
+        conn.execute('VACUUM')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    # ---- 读取（界面线程） ----
+
+    def _read(self, sql: str, args=()) -> List:
+        with self._read_lock:
+            if self._reader is None:
+                if not os.path.exists(self.path):
+                    return []
+                self._reader = self._connect()
+            try:
+                return self._reader.execute(sql, args).fetchall()
+            except sqlite3.OperationalError as e:
+                # 写入线程尚未建表
+                print(f"HistoryStore: 读取历史出错 {e}")
+                return []
+
+    def query(self, before_id: Optional[int] = None, limit: int = 200, text: str = '') -> List[Dict]:
+        """按时间倒序返回一页历史摘要；before_id 为上一页最后一条的 id"""
+        where = []
+        args = []
+        if before_id is not None:
+            where.append('id < ?')
+            args.append(before_id)
+        spec = parse_history_filter(text)
+        status = spec.get('status')
+        if status:
+            if status.isdigit():
+                where.append('status = ?')
+                args.append(int(status))
+            elif len(status) == 3 and status[0].isdigit() and status[1:].lower() == 'xx':
+                # 范围条件不走索引（+status），按 id 倒序扫描到一页即停止，免去排序
+                where.append('+status >= ? AND +status < ?')
+                args.extend([int(status[0]) * 100, int(status[0]) * 100 + 100])
+        if spec.get('host'):
+            where.append('host = ?')
+            args.append(spec['host'].lower())
+        if spec.get('path'):
+            # 前缀匹配，同样按 id 倒序扫描
+            where.append('+path >= ? AND +path < ?')
+            args.extend([spec['path'], spec['path'] + '\uffff'])
+        if spec.get('method'):
+            where.append('method = ?')
+            args.append(spec['method'].upper())
+        for keyword in spec['keywords']:
+            where.append("url LIKE ? ESCAPE '\\'")
+            args.append('%' + keyword.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+        sql = f'SELECT {_SUMMARY_COLUMNS} FROM history'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += ' ORDER BY id DESC LIMIT ?'
+        args.append(int(limit))
+        columns = [c.strip() for c in _SUMMARY_COLUMNS.split(',')]
+        return [dict(zip(columns, row)) for row in self._read(sql, args)]
+
+    def get(self, entry_id: int) -> Optional[Dict]:
+        """读取一条完整的历史：请求快照（含请求体）、响应头和响应体"""
+        rows = self._read(
+            f'SELECT {_SUMMARY_COLUMNS}, request, request_body_hash, response_headers, body_hash'
+            ' FROM history WHERE id = ?', (entry_id,))
+        if not rows:
+            return None
+        row = rows[0]
+        columns = [c.strip() for c in _SUMMARY_COLUMNS.split(',')]
+        entry = dict(zip(columns, row[:len(columns)]))
+        request_json, request_body_hash, headers_json, body_hash = row[len(columns):]
+        entry['request'] = json.loads(request_json or '{}')
+        if request_body_hash:
+            data = self.get_body(request_body_hash)
+            entry['request']['body'] = data.decode('utf-8', errors='replace') if data is not None else ''
+        entry['headers'] = json.loads(headers_json or '{}')
+        entry['body'] = self.get_body(body_hash) if body_hash else None
+        return entry
+
+    def get_body(self, digest: str) -> Optional[bytes]:
+        rows = self._read('SELECT codec, data FROM bodies WHERE hash = ?', (digest,))
+        return decompress_body(rows[0][0], rows[0][1]) if rows else None
+
+    def stats(self) -> Dict:
+        entries = self._read('SELECT COUNT(*) FROM history')
+        bodies = self._read('SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM bodies')
+        return {
+            'entries': entries[0][0] if entries else 0,
+            'bodies': bodies[0][0] if bodies else 0,
+            'body_bytes': bodies[0][1] if bodies else 0,
+            'stored_body_bytes': bodies[0][2] if bodies else 0,
+            'file_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
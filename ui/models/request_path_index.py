@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List, Optional, Tuple
+
+
+def item_path(item) -> str:
+    """树节点的完整路径（各级名称以 / 连接，与Tab标题一致）"""
+    parts = []
+    while item is not None:
+        parts.append(item.text(0))
+        item = item.parent()
+    return '/'.join(reversed(parts))
+
+
+class RequestPathIndex:
+    """请求路径、集合树节点与已打开Tab之间的双向索引
+
+    路径 -> 树节点 为缓存，命中时只校验该节点当前的路径（与层级深度相关），
+    未命中时按路径逐级查找；打开的Tab记录其路径和对应的树节点，
+    重命名、拖拽后按树节点重新计算路径，不需要遍历整棵树。
+    """
+
+    def __init__(self, tree, get_tab_widget=None, ensure_loaded=None):
+        self.tree = tree
+        self.get_tab_widget = get_tab_widget  # 返回当前的Tab控件，用于确认Tab仍然打开（Tab可能在多处被关闭）
+        self.ensure_loaded = ensure_loaded  # 逐级查找时为尚未创建子节点的集合创建子节点
+        self._items = {}  # 路径 -> 树节点
+        self._tab_by_path = {}  # 路径 -> 编辑器
+        self._tabs = {}  # 编辑器 -> (路径, 树节点)
+
+    # ---- 树节点 ----
+    def item_for_path(self, path: str):
+        """按路径查找树节点，找不到时返回 None"""
+        item = self._items.get(path)
+        if item is not None and self._item_matches(item, path):
+            return item
+        item = self._find_item(path)
+        if item is None:
+            self._items.pop(path, None)
+        else:
+            self._items[path] = item
+        return item
+
+    def remember_item(self, path: str, item):
+        self._items[path] = item
+
+    def _item_matches(self, item, path):
+        try:
+            return item.treeWidget() is self.tree and item_path(item) == path
+        except RuntimeError:
+            return False  # 节点已被删除
+
+    def _find_item(self, path):
+        parts = path.split('/')
+        candidates = [self.tree.topLevelItem(i) for i in range(self.tree.topLevelItemCount())]
+        item = None
+        for depth, name in enumerate(parts):
+            item = None
+            for candidate in candidates:
+                if candidate.text(0) == name:
+                    item = candidate
+                    break
+            if item is None:
+                return None
+            if depth < len(parts) - 1:
+                if self.ensure_loaded is not None:
+                    self.ensure_loaded(item)
+                candidates = [item.child(i) for i in range(item.childCount())]
+        return item
+
+    # ---- Tab ----
+    def bind_tab(self, editor, path: str, item=None):
+        """记录打开的Tab（编辑器）对应的请求路径和树节点"""
+        self.unbind_tab(editor)
+        self._tabs[editor] = (path, item)
+        self._tab_by_path[path] = editor
+        if item is not None:
+            self._items[path] = item
+
+    def unbind_tab(self, editor):
+        entry = self._tabs.pop(editor, None)
+        if entry is not None and self._tab_by_path.get(entry[0]) is editor:
+            del self._tab_by_path[entry[0]]
+
+    def tab_for_path(self, path: str):
+        """路径对应的已打开的编辑器，没有时返回 None"""
+        editor = self._tab_by_path.get(path)
+        if editor is not None and not self._is_open(editor):
+            self.unbind_tab(editor)
+            return None
+        return editor
+
+    def path_for_tab(self, editor) -> Optional[str]:
+        entry = self._tabs.get(editor)
+        return entry[0] if entry is not None else None
+
+    def item_for_tab(self, editor):
+        """编辑器对应的树节点（节点已删除或移出树时返回 None）"""
+        entry = self._tabs.get(editor)
+        if entry is None:
+            return None
+        path, item = entry
+        if item is not None and self._item_matches(item, path):
+            return item
+        item = self.item_for_path(path)
+        self._tabs[editor] = (path, item)
+        return item
+
+    def rename(self, old_path: str, new_path: str) -> List[Tuple[object, str]]:
+        """路径 old_path（及其下所有路径）改名为 new_path，返回 [(编辑器, 新路径)]"""
+        prefix = old_path + '/'
+        for path in [p for p in self._items if p == old_path or p.startswith(prefix)]:
+            del self._items[path]
+        changed = []
+        for editor, (path, item) in list(self._tabs.items()):
+            if path == old_path or path.startswith(prefix):
+                changed.append((editor, new_path + path[len(old_path):], item))
+        for editor, path, item in changed:
+            self.bind_tab(editor, path, item)
+        return [(editor, path) for editor, path, _ in changed]
+
+    def refresh_tabs(self) -> List[Tuple[object, str]]:
+        """按各Tab的树节点重新计算路径（拖拽后调用），返回路径有变化的 [(编辑器, 新路径)]"""
+        changed = []
+        for editor, (path, item) in list(self._tabs.items()):
+            if not self._is_open(editor):
+                self.unbind_tab(editor)
+                continue
+            try:
+                if item is None or item.treeWidget() is not self.tree:
+                    continue
+                new_path = item_path(item)
+            except RuntimeError:
+                continue
+            if new_path != path:
+                changed.append((editor, new_path, item))
+        self._items.clear()
+        for editor, path, item in changed:
+            self.bind_tab(editor, path, item)
+        return [(editor, path) for editor, path, _ in changed]
+
+    def remove(self, path: str):
+        """删除 path 及其下所有路径的树节点缓存（打开的Tab由调用方关闭）"""
+        prefix = path + '/'
+        for p in [p for p in self._items if p == path or p.startswith(prefix)]:
+            del self._items[p]
+
+    def _is_open(self, editor):
+        if self.get_tab_widget is None:
+            return True
+        try:
+            tab_widget = self.get_tab_widget()
+            return tab_widget is not None and tab_widget.indexOf(editor) >= 0
+        except (RuntimeError, TypeError):
+            return False
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import bisect
+import re
+from typing import Dict, List, Optional, Set
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+BODY_INDEX_LIMIT = 100000  # 请求体只索引前这么多个字符
+MAX_TOKEN_LENGTH = 64
+
+
+def tokenize(text) -> List[str]:
+    """文本 -> 小写的词列表"""
+    if not text:
+        return []
+    return _WORD_RE.findall(str(text).lower())
+
+
+def _index_terms(text) -> Set[str]:
+    """建立索引用的词集合
+
+    查询按词的前缀匹配；中文等没有空格分隔的词额外索引其所有后缀，
+    这样查询词出现在词的中间时也能匹配。
+    """
+    terms = set()
+    for token in tokenize(text):
+        token = token[:MAX_TOKEN_LENGTH]
+        terms.add(token)
+        if len(token.encode('utf-8')) != len(token):  # 含非ASCII字符
+            for i in range(1, len(token)):
+                terms.add(token[i:])
+    return terms
+
+
+def request_text(name: str, request: Optional[Dict]) -> List[str]:
+    """请求中参与检索的文本：名称、方法、URL、Header的键和值、请求体"""
+    parts = [name]
+    if isinstance(request, dict):
+        parts.append(request.get('method', ''))
+        parts.append(request.get('url', ''))
+        for header in request.get('headers') or []:
+            if isinstance(header, dict):
+                parts.append(header.get('key', ''))
+                parts.append(header.get('value', ''))
+        body = request.get('body')
+        if isinstance(body, str):
+            parts.append(body[:BODY_INDEX_LIMIT])
+        elif isinstance(body, list):
+            for field in body:
+                if isinstance(field, dict):
+                    parts.append(field.get('key', ''))
+                    parts.append(field.get('value', ''))
+    return [p for p in parts if isinstance(p, str) and p]
+
+
+class _Doc:
+    __slots__ = ('path', 'name', 'request', 'terms', 'order')
+
+    def __init__(self, path, name, request, terms, order):
+        self.path = path
+        self.name = name
+        self.request = request
+        self.terms = terms
+        self.order = order
+
+
+class SearchIndex:
+    """集合中请求的内存倒排索引（词 -> 请求）
+
+    update() 在每次集合数据变化（加载、保存）后调用：请求数据对象和名称都没有变化的
+    请求只更新路径，不重新分词，因此重命名、拖拽的代价与请求数量成线性而与文本大小无关。
+    尚未读取的分片集合在第一次查询时通过 loader 读取并建立索引。
+    """
+
+    def __init__(self, loader=None):
+        self.loader = loader  # loader(node) -> 读取后的集合节点，用于未加载的分片集合
+        self._docs = {}  # type: Dict[int, _Doc]
+        self._by_request = {}  # type: Dict[int, int]  # id(请求数据) -> 文档编号
+        self._postings = {}  # type: Dict[str, Set[int]]
+        self._vocabulary = []  # type: List[str]  # 排序后的词表，用于前缀查找
+        self._vocabulary_dirty = False
+        self._next_id = 1
+        self._shards = {}  # type: Dict[str, List]  # 分片文件名 -> [(相对路径, 文档编号)]
+        self._pending_shards = []  # type: List  # [(路径, 节点, 序号)] 尚未建立索引的分片集合
+
+    def __len__(self):
+        return len(self._docs)
+
+    def update(self, nodes: List[Dict]):
+        """按当前的集合数据（collections.json 结构）更新索引"""
+        old_docs = self._docs
+        old_by_request = self._by_request
+        docs = {}
+        by_request = {}
+        shards = {}
+        pending = []
+        seq = 0
+        stack = [(node, '') for node in reversed(nodes)]
+        while stack:
+            node, parent_path = stack.pop()
+            if not isinstance(node, dict):
+                continue
+            path = parent_path + '/' + node.get('name', '') if parent_path else node.get('name', '')
+            seq += 1
+            if node.get('type') == 'collection':
+                if 'children' in node or 'shard' not in node:
+                    stack.extend((child, path) for child in reversed(node.get('children', [])))
+                    continue
+                # 尚未读取的分片集合：已建立索引的沿用原索引，否则在查询时读取
+                shard = node['shard']
+                entries = self._shards.get(shard)
+                if entries is None:
+                    pending.append((path, node, seq))
+                    continue
+                for rel_path, doc_id in entries:
+                    doc = old_docs.get(doc_id)
+                    if doc is not None:
+                        doc.path = path + rel_path
+                        doc.order = (seq, doc.order[1])
+                        docs[doc_id] = doc
+                shards[shard] = entries
+            elif node.get('type') == 'request':
+                name = node.get('name', '')
+                request = node.get('request')
+                doc_id = old_by_request.get(id(request))
+                doc = old_docs.get(doc_id) if doc_id is not None else None
+                if doc is None or doc.request is not request or doc.name != name or doc_id in docs:
+                    doc_id, doc = self._add(path, name, request, (seq, 0))
+                doc.path = path
+                doc.order = (seq, 0)
+                docs[doc_id] = doc
+                by_request.setdefault(id(request), doc_id)
+        for doc_id, doc in old_docs.items():
+            if doc_id not in docs:
+                self._drop_postings(doc_id, doc.terms)
+        self._docs = docs
+        self._by_request = by_request
+        self._shards = shards
+        self._pending_shards = pending
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """返回匹配的请求路径（按树中的顺序）；查询中的每个词都需匹配某个词的前缀"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        self._load_pending_shards()
+        matched = None
+        # 先处理匹配文档较少的词，交集尽快缩小
+        for term in sorted(set(terms), key=len, reverse=True):
+            docs = self._prefix_docs(term[:MAX_TOKEN_LENGTH])
+            matched = docs if matched is None else matched & docs
+            if not matched:
+                return []
+        results = sorted((self._docs[d] for d in matched if d in self._docs), key=lambda doc: doc.order)
+        if limit is not None:
+            results = results[:limit]
+        return [doc.path for doc in results]
+
+    def _prefix_docs(self, prefix) -> Set[int]:
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        vocabulary = self._vocabulary
+        docs = set()
+        i = bisect.bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            docs |= self._postings.get(vocabulary[i], ())
+            i += 1
+        return docs
+
+    def _add(self, path, name, request, order):
+        """为请求分词并加入倒排表，返回 (文档编号, 文档)"""
+        doc_id = self._next_id
+        self._next_id += 1
+        terms = set()
+        for text in request_text(name, request):
+            terms |= _index_terms(text)
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = {doc_id}
+                self._vocabulary_dirty = True
+            else:
+                postings.add(doc_id)
+        return doc_id, _Doc(path, name, request, frozenset(terms), order)
+
+    def _drop_postings(self, doc_id, terms):
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.discard(doc_id)
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+
+    def _load_pending_shards(self):
+        if not self._pending_shards or self.loader is None:
+            return
+        pending, self._pending_shards = self._pending_shards, []
+        for path, node, seq in pending:
+            try:
+                loaded = self.loader(node)
+            except Exception as e:
+                print(f"SearchIndex: 读取分片 {node.get('shard')} 失败: {e}")
+                continue
+            entries = []
+            stack = [(child, path) for child in reversed(loaded.get('children', []))]
+            while stack:
+                child, parent_path = stack.pop()
+                if not isinstance(child, dict):
+                    continue
+                child_path = parent_path + '/' + child.get('name', '')
+                if child.get('type') == 'collection':
+                    stack.extend((c, child_path) for c in reversed(child.get('children', [])))
+                elif child.get('type') == 'request':
+                    doc_id, doc = self._add(child_path, child.get('name', ''), child.get('request'),
+                                            (seq, len(entries) + 1))
+                    self._docs[doc_id] = doc
+                    entries.append((child_path[len(path):], doc_id))
+            self._shards[node.get('shard')] = entries
@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+from ui.utils.request_worker import RequestWorker
+from ui.utils.request_timing import RequestTiming, bind_request_timing, current_timing
+from ui.utils.response_store import ResponseBody, StreamCollector
+from ui.utils.session_pool import create_cookie_jar
+from ui.utils.dns_cache import dns_generation, get_dns_cache
+
+try:
+    import httpx
+    import httpcore
+except ImportError:
+    httpx = None
+    httpcore = None
+
+try:
+    import h2  # httpx 的HTTP/2支持（pip install httpx[http2]）
+except ImportError:
+    h2 = None
+
+
+# 每个客户端保持的空闲keep-alive连接数；并发连接数不设上限，由调用方控制
+MAX_KEEPALIVE_CONNECTIONS = 100
+# httpcore连接池的调度开销随同时进行的请求数平方增长，每个客户端最多分配这么多并发请求，
+# 超出时再创建客户端
+CLIENT_MAX_IN_FLIGHT = 8
+# 并发高峰过后最多保留的空闲客户端数，多出的关闭
+MAX_IDLE_CLIENTS = 2
+
+
+def async_transport_available():
+    """是否可以使用异步传输（需要安装 httpx）"""
+    return httpx is not None
+
+
+def http2_available():
+    """是否可以使用HTTP/2（需要安装 httpx 和 h2）"""
+    return httpx is not None and h2 is not None
+
+
+class TimedNetworkBackend:
+    """包装 httpcore 的网络后端：先通过全局解析缓存解析域名再建立TCP连接，分别计入当前请求的 dns/connect 耗时"""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        timing = current_timing()
+        started = time.perf_counter()
+        addresses = await self._resolve(host, port, timeout)
+        resolved = time.perf_counter()
+        error = None
+        for address in addresses:
+            try:
+                stream = await self._backend.connect_tcp(address, port, timeout=timeout, local_address=local_address,
+                                                         socket_options=socket_options)
+                break
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        else:
+            raise error
+        if timing is not None:
+            timing.add('dns', resolved - started)
+            timing.add('connect', time.perf_counter() - resolved)
+            timing.connections += 1
+        return stream
+
+    async def _resolve(self, host, port, timeout):
+        # 缓存命中时不占用线程池；未命中时在线程池中用系统解析器解析
+        cache = get_dns_cache()
+        try:
+            addresses = cache.cached(host)
+            if addresses is None:
+                loop = asyncio.get_running_loop()
+                addresses = await asyncio.wait_for(loop.run_in_executor(None, cache.resolve, host), timeout)
+        except asyncio.TimeoutError:
+            raise httpcore.ConnectTimeout(f"Timed out resolving {host}")
+        except OSError as e:
+            raise httpcore.ConnectError(f"Failed to resolve '{host}': {e}") from e
+        return [ip for _, ip in addresses]
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds):
+        await self._backend.sleep(seconds)
+
+
+def _make_trace(timing):
+    """httpcore 的 trace 扩展回调：把TLS握手、发送请求、等待响应头的耗时计入 timing"""
+    marks = {}
+
+    async def trace(event_name, info):
+        now = time.perf_counter()
+        step, _, state = event_name.rpartition('.')
+        step = step.split('.', 1)[-1]  # 去掉 connection./http11./http2. 前缀
+        if step == 'start_tls':
+            if state == 'started':
+                marks['tls'] = now
+            elif state == 'complete':
+                timing.add('tls', now - marks.pop('tls', now))
+        elif step == 'send_request_headers' and state == 'started':
+            marks['send'] = now
+        elif step == 'send_request_body' and state == 'complete':
+            timing.add('send', now - marks.pop('send', now))
+            marks['sent'] = now
+        elif step == 'receive_response_headers' and state == 'complete':
+            timing.add('ttfb', now - marks.pop('sent', now))
+            timing.mark_headers()
+
+    return trace
+
+
+class _ClientEntry:
+    """一个 httpx.AsyncClient 及其使用情况，只在事件循环线程中访问"""
+
+    def __init__(self, client):
+        self.client = client
+        self.in_flight = 0  # 等待响应头的请求数，用于选择客户端
+        self.open = 0       # 尚未结束的请求数（包括未读完的流式响应），为0时才能关闭
+        self.retired = False
+
+
+class _ReleasingStream(httpx.AsyncByteStream if httpx is not None else object):
+    """流式响应的响应体：关闭时通知传输，读完之前客户端不会被关闭"""
+
+    def __init__(self, stream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            on_close, self._on_close = self._on_close, None
+            if on_close is not None:
+                on_close()
+
+
+class AsyncTransport:
+    """异步HTTP传输：一个常驻的asyncio事件循环线程 + 一组 httpx.AsyncClient
+
+    submit() 可在任意线程中调用，返回 concurrent.futures.Future；
+    进行中的请求只占用事件循环中的一个任务，不再每个请求一个线程。
+    客户端按并发数增加，并发下降后多余的空闲客户端被关闭。
+    """
+
+    def __init__(self):
+        if httpx is None:
+            raise RuntimeError('httpx is not installed')
+        self.loop = asyncio.new_event_loop()
+        self._clients = []  # [_ClientEntry]，只在事件循环线程中访问
+        self._http2_entry = None  # HTTP/2 只用一个客户端，同一源站的请求在一个连接上多路复用
+        self._closing = set()  # 正在关闭的客户端任务，保持引用直到完成
+        self._dns_generation = dns_generation()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='async-transport')
+        self._thread.daemon = True
+        self._thread.start()
+        self._ready.wait()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._ready.set)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """在事件循环中运行协程；返回的 Future 调用 cancel() 会取消进行中的请求"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    @staticmethod
+    def _create_client(http2=False):
+        transport = httpx.AsyncHTTPTransport(
+            http2=http2,
+            limits=httpx.Limits(max_connections=None,
+                                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS))
+        pool = getattr(transport, '_pool', None)
+        if pool is not None and hasattr(pool, '_network_backend'):
+            pool._network_backend = TimedNetworkBackend(pool._network_backend)
+        return httpx.AsyncClient(
+            timeout=None,  # 与线程传输一致，默认不超时
+            follow_redirects=True,
+            cookies=create_cookie_jar(),
+            transport=transport,
+        )
+
+    def _check_dns_generation(self):
+        if self._dns_generation != dns_generation():
+            # DNS设置变化或缓存被清空：不再使用已建立的连接。旧客户端上的请求（包括流式读取）
+            # 继续完成，随后关闭客户端
+            self._dns_generation = dns_generation()
+            entries = self._clients + ([self._http2_entry] if self._http2_entry is not None else [])
+            self._clients = []
+            self._http2_entry = None
+            for entry in entries:
+                self._retire(entry)
+
+    def _retire(self, entry):
+        """不再分配新请求；没有未结束的请求时立即关闭，否则在最后一个请求结束时关闭"""
+        entry.retired = True
+        if entry.open == 0:
+            task = self.loop.create_task(self._close_client(entry.client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_client(client):
+        try:
+            await client.aclose()
+        except Exception as e:
+            print(f"AsyncTransport: 关闭客户端出错 {e}")
+
+    def _acquire_client(self, http2=False):
+        self._check_dns_generation()
+        if http2:
+            # HTTP/2 的多路复用由 httpcore 在单个连接内调度，不按请求数拆分客户端
+            if self._http2_entry is None:
+                self._http2_entry = _ClientEntry(self._create_client(http2=True))
+            entry = self._http2_entry
+        else:
+            # 选进行中请求最少的客户端；空闲时总是第一个，顺序请求可以复用它的连接
+            entry = min(self._clients, key=lambda e: e.in_flight) if self._clients else None
+            if entry is None or entry.in_flight >= CLIENT_MAX_IN_FLIGHT:
+                entry = _ClientEntry(self._create_client())
+                self._clients.append(entry)
+        entry.in_flight += 1
+        entry.open += 1
+        return entry
+
+    def _release_client(self, entry):
+        entry.open -= 1
+        if entry.open > 0:
+            return
+        if entry.retired:
+            self._retire(entry)
+            return
+        # 并发高峰过后关闭多余的空闲客户端；保留列表前面的，顺序请求总是使用第一个
+        idle = [e for e in self._clients if e.open == 0]
+        for extra in idle[MAX_IDLE_CLIENTS:]:
+            self._clients.remove(extra)
+            self._retire(extra)
+
+    async def send(self, request_kwargs, stream=False, http2=False):
+        """以 requests.request() 的关键字参数发送请求，返回 httpx.Response
+
+        stream 为 True 时只读取响应头，调用方负责 aclose()。
+        http2 为 True 时通过共享的HTTP/2客户端发送，同一源站的并发请求在一个连接上多路复用；
+        服务器不支持（ALPN协商失败或明文http）时使用HTTP/1.1，实际协议见 response.http_version。
+        """
+        entry = self._acquire_client(http2 and h2 is not None)
+        response = None
+        try:
+            client = entry.client
+            kwargs = to_httpx_kwargs(request_kwargs)
+            timing = current_timing()
+            if timing is not None:
+                kwargs['extensions'] = {'trace': _make_trace(timing)}
+            request = client.build_request(**kwargs)
+            response = await client.send(request, stream=stream)
+            if stream:
+                # 响应体读完或关闭时才结束，期间客户端不会被关闭
+                response.stream = _ReleasingStream(response.stream, lambda: self._release_client(entry))
+            return response
+        finally:
+            # 流式响应在收到响应头后即不再计入 in_flight，只影响客户端的选择
+            entry.in_flight -= 1
+            if response is None or not stream:
+                self._release_client(entry)
+
+
+def to_httpx_kwargs(request_kwargs):
+    """requests.request() 的关键字参数 -> httpx.AsyncClient.build_request() 的参数"""
+    kwargs = {'method': request_kwargs['method'], 'url': request_kwargs['url']}
+    for key in ('params', 'headers', 'json', 'files'):
+        if request_kwargs.get(key):
+            kwargs[key] = request_kwargs[key]
+    data = request_kwargs.get('data')
+    if isinstance(data, (str, bytes)):
+        # 原始文本作为请求体发送，不做表单编码
+        kwargs['content'] = data
+    elif data:
+        kwargs['data'] = data
+    if 'timeout' in request_kwargs:
+        timeout = request_kwargs['timeout']
+        if isinstance(timeout, tuple):
+            # requests 的 (连接超时, 读取超时)
+            timeout = httpx.Timeout(None, connect=timeout[0], read=timeout[1])
+        kwargs['timeout'] = timeout
+    return kwargs
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_async_transport():
+    """获取全局异步传输（首次调用时启动事件循环线程）"""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = AsyncTransport()
+        return _transport
+
+
+class AsyncRequestWorker(RequestWorker):
+    """请求工作对象 - asyncio版本
+
+    接口和信号与 RequestWorker 相同；请求作为协程在共享事件循环中运行，
+    stop() 直接取消协程，进行中的连接随之关闭。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._future = None
+
+    def start(self):
+        """提交到事件循环"""
+        try:
+            print("AsyncRequestWorker: 提交请求到事件循环")
+            self._future = get_async_transport().submit(self.run_async())
+            self._future.add_done_callback(self._on_done)
+        except Exception as e:
+            print(f"AsyncRequestWorker.start() 出错: {e}")
+            self.error.emit(f"Unexpected error: {str(e)}")
+
+    def stop(self):
+        """停止请求：取消事件循环中的协程"""
+        self._stop_flag = True
+        future = self._future
+        if future is not None:
+            print("AsyncRequestWorker: 取消请求")
+            future.cancel()
+
+    def _on_done(self, future):
+        # finished/error/stopped 只在此处发出，保证每个请求只发出其中一个
+        if future.cancelled():
+            print("AsyncRequestWorker: 请求已取消")
+            self.stopped.emit()
+            return
+        error = future.exception()
+        if error is not None:
+            print(f"AsyncRequestWorker: 请求出错 {error}")
+            if self._stop_flag:
+                self.stopped.emit()
+            elif self._timed_out:
+                self.error.emit(self.timeout_message())
+            else:
+                self.error.emit(f"Unexpected error: {str(error) or type(error).__name__}")
+            return
+        result = future.result()
+        if result is None or self._stop_flag:
+            self.stopped.emit()
+        else:
+            self.finished.emit(result)
+
+    async def run_async(self):
+        """执行请求，返回响应数据；被停止时返回 None。超过总超时时取消请求"""
+        if not self.total_timeout:
+            return await self._run_async()
+        try:
+            return await asyncio.wait_for(self._run_async(), self.total_timeout)
+        except asyncio.TimeoutError:
+            self._timed_out = True
+            raise
+
+    async def _run_async(self):
+        if self._stop_flag:
+            return None
+        request_kwargs = self.build_request_kwargs()
+        transport = get_async_transport()
+        print(f"AsyncRequestWorker: 发送请求 {self.method} {self.url}")
+        if self.stream:
+            return await self._run_streaming_async(transport, request_kwargs)
+        timing = RequestTiming()
+        with bind_request_timing(timing):
+            response = await transport.send(request_kwargs, http2=self.http2)
+        timing.finish()
+        # 构建响应数据；超过阈值的响应体写入临时文件
+        response_body = ResponseBody.from_bytes(
+            response.content, self.spill_threshold, response.encoding or 'utf-8')
+        print(f"AsyncRequestWorker: 请求完成，状态码 {response.status_code}")
+        return {
+            'status_code': response.status_code,
+            'status_text': f"{response.status_code} {response.reason_phrase}",
+            'http_version': response.http_version,
+            'headers': dict(response.headers),
+            'body': '' if response_body.is_file_backed() else response.text,
+            'response_body': response_body,
+            'size': response_body.size,
+            'url': str(response.url),
+            'elapsed': timing.total(),
+            'timing': timing.to_dict()
+        }
+
+    async def _run_streaming_async(self, transport, request_kwargs):
+        start = time.monotonic()
+        timing = RequestTiming()
+        with bind_request_timing(timing):
+            response = await transport.send(request_kwargs, stream=True, http2=self.http2)
+        collector = None
+        try:
+            print(f"AsyncRequestWorker: 收到响应头，状态码 {response.status_code}，开始流式读取")
+            total = response.headers.get('Content-Length')
+            total = int(total) if total and total.isdigit() else None
+            collector = StreamCollector(response.encoding or 'utf-8', self.spill_threshold, self.preview_limit)
+            last_emit = start
+            async for chunk in response.aiter_bytes(self.chunk_size):
+                if self._stop_flag:
+                    collector.discard()
+                    return None
+                collector.feed(chunk)
+                now = time.monotonic()
+                if now - last_emit >= self.STREAM_EMIT_INTERVAL:
+                    last_emit = now
+                    self._emit_stream_progress(collector, start, total, now)
+            response_body = collector.finish()
+            elapsed = time.monotonic() - start
+            timing.finish()
+            self._emit_stream_progress(collector, start, total, start + elapsed)
+            return self._stream_result(response.status_code, response.reason_phrase, response.headers,
+                                       response.url, response_body, collector.received, elapsed, timing,
+                                       response.http_version)
+        except BaseException:
+            # 包括取消（CancelledError）
+            if collector is not None:
+                collector.discard()
+            raise
+        finally:
+            await response.aclose()
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import zlib
+from typing import Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# 压缩方式：zstd（需安装 zstandard）压缩率和速度都优于 zlib；未安装时使用 zlib
+DEFAULT_CODEC = 'zstd' if zstandard is not None else 'zlib'
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+# 写入压缩文件时每次读取的块大小
+FILE_CHUNK_SIZE = 1024 * 1024
+
+
+def body_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def compress_body(data: bytes, codec: str = DEFAULT_CODEC) -> Tuple[str, bytes]:
+    """压缩内容，返回 (实际使用的压缩方式, 数据)；压缩后不更小时原样保存（'raw'）"""
+    if codec == 'zstd' and zstandard is not None:
+        payload = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    elif codec in ('zstd', 'zlib'):
+        codec, payload = 'zlib', zlib.compress(data, ZLIB_LEVEL)
+    elif codec == 'gzip':
+        payload = gzip.compress(data, ZLIB_LEVEL)
+    else:
+        return 'raw', bytes(data)
+    if len(payload) >= len(data):
+        return 'raw', bytes(data)
+    return codec, payload
+
+
+def decompress_body(codec: str, payload: bytes) -> bytes:
+    if codec == 'raw':
+        return bytes(payload)
+    if codec == 'zlib':
+        return zlib.decompress(payload)
+    if codec == 'gzip':
+        return gzip.decompress(payload)
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError('zstandard is not installed, cannot read zstd-compressed content')
+        # 流式解压：压缩时写入了内容大小，这里不依赖它
+        return zstandard.ZstdDecompressor().decompressobj().decompress(payload)
+    raise ValueError(f'Unknown codec: {codec}')
+
+
+def codec_for_path(path: str) -> str:
+    """按扩展名选择保存文件的压缩方式：.gz -> gzip，.zst -> zstd，其他不压缩"""
+    lower = path.lower()
+    if lower.endswith('.gz'):
+        return 'gzip'
+    if lower.endswith('.zst'):
+        return 'zstd'
+    return 'raw'
+
+
+def open_compressed_writer(path: str, codec: str):
+    """打开写入文件的流，按 codec 压缩；调用方负责 close()"""
+    if codec == 'gzip':
+        return gzip.open(path, 'wb', compresslevel=ZLIB_LEVEL)
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError('zstandard is not installed, cannot write .zst files')
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(open(path, 'wb'), closefd=True)
+    return open(path, 'wb')
+
+
+def file_has_content(path: str, size: int, digest: str) -> bool:
+    """文件内容是否与给定大小和哈希相同（先比较大小，相同时才读取计算哈希）"""
+    try:
+        if os.path.getsize(path) != size:
+            return False
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(FILE_CHUNK_SIZE), b''):
+                h.update(chunk)
+        return h.hexdigest() == digest
+    except OSError:
+        return False
+
+
+class BlobStore:
+    """SQLite表中按内容寻址的压缩存储
+
+    内容以 SHA-256 为键，只在第一次出现时压缩和写入，之后只增加引用计数；
+    release() 减少引用计数，为0时删除。重复的响应体（健康检查、轮询接口）只保存一份。
+    方法都接收调用方的连接，可以和调用方的其他写入放在同一个事务中。
+    """
+
+    def __init__(self, table: str = 'blobs', codec: str = DEFAULT_CODEC):
+        self.table = table
+        self.codec = codec
+
+    def schema(self) -> str:
+        return (f'CREATE TABLE IF NOT EXISTS {self.table} (\n'
+                '    hash TEXT PRIMARY KEY,\n'
+                '    size INTEGER NOT NULL,\n'
+                "    codec TEXT NOT NULL DEFAULT 'zlib',\n"
+                '    data BLOB NOT NULL,\n'
+                '    refs INTEGER NOT NULL\n'
+                ');\n')
+
+    def release_trigger(self, name: str, owner_table: str, *columns: str) -> str:
+        """owner_table 的行被删除时释放其引用的内容的触发器
+
+        每列单独减少一次引用：同一行的两列引用同一内容时（如请求体和响应体相同），
+        put() 增加了两次引用，这里也要减少两次。
+        """
+        updates = ''.join(f'    UPDATE {self.table} SET refs = refs - 1 WHERE hash = OLD.{c};\n' for c in columns)
+        refs = ', '.join(f'OLD.{c}' for c in columns)
+        return (f'CREATE TRIGGER IF NOT EXISTS {name} AFTER DELETE ON {owner_table} BEGIN\n'
+                + updates +
+                f'    DELETE FROM {self.table} WHERE refs <= 0 AND hash IN ({refs});\n'
+                'END;\n')
+
+    def put(self, conn: sqlite3.Connection, data: bytes) -> str:
+        """保存内容并增加引用计数，返回内容的哈希"""
+        digest = body_digest(data)
+        cursor = conn.execute(f'UPDATE {self.table} SET refs = refs + 1 WHERE hash = ?', (digest,))
+        if cursor.rowcount == 0:
+            codec, payload = compress_body(data, self.codec)
+            conn.execute(f'INSERT INTO {self.table} (hash, size, codec, data, refs) VALUES (?,?,?,?,1)',
+                         (digest, len(data), codec, payload))
+        return digest
+
+    def release(self, conn: sqlite3.Connection, digest: str):
+        conn.execute(f'UPDATE {self.table} SET refs = refs - 1 WHERE hash = ?', (digest,))
+        conn.execute(f'DELETE FROM {self.table} WHERE hash = ? AND refs <= 0', (digest,))
+
+    def get(self, conn: sqlite3.Connection, digest: str) -> Optional[bytes]:
+        row = conn.execute(f'SELECT codec, data FROM {self.table} WHERE hash = ?', (digest,)).fetchone()
+        return decompress_body(row[0], row[1]) if row else None
+
+    def stats(self, conn: sqlite3.Connection) -> Tuple[int, int, int]:
+        """(内容数, 原始总大小, 存储总大小)"""
+        row = conn.execute(f'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0)'
+                           f' FROM {self.table}').fetchone()
+        return row[0], row[1], row[2]
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import queue
+import threading
+import time
+from PyQt5.QtCore import QObject, pyqtSignal
+from ui.utils.request_builder import build_request_from_data, close_file_handles, to_request_kwargs, use_http2
+from ui.utils.session_pool import get_session_pool
+from ui.utils.request_worker import http_version_of
+from ui.utils.async_transport import async_transport_available, get_async_transport, http2_available
+
+
+def collect_requests(node, path=''):
+    """按树中的顺序列出集合节点下的所有请求，返回 [(路径, 请求数据)]"""
+    requests = []
+    stack = [(node, path)]
+    while stack:
+        current, current_path = stack.pop()
+        if current.get('type') == 'request':
+            requests.append((current_path, current.get('request') or {}))
+            continue
+        for child in reversed(current.get('children', [])):
+            if isinstance(child, dict):
+                stack.append((child, current_path + '/' + child.get('name', '') if current_path else child.get('name', '')))
+    return requests
+
+
+class CollectionRunner(QObject):
+    """批量运行集合中的请求
+
+    concurrency 个工作线程从队列中依次取出请求执行（为1时按顺序执行），
+    请求参数与 send_request 一样由 request_builder 构建，并通过全局会话池复用连接。
+    每个请求完成后立即发出 result 信号；响应体只保留大小，不保存在内存中。
+    transport 为 'async' 且已安装 httpx 时，改为在共享事件循环中运行 concurrency 个协程。
+    使用HTTP/2的请求（请求自己选择，或未选择时按 http2）总是通过异步传输的共享HTTP/2客户端发送，
+    并发的请求在同一连接上多路复用。
+    """
+    started = pyqtSignal(int)                 # 请求总数
+    request_started = pyqtSignal(int)         # 序号
+    result = pyqtSignal(int, dict)            # 序号, 结果
+    finished = pyqtSignal(int, int, float)    # 成功数, 失败数, 总耗时(秒)
+
+    def __init__(self, requests, concurrency=1, timeout=None, transport='thread', http2=False, parent=None):
+        super().__init__(parent)
+        self.use_async = transport == 'async' and async_transport_available()
+        self.http2 = http2
+        self.requests = list(requests)  # [(路径, 请求数据)]
+        self.concurrency = max(1, int(concurrency))
+        self.timeout = timeout if timeout else None
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stop_flag = False
+        self._threads = []
+        self._future = None
+        self._exited = 0
+        self._passed = 0
+        self._failed = 0
+        self._start_time = 0.0
+
+    def start(self):
+        for index in range(len(self.requests)):
+            self._queue.put(index)
+        self._start_time = time.monotonic()
+        self.started.emit(len(self.requests))
+        if not self.requests:
+            self.finished.emit(0, 0, 0.0)
+            return
+        if self.use_async:
+            self._future = get_async_transport().submit(self._run_async())
+            return
+        self._threads = [threading.Thread(target=self._run) for _ in range(min(self.concurrency, len(self.requests)))]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def stop(self):
+        """停止运行：尚未开始的请求不再发送，进行中的请求完成后结束"""
+        self._stop_flag = True
+
+    def is_running(self):
+        if self._future is not None:
+            return not self._future.done()
+        return any(t.is_alive() for t in self._threads)
+
+    def _run(self):
+        try:
+            while not self._stop_flag:
+                try:
+                    index = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+                self.request_started.emit(index)
+                self._report(index, self._execute(*self.requests[index]))
+        finally:
+            # 最后一个退出的工作线程发出 finished
+            with self._lock:
+                self._exited += 1
+                last = self._exited == len(self._threads)
+            if last:
+                self.finished.emit(self._passed, self._failed, time.monotonic() - self._start_time)
+
+    def _report(self, index, row):
+        with self._lock:
+            if row.get('error') is None and row.get('status_code', 0) < 400:
+                self._passed += 1
+            else:
+                self._failed += 1
+        self.result.emit(index, row)
+
+    async def _run_async(self):
+        try:
+            await asyncio.gather(*[self._worker_async() for _ in range(min(self.concurrency, len(self.requests)))])
+        finally:
+            self.finished.emit(self._passed, self._failed, time.monotonic() - self._start_time)
+
+    async def _worker_async(self):
+        # 协程都在事件循环线程中运行，队列的 get_nowait 不会阻塞
+        while not self._stop_flag:
+            try:
+                index = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self.request_started.emit(index)
+            self._report(index, await self._execute_async(*self.requests[index]))
+
+    async def _execute_async(self, path, request):
+        prepared = None
+        start = time.monotonic()
+        row = self._new_row(path, request)
+        try:
+            prepared = build_request_from_data(request)
+            response = await get_async_transport().send(to_request_kwargs(prepared, self.timeout),
+                                                        http2=self._use_http2(prepared))
+            self._fill_row_async(row, response)
+        except Exception as e:
+            row['error'] = str(e) or type(e).__name__
+        finally:
+            if prepared is not None:
+                close_file_handles(prepared['file_handles'])
+        row['elapsed'] = time.monotonic() - start
+        return row
+
+    def _use_http2(self, prepared):
+        return http2_available() and use_http2(prepared['http_version'], self.http2)
+
+    @staticmethod
+    def _fill_row_async(row, response):
+        row['status_code'] = response.status_code
+        row['status_text'] = f"{response.status_code} {response.reason_phrase}"
+        row['http_version'] = response.http_version
+        row['size'] = len(response.content)
+
+    @staticmethod
+    def _new_row(path, request):
+        return {'path': path, 'method': (request.get('method') or 'GET').upper(),
+                'url': request.get('url', ''), 'error': None}
+
+    def _execute(self, path, request):
+        prepared = None
+        start = time.monotonic()
+        row = self._new_row(path, request)
+        try:
+            prepared = build_request_from_data(request)
+            request_kwargs = to_request_kwargs(prepared, self.timeout)
+            if self._use_http2(prepared):
+                # 在事件循环中发送并等待结果；各工作线程的请求共用HTTP/2连接
+                transport = get_async_transport()
+                self._fill_row_async(row, transport.submit(transport.send(request_kwargs, http2=True)).result())
+            else:
+                response = get_session_pool().request(**request_kwargs)
+                row['status_code'] = response.status_code
+                row['status_text'] = f"{response.status_code} {response.reason}"
+                row['http_version'] = http_version_of(response)
+                row['size'] = len(response.content)
+                response.close()
+        except Exception as e:
+            row['error'] = str(e)
+        finally:
+            if prepared is not None:
+                close_file_handles(prepared['file_handles'])
+        row['elapsed'] = time.monotonic() - start
+        return row
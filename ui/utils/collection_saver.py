@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import stat
+import tempfile
+import threading
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+# 当前进程的umask，用于新建文件的权限（mkstemp 创建的文件权限为0600）
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_text_atomic(path, text):
+    """原子写入文本文件，返回写入的字节数
+
+    先写入同目录下的临时文件并只对该文件 fsync，再用 os.replace 替换目标文件，
+    写入中途出错或退出时原文件保持完整。
+    """
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    payload = text.encode('utf-8')
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            mode = stat.S_IMODE(os.stat(path).st_mode)  # 沿用原文件的权限
+        else:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return len(payload)
+
+
+def write_json_atomic(path, data, compact=False):
+    """原子写入JSON文件，compact=True 时不缩进"""
+    if compact:
+        text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    return write_text_atomic(path, text)
+
+
+class CollectionSaver(QObject):
+    """集合数据的持久化
+
+    schedule() 只记录最新的数据并重新开始防抖计时，防抖时间内的多次修改
+    （重命名、拖拽、新建等）合并为一次写入；写入在后台线程中进行。
+    设置了 store（ShardedCollectionStore）时写入分片目录，否则写入单个JSON文件。
+    """
+    saved = pyqtSignal(str, int)        # 路径, 写入字节数
+    save_failed = pyqtSignal(str, str)  # 路径, 错误信息
+
+    def __init__(self, debounce_ms=500, compact=False, store=None, parent=None):
+        super().__init__(parent)
+        self.compact = compact
+        self.store = store
+        self._lock = threading.Lock()
+        self._pending = None  # (path, data)，尚未写入的最新数据
+        self._thread = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(max(0, int(debounce_ms)))
+        self._timer.timeout.connect(self._start_writer)
+
+    def configure(self, debounce_ms=None, compact=None):
+        if debounce_ms is not None:
+            self._timer.setInterval(max(0, int(debounce_ms)))
+        if compact is not None:
+            self.compact = bool(compact)
+
+    def schedule(self, path, data):
+        """记录待保存的数据，防抖时间后在后台写入"""
+        with self._lock:
+            self._pending = (path, data)
+        self._timer.start()
+
+    def has_pending(self):
+        with self._lock:
+            return self._pending is not None or self._thread is not None
+
+    def save_now(self, path, data):
+        """同步写入（丢弃尚未写入的旧数据），出错时抛出异常"""
+        self._timer.stop()
+        self._wait_writer()
+        with self._lock:
+            self._pending = None
+        size = self._write_data(path, data)
+        self.saved.emit(path, size)
+        return size
+
+    def flush(self):
+        """等待后台写入完成，并同步写入尚未开始的数据（退出前调用）"""
+        self._timer.stop()
+        self._wait_writer()
+        with self._lock:
+            job, self._pending = self._pending, None
+        if job is not None:
+            self._write(job)
+
+    def _wait_writer(self):
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _start_writer(self):
+        with self._lock:
+            if self._pending is None or self._thread is not None:
+                return  # 正在写入的线程结束前会继续写入最新的数据
+            self._thread = threading.Thread(target=self._run)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                job, self._pending = self._pending, None
+                if job is None:
+                    self._thread = None
+                    return
+            self._write(job)
+
+    def _write(self, job):
+        path, data = job
+        try:
+            size = self._write_data(path, data)
+            self.saved.emit(path, size)
+        except Exception as e:
+            self.save_failed.emit(path, str(e))
+
+    def _write_data(self, path, data):
+        if self.store is not None:
+            return self.store.save(data, self.compact)
+        return write_json_atomic(path, data, self.compact)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import ipaddress
+import queue
+import socket
+import threading
+import time
+from ui.utils.settings_manager import load_settings
+
+try:
+    import dns.resolver
+except ImportError:
+    dns = None
+
+
+DEFAULT_DNS_CACHE_TTL = 60
+DEFAULT_DNS_NEGATIVE_TTL = 10
+MAX_DNS_CACHE_ENTRIES = 1024
+# 只缓存“域名不存在/没有地址”这类确定的失败；临时错误（EAI_AGAIN 等）每次重新解析
+_NEGATIVE_ERRNOS = {getattr(socket, name) for name in ('EAI_NONAME', 'EAI_NODATA') if hasattr(socket, name)}
+
+
+def normalize_host(host):
+    return host.strip().strip('[]').rstrip('.').lower()
+
+
+def parse_overrides(overrides):
+    """{主机名: 'IP1, IP2' 或 [IP, ...]} -> {主机名: [(family, IP)]}；无效的IP抛出 ValueError"""
+    result = {}
+    for host, addresses in (overrides or {}).items():
+        if isinstance(addresses, str):
+            addresses = addresses.replace(',', ' ').split()
+        parsed = []
+        for address in addresses:
+            ip = ipaddress.ip_address(address.strip('[]'))
+            parsed.append((socket.AF_INET6 if ip.version == 6 else socket.AF_INET, str(ip)))
+        if parsed and normalize_host(host):
+            result[normalize_host(host)] = parsed
+    return result
+
+
+def _filter_family(addresses, family):
+    if family in (socket.AF_UNSPEC, None):
+        return list(addresses)
+    return [address for address in addresses if address[0] == family]
+
+
+class DnsCache:
+    """进程内的域名解析缓存，所有传输方式共用
+
+    - overrides 中手动指定的地址（类似 hosts 文件）优先，不做解析
+    - 解析使用系统解析器（遵循 hosts 文件等系统配置）；成功的结果缓存 ttl 秒。
+      安装了 dnspython 时在后台线程中查询记录的TTL（不阻塞请求），记录TTL更短时提前过期
+    - 域名不存在的结果缓存 negative_ttl 秒，期间直接报同样的错误
+    """
+
+    def __init__(self, enabled=False, ttl=DEFAULT_DNS_CACHE_TTL, negative_ttl=DEFAULT_DNS_NEGATIVE_TTL,
+                 overrides=None):
+        self._lock = threading.Lock()
+        self._ttl_queue = None  # 待查询记录TTL的 (主机名, 地址列表, 缓存时间)，后台线程首次使用时创建
+        self._entries = {}  # 主机名 -> (过期时间, [(family, IP)] 或 socket.gaierror)
+        self.enabled = True
+        self.ttl = DEFAULT_DNS_CACHE_TTL
+        self.negative_ttl = DEFAULT_DNS_NEGATIVE_TTL
+        self.overrides = {}
+        self.configure(enabled, ttl, negative_ttl, overrides)
+
+    def configure(self, enabled=None, ttl=None, negative_ttl=None, overrides=None):
+        parsed = parse_overrides(overrides) if overrides is not None else None
+        with self._lock:
+            if enabled is not None:
+                self.enabled = bool(enabled)
+            if ttl is not None:
+                self.ttl = max(0, int(ttl))
+            if negative_ttl is not None:
+                self.negative_ttl = max(0, int(negative_ttl))
+            if parsed is not None:
+                self.overrides = parsed
+            if not self.enabled:
+                self._entries.clear()
+
+    def flush(self):
+        """清空缓存（手动指定的地址保留）"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            live = [value for expires, value in self._entries.values() if expires > now]
+        negative = sum(1 for value in live if isinstance(value, Exception))
+        return {'entries': len(live) - negative, 'negative': negative, 'overrides': len(self.overrides)}
+
+    def cached(self, host, family=socket.AF_UNSPEC):
+        """不做解析，只查手动指定的地址和缓存
+
+        返回 [(family, IP)]；没有可用的缓存时返回 None；缓存了解析失败时抛出 socket.gaierror。
+        """
+        host = normalize_host(host)
+        if host in self.overrides:
+            return _filter_family(self.overrides[host], family)
+        try:
+            ip = ipaddress.ip_address(host)
+            return [(socket.AF_INET6 if ip.version == 6 else socket.AF_INET, str(ip))]
+        except ValueError:
+            pass
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(host)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        if isinstance(entry[1], socket.gaierror):
+            # 每次抛出新的异常对象，避免同一个异常的 traceback 不断累积
+            raise socket.gaierror(entry[1].errno, entry[1].strerror)
+        return _filter_family(entry[1], family)
+
+    def resolve(self, host, family=socket.AF_UNSPEC):
+        """解析主机名，返回去重后的 [(family, IP)]，按系统返回的顺序；解析失败抛出 socket.gaierror"""
+        addresses = self.cached(host, family)
+        if addresses is not None:
+            return addresses
+        host = normalize_host(host)
+        try:
+            addresses = self._lookup(host)
+        except socket.gaierror as e:
+            if self.enabled and self.negative_ttl and e.errno in _NEGATIVE_ERRNOS:
+                self._store(host, e, self.negative_ttl)
+            raise
+        if self.enabled and self.ttl:
+            self._store(host, addresses, self.ttl)
+            if dns is not None:
+                self._refine_ttl(host, addresses)
+        return _filter_family(addresses, family)
+
+    def _lookup(self, host):
+        addresses = []
+        for family, _, _, _, sockaddr in socket.getaddrinfo(host, None, socket.AF_UNSPEC, socket.SOCK_STREAM):
+            address = (family, sockaddr[0])
+            if address not in addresses:
+                addresses.append(address)
+        return addresses
+
+    def _refine_ttl(self, host, addresses):
+        """在后台查询记录的TTL，比设置的TTL短时缩短缓存时间"""
+        with self._lock:
+            if self._ttl_queue is None:
+                self._ttl_queue = queue.Queue()
+                thread = threading.Thread(target=self._ttl_loop, name='dns-ttl')
+                thread.daemon = True
+                thread.start()
+        self._ttl_queue.put((host, addresses, time.monotonic()))
+
+    def _ttl_loop(self):
+        while True:
+            host, addresses, stored_at = self._ttl_queue.get()
+            try:
+                self._apply_record_ttl(host, addresses, stored_at)
+            except Exception as e:
+                print(f"DnsCache: 查询记录TTL出错 {host}: {e}")
+
+    def _apply_record_ttl(self, host, addresses, stored_at):
+        record_ttl = self._record_ttl(host)
+        if record_ttl is None:
+            return
+        with self._lock:
+            entry = self._entries.get(host)
+            # 期间缓存被清空或重新解析过，不再修改
+            if entry is not None and entry[1] is addresses:
+                self._entries[host] = (min(entry[0], stored_at + record_ttl), addresses)
+
+    @staticmethod
+    def _record_ttl(host):
+        """用 dnspython 查询 A/AAAA 记录的TTL；查询失败（如名称只在 hosts 文件中）时返回 None"""
+        ttls = []
+        for rdtype in ('A', 'AAAA'):
+            try:
+                answer = dns.resolver.resolve(host, rdtype, raise_on_no_answer=False, lifetime=2)
+            except Exception:
+                continue
+            if answer.rrset is not None:
+                ttls.append(answer.rrset.ttl)
+        return min(ttls) if ttls else None
+
+    def _store(self, host, value, ttl):
+        with self._lock:
+            self._entries.pop(host, None)
+            if len(self._entries) >= MAX_DNS_CACHE_ENTRIES:
+                now = time.monotonic()
+                for key in [key for key, (expires, _) in self._entries.items() if expires <= now]:
+                    del self._entries[key]
+                while len(self._entries) >= MAX_DNS_CACHE_ENTRIES:
+                    # 字典按插入顺序：删除最早缓存的
+                    del self._entries[next(iter(self._entries))]
+            self._entries[host] = (time.monotonic() + ttl, value)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+_generation = 0  # 设置变更或清空缓存时递增，多进程传输的子进程据此同步
+
+
+def _settings_kwargs(settings):
+    return {
+        'enabled': settings.get('dns_cache_enabled', False),
+        'ttl': settings.get('dns_cache_ttl', DEFAULT_DNS_CACHE_TTL),
+        'negative_ttl': settings.get('dns_negative_ttl', DEFAULT_DNS_NEGATIVE_TTL),
+        'overrides': settings.get('dns_overrides', {}),
+    }
+
+
+def get_dns_cache():
+    """获取全局解析缓存（首次调用时按设置创建）"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            kwargs = _settings_kwargs(load_settings())
+            try:
+                _cache = DnsCache(**kwargs)
+            except ValueError as e:
+                print(f"DNS设置中的地址无效，忽略手动指定的地址: {e}")
+                kwargs['overrides'] = None
+                _cache = DnsCache(**kwargs)
+        return _cache
+
+
+def dns_generation():
+    """设置变更或清空缓存的次数；变化时各传输方式放弃已建立的连接，重新解析"""
+    return _generation
+
+
+def apply_dns_settings(settings):
+    """设置保存后立即更新全局解析缓存；设置有变化时旧的解析结果不再可靠，一并清空"""
+    global _generation
+    before = dns_cache_config()
+    get_dns_cache().configure(**_settings_kwargs(settings))
+    if dns_cache_config() != before:
+        get_dns_cache().flush()
+        _generation += 1
+
+
+def flush_dns_cache():
+    global _generation
+    get_dns_cache().flush()
+    _generation += 1
+
+
+def dns_cache_config():
+    """当前的缓存设置，发送给多进程传输的子进程（可序列化）"""
+    cache = get_dns_cache()
+    return {
+        'generation': _generation,
+        'enabled': cache.enabled,
+        'ttl': cache.ttl,
+        'negative_ttl': cache.negative_ttl,
+        'overrides': {host: [ip for _, ip in addresses] for host, addresses in cache.overrides.items()},
+    }
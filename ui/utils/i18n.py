@@ -80,6 +80,9 @@ _texts = {
         'save_response_failed': '保存响应失败',
         'select_file': '选择文件',
         'select_log_file': '选择日志文件',
+        'collections_save_delay_ms': '集合修改后延迟保存（毫秒）',
+        'collections_compact_json': '以紧凑格式保存集合文件（不缩进）',
+        'collections_sharded': '每个集合单独保存为一个文件（需重启）',
         'select_json_file': '选择JSON文件',
         'select_log_file_filter': '日志文件 (*.log);;所有文件 (*)',
         'select_all_files': '所有文件 (*)',
@@ -129,6 +132,7 @@ _texts = {
         'msg_tab_unsaved_close': '标签页 "{name}" 有未保存的更改。\n确定要关闭吗？',
         'msg_tabs_unsaved_close': '以下标签页有未保存的更改：\n{tab_list}\n\n确定要关闭它们吗？',
         'msg_tabs_unsaved_close_all': '以下标签页有未保存的更改：\n{tab_list}\n\n确定要关闭所有标签页吗？',
+        'search_collections_placeholder': '搜索请求（名称、URL、Header、Body）',
         # 查找/替换相关
         'find_replace': '查找/替换',
         'find_replace_tooltip': '查找/替换 (支持正则)',
@@ -145,6 +149,122 @@ _texts = {
         'not_found': '未找到',
         'replaced': '已替换',
         'replace_all_done': '全部替换完成，共替换 {count} 处',
+        # 网络设置相关
+        'network': '网络',
+        'http_pool_size': '每个主机的连接池大小:',
+        'http_pool_max_per_host': '每个主机最大并发请求数 (0为不限制):',
+        'http_pool_idle_timeout': '空闲连接回收时间 (秒):',
+        'max_concurrent_requests': '同时发送的最大请求数:',
+        'max_concurrent_per_host': '同一主机同时发送的最大请求数 (0为不限制):',
+        'request_transport': '请求传输方式:',
+        'request_transport_thread': '线程（每个请求一个线程）',
+        'request_transport_async': '异步（共享事件循环，需要httpx）',
+        'request_transport_process': '多进程（预启动进程池，可强制终止）',
+        'request_transport_tooltip': '异步方式在一个事件循环线程中处理所有请求，适合集合运行和压测的高并发；未安装httpx时使用线程方式。多进程方式在独立进程中发送请求，停止时直接终止进程，不支持流式下载',
+        'process_pool_size': '多进程传输预启动的进程数:',
+        'dns': 'DNS',
+        'dns_cache_enabled': '缓存域名解析结果',
+        'dns_cache_ttl': '解析结果缓存时间 (秒，安装dnspython时不超过记录的TTL):',
+        'dns_negative_ttl': '域名不存在的结果缓存时间 (秒，0为不缓存):',
+        'dns_overrides': '手动指定的主机地址（类似hosts文件，多个地址用逗号分隔）:',
+        'dns_override_host': '主机名',
+        'dns_override_addresses': 'IP地址',
+        'dns_override_add': '添加',
+        'dns_override_remove': '删除',
+        'dns_override_invalid': '主机 {host} 的地址无效: {error}',
+        'dns_flush': '清空DNS缓存',
+        'dns_cache_stats': '已缓存 {entries} 个域名，{negative} 个不存在的域名',
+        'request_connect_timeout': '连接超时 (秒，0为不限制):',
+        'request_read_timeout': '读取超时 (秒，0为不限制):',
+        'request_total_timeout': '请求总超时 (秒，0为不限制):',
+        'response_streaming': '流式下载响应体（边接收边显示）',
+        'http2_enabled': '默认使用HTTP/2（请求可单独选择HTTP版本）',
+        'http2_tooltip': 'HTTP/2 请求通过httpx发送（需要安装 httpx[http2]），同一源站的并发请求在一个连接上多路复用；服务器不支持时自动使用HTTP/1.1，响应状态中显示实际协议',
+        'http_version_tooltip': '请求使用的HTTP版本；Auto 按设置中的“默认使用HTTP/2”',
+        'stream_spill_threshold_mb': '响应体超过该大小时写入临时文件 (MB):',
+        'stream_preview_kb': '流式下载预览大小 (KB):',
+        'large_body_viewer_threshold_kb': '响应体超过该大小时使用大文本查看器 (KB):',
+        'large_content': '大文件',
+        'json_auto_format_max_kb': '自动格式化JSON响应的最大大小 (KB):',
+        'highlight_max_size_kb': '语法高亮的最大文本大小 (KB, 0为不限制):',
+        # 请求历史
+        'history': '历史记录',
+        'history_enabled': '记录发送的请求和响应',
+        'history_max_entries': '最多保留的记录数 (0为不限制):',
+        'history_max_days': '保留天数 (0为不限制):',
+        'history_max_mb': '历史数据库大小上限 (MB, 0为不限制):',
+        'history_max_body_kb': '保存的响应体最大大小 (KB):',
+        'history_filter_placeholder': '过滤: 关键字 status:404 status:5xx host:主机 path:/api method:POST',
+        'history_clear': '清空',
+        'history_clear_confirm': '确定要删除所有历史记录吗？',
+        'history_open': '打开请求',
+        'history_delete': '删除',
+        # 请求各阶段耗时
+        'timing_dns': 'DNS解析',
+        'timing_connect': 'TCP连接',
+        'timing_tls': 'TLS握手',
+        'timing_send': '发送请求',
+        'timing_ttfb': '等待响应头 (TTFB)',
+        'timing_download': '下载响应体',
+        'timing_total': '总耗时',
+        'timing_reused': '复用了已有连接，没有DNS解析、TCP连接和TLS握手',
+        'timing_unavailable': '没有分阶段耗时',
+        # 请求队列相关
+        'request_queue': '请求队列',
+        'queue_state': '状态',
+        'queue_request': '请求',
+        'queue_tab': '标签页',
+        'queue_elapsed': '耗时',
+        'queue_running': '运行中',
+        'queue_queued': '排队中',
+        'queue_cancel_selected': '取消选中',
+        'queue_cancel_all': '全部取消',
+        'queue_summary': '运行中: {running}   排队中: {queued}',
+        # 集合运行器
+        'context_run_collection': '运行集合',
+        'runner_title': '运行集合 - {name}',
+        'runner_concurrency': '并发数:',
+        'runner_concurrency_tooltip': '同时运行的请求数，1 为按顺序运行',
+        'runner_timeout': '超时:',
+        'runner_timeout_tooltip': '单个请求的超时时间，0 为不限制',
+        'runner_start': '运行',
+        'runner_stop': '停止',
+        'runner_method': '方法',
+        'runner_status': '状态',
+        'runner_time': '耗时',
+        'runner_size': '大小',
+        'runner_error': '错误',
+        'runner_pending': '等待中',
+        'runner_running': '运行中',
+        'runner_failed': '失败',
+        'runner_skipped': '未运行',
+        'runner_summary': '已完成 {done}/{total}   通过: {passed}   失败: {failed}',
+        'runner_elapsed': '总耗时: {elapsed:.1f}s',
+        'msg_collection_no_requests': '集合 "{name}" 中没有已保存的请求。',
+        # 压测
+        'context_load_test': '压测...',
+        'load_test_title': '压测',
+        'load_test_total': '请求数:',
+        'load_test_mode_concurrency': '固定并发',
+        'load_test_mode_rps': '目标速率',
+        'load_test_rps': '每秒请求数:',
+        'load_test_rps_tooltip': '按该速率匀速发出请求（同时受并发数限制）',
+        'load_test_stat_done': '已完成:',
+        'load_test_stat_errors': '错误:',
+        'load_test_stat_rps': '吞吐量(次/秒):',
+        'load_test_stat_elapsed': '耗时:',
+        'load_test_stat_min': '最小:',
+        'load_test_stat_mean': '平均:',
+        'load_test_stat_p50': 'P50:',
+        'load_test_stat_p90': 'P90:',
+        'load_test_stat_p99': 'P99:',
+        'load_test_stat_max': '最大:',
+        'load_test_count': '次数',
+        'load_test_histogram': '延迟分布',
+        'load_test_throughput': '每秒吞吐量',
+        'load_test_no_url': '请求URL为空。',
+        'load_test_tab_closed': '请求所在的标签页已关闭。',
+        'load_test_large_upload': '上传文件共 {size:.1f} MB，压测期间会一直保存在内存中。是否继续？',
     },
     'en': {
         'app_title': 'PostSuperman',
@@ -222,6 +342,9 @@ _texts = {
         'save_response_failed': 'Save response failed',
         'select_file': 'Select File',
         'select_log_file': 'Select Log File',
+        'collections_save_delay_ms': 'Collection save delay (ms)',
+        'collections_compact_json': 'Save collections file in compact format (no indent)',
+        'collections_sharded': 'Store each collection in its own file (restart required)',
         'select_json_file': 'Select JSON File',
         'select_log_file_filter': 'Log Files (*.log);;All Files (*)',
         'select_all_files': 'All Files (*)',
@@ -271,6 +394,7 @@ _texts = {
         'msg_tab_unsaved_close': 'Tab "{name}" has unsaved changes.\nDo you want to close it anyway?',
         'msg_tabs_unsaved_close': 'The following tabs have unsaved changes:\n{tab_list}\n\nDo you want to close them anyway?',
         'msg_tabs_unsaved_close_all': 'The following tabs have unsaved changes:\n{tab_list}\n\nDo you want to close them all anyway?',
+        'search_collections_placeholder': 'Search requests (name, URL, headers, body)',
         # 查找/替换相关
         'find_replace': 'Find/Replace',
         'find_replace_tooltip': 'Find/Replace (Regex supported)',
@@ -287,6 +411,122 @@ _texts = {
         'not_found': 'Not found',
         'replaced': 'Replaced',
         'replace_all_done': 'All replaced, {count} occurrence(s)',
+        # Network settings
+        'network': 'Network',
+        'http_pool_size': 'Connection pool size per host:',
+        'http_pool_max_per_host': 'Max concurrent requests per host (0 = unlimited):',
+        'http_pool_idle_timeout': 'Idle connection timeout (seconds):',
+        'max_concurrent_requests': 'Max concurrent requests:',
+        'max_concurrent_per_host': 'Max concurrent requests per host (0 = unlimited):',
+        'request_transport': 'Request transport:',
+        'request_transport_thread': 'Threads (one thread per request)',
+        'request_transport_async': 'Async (shared event loop, requires httpx)',
+        'request_transport_process': 'Processes (pre-started pool, hard stop)',
+        'process_pool_size': 'Pre-started processes for the process transport:',
+        'dns': 'DNS',
+        'dns_cache_enabled': 'Cache DNS lookups',
+        'dns_cache_ttl': 'Cache lookups for (seconds, capped at the record TTL when dnspython is installed):',
+        'dns_negative_ttl': 'Cache unknown hosts for (seconds, 0 = never):',
+        'dns_overrides': 'Host overrides (like a hosts file, separate multiple addresses with commas):',
+        'dns_override_host': 'Host',
+        'dns_override_addresses': 'IP addresses',
+        'dns_override_add': 'Add',
+        'dns_override_remove': 'Remove',
+        'dns_override_invalid': 'Invalid address for host {host}: {error}',
+        'dns_flush': 'Flush DNS Cache',
+        'dns_cache_stats': '{entries} hosts cached, {negative} unknown hosts cached',
+        'request_connect_timeout': 'Connect timeout (s, 0 = unlimited):',
+        'request_read_timeout': 'Read timeout (s, 0 = unlimited):',
+        'request_total_timeout': 'Total request timeout (s, 0 = unlimited):',
+        'request_transport_tooltip': 'The async transport handles all requests on one event loop thread, suited to high concurrency in collection runs and load tests; falls back to threads when httpx is not installed. The process transport sends each request in a separate process that Stop terminates immediately; it does not stream responses',
+        'response_streaming': 'Stream response bodies (render while downloading)',
+        'http2_enabled': 'Use HTTP/2 by default (requests can pick their own HTTP version)',
+        'http2_tooltip': 'HTTP/2 requests are sent with httpx (requires httpx[http2]); concurrent requests to the same origin share one multiplexed connection. Falls back to HTTP/1.1 when the server does not support it; the response status shows the negotiated protocol',
+        'http_version_tooltip': 'HTTP version for this request; Auto follows "Use HTTP/2 by default" in Settings',
+        'stream_spill_threshold_mb': 'Spill response bodies larger than this to disk (MB):',
+        'stream_preview_kb': 'Streaming preview size (KB):',
+        'large_body_viewer_threshold_kb': 'Use the large text viewer above this size (KB):',
+        'large_content': 'Large Content',
+        'json_auto_format_max_kb': 'Auto-format JSON responses up to (KB):',
+        'highlight_max_size_kb': 'Max text size for syntax highlighting (KB, 0 = unlimited):',
+        # Request history
+        'history': 'History',
+        'history_enabled': 'Record sent requests and responses',
+        'history_max_entries': 'Max entries to keep (0 = unlimited):',
+        'history_max_days': 'Days to keep (0 = unlimited):',
+        'history_max_mb': 'History database size limit (MB, 0 = unlimited):',
+        'history_max_body_kb': 'Max stored response body size (KB):',
+        'history_filter_placeholder': 'Filter: text status:404 status:5xx host:name path:/api method:POST',
+        'history_clear': 'Clear',
+        'history_clear_confirm': 'Delete all history entries?',
+        'history_open': 'Open Request',
+        'history_delete': 'Delete',
+        # Request phase timing
+        'timing_dns': 'DNS lookup',
+        'timing_connect': 'TCP connect',
+        'timing_tls': 'TLS handshake',
+        'timing_send': 'Request sent',
+        'timing_ttfb': 'Waiting (TTFB)',
+        'timing_download': 'Content download',
+        'timing_total': 'Total',
+        'timing_reused': 'Reused an existing connection: no DNS lookup, TCP connect or TLS handshake',
+        'timing_unavailable': 'No phase timing available',
+        # Request queue
+        'request_queue': 'Request Queue',
+        'queue_state': 'State',
+        'queue_request': 'Request',
+        'queue_tab': 'Tab',
+        'queue_elapsed': 'Elapsed',
+        'queue_running': 'Running',
+        'queue_queued': 'Queued',
+        'queue_cancel_selected': 'Cancel Selected',
+        'queue_cancel_all': 'Cancel All',
+        'queue_summary': 'Running: {running}   Queued: {queued}',
+        # Collection runner
+        'context_run_collection': 'Run Collection',
+        'runner_title': 'Run Collection - {name}',
+        'runner_concurrency': 'Concurrency:',
+        'runner_concurrency_tooltip': 'Number of requests run at the same time; 1 runs them in order',
+        'runner_timeout': 'Timeout:',
+        'runner_timeout_tooltip': 'Timeout of each request; 0 means no limit',
+        'runner_start': 'Run',
+        'runner_stop': 'Stop',
+        'runner_method': 'Method',
+        'runner_status': 'Status',
+        'runner_time': 'Time',
+        'runner_size': 'Size',
+        'runner_error': 'Error',
+        'runner_pending': 'Pending',
+        'runner_running': 'Running',
+        'runner_failed': 'Failed',
+        'runner_skipped': 'Not run',
+        'runner_summary': 'Completed {done}/{total}   Passed: {passed}   Failed: {failed}',
+        'runner_elapsed': 'Total: {elapsed:.1f}s',
+        'msg_collection_no_requests': 'Collection "{name}" has no saved requests.',
+        # Load test
+        'context_load_test': 'Load Test...',
+        'load_test_title': 'Load Test',
+        'load_test_total': 'Requests:',
+        'load_test_mode_concurrency': 'Fixed concurrency',
+        'load_test_mode_rps': 'Target rate',
+        'load_test_rps': 'Requests/s:',
+        'load_test_rps_tooltip': 'Send requests evenly at this rate (also limited by concurrency)',
+        'load_test_stat_done': 'Completed:',
+        'load_test_stat_errors': 'Errors:',
+        'load_test_stat_rps': 'Throughput (req/s):',
+        'load_test_stat_elapsed': 'Elapsed:',
+        'load_test_stat_min': 'Min:',
+        'load_test_stat_mean': 'Mean:',
+        'load_test_stat_p50': 'P50:',
+        'load_test_stat_p90': 'P90:',
+        'load_test_stat_p99': 'P99:',
+        'load_test_stat_max': 'Max:',
+        'load_test_count': 'Count',
+        'load_test_histogram': 'Latency histogram',
+        'load_test_throughput': 'Throughput per second',
+        'load_test_no_url': 'The request URL is empty.',
+        'load_test_tab_closed': 'The tab of this request has been closed.',
+        'load_test_large_upload': 'The upload files total {size:.1f} MB and stay in memory for the whole load test. Continue?',
     }
 }
 
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import re
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+
+try:
+    import orjson  # 可选的快速JSON后端
+except ImportError:
+    orjson = None
+
+
+# 19位以上的整数可能超出64位，orjson 会把它解析为浮点数（丢失精度），交给标准库处理
+_LONG_INT = re.compile(r'(?<![\d.])\d{19,}')
+_LONG_INT_BYTES = re.compile(rb'(?<![\d.])\d{19,}')
+
+
+def json_backend_name():
+    return 'orjson' if orjson is not None else 'json'
+
+
+def format_json(data, indent=2):
+    """解析并美化JSON，失败时抛出 ValueError
+
+    用解析成功的后端输出：orjson 只支持2空格缩进，不接受 NaN/Infinity，超出64位的整数
+    会变成浮点数，这些内容由标准库解析和输出，保持服务器返回的原值。
+    """
+    long_int = _LONG_INT_BYTES if isinstance(data, (bytes, bytearray)) else _LONG_INT
+    if orjson is not None and indent == 2 and not long_int.search(data):
+        try:
+            obj = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(json.loads(data), ensure_ascii=False, indent=indent)
+
+
+class JsonFormatWorker(QObject):
+    """在后台线程中美化JSON
+
+    每次 format() 生成一个新的序号，旧的任务即被取消：
+    尚未完成的旧任务结果会被丢弃，只有最新一次的结果会通过信号发出。
+    """
+    finished = pyqtSignal(int, str)  # 序号, 美化后的文本
+    error = pyqtSignal(int, str)     # 序号, 错误信息
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def format(self, data, indent=2):
+        """开始美化 data（str 或 bytes），返回本次任务的序号"""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        thread = threading.Thread(target=self._run, args=(generation, data, indent))
+        thread.daemon = True
+        thread.start()
+        return generation
+
+    def cancel(self):
+        """取消进行中的任务（其结果将被丢弃）"""
+        with self._lock:
+            self._generation += 1
+
+    def is_current(self, generation):
+        with self._lock:
+            return generation == self._generation
+
+    def _run(self, generation, data, indent):
+        try:
+            if not self.is_current(generation):
+                return
+            text = format_json(data, indent)
+            if self.is_current(generation):
+                self.finished.emit(generation, text)
+        except Exception as e:
+            if self.is_current(generation):
+                self.error.emit(generation, str(e))
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import math
+import os
+import threading
+import time
+from PyQt5.QtCore import QObject, pyqtSignal
+from ui.utils.request_builder import to_request_kwargs, close_file_handles
+from ui.utils.session_pool import create_session
+from ui.utils.async_transport import async_transport_available, get_async_transport, http2_available
+
+
+# 上传文件超过该大小时压测对话框先确认（文件内容在压测期间一直保存在内存中）
+LARGE_UPLOAD_BYTES = 64 * 1024 * 1024
+
+
+class LatencyHistogram:
+    """HDR风格的延迟直方图（单位：微秒）
+
+    每个2的幂区间再线性分为 2**SUB_BUCKET_BITS 个子桶，相对误差不超过 1/2**(SUB_BUCKET_BITS-1)
+    （9位约0.4%），内存与记录次数无关；只保存出现过的桶。百分位返回桶的上界，可能偏大不超过该误差。
+    """
+
+    SUB_BUCKET_BITS = 9
+
+    def __init__(self):
+        self._counts = {}  # (区间, 子桶) -> 次数
+        self.count = 0
+        self.min = None
+        self.max = 0
+        self.total = 0
+
+    def record(self, value_us):
+        value = max(0, int(value_us))
+        shift = max(0, value.bit_length() - self.SUB_BUCKET_BITS)
+        key = (shift, value >> shift)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    @staticmethod
+    def _highest_equivalent(key):
+        shift, sub = key
+        return ((sub + 1) << shift) - 1
+
+    def percentile(self, p):
+        """第 p 百分位（0-100）的值；返回所在桶的上界，不超过最大值"""
+        if not self.count:
+            return 0
+        target = max(1, int(math.ceil(p / 100.0 * self.count)))
+        seen = 0
+        for key in sorted(self._counts, key=self._highest_equivalent):
+            seen += self._counts[key]
+            if seen >= target:
+                return min(self._highest_equivalent(key), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def log_buckets(self):
+        """按2的幂合并的桶：[(上界微秒, 次数)]，用于显示"""
+        merged = {}
+        for key, n in self._counts.items():
+            upper = 1 << self._highest_equivalent(key).bit_length()
+            merged[upper] = merged.get(upper, 0) + n
+        return sorted(merged.items())
+
+
+class LoadTester(QObject):
+    """对单个请求进行压测
+
+    concurrency 个工作线程共享一个专用会话（连接池大小等于并发数，不受全局会话池
+    单主机并发上限的限制），共发送 total 次请求；rps 不为空时按目标速率匀速发出。
+    结果在工作线程中汇总到直方图，界面通过 snapshot() 定时读取。
+    transport 为 'async' 且已安装 httpx 时改为在共享事件循环中运行 concurrency 个协程，
+    高并发时不再需要同样多的线程。http2 为 True 时同样在事件循环中运行，所有请求共用HTTP/2连接。
+    """
+    finished = pyqtSignal()
+
+    def __init__(self, prepared, total, concurrency=1, rps=None, timeout=None, transport='thread', http2=False,
+                 parent=None):
+        super().__init__(parent)
+        self.http2 = http2 and http2_available()
+        self.use_async = (transport == 'async' and async_transport_available()) or self.http2
+        self.total = max(1, int(total))
+        self.concurrency = max(1, min(int(concurrency), self.total))
+        self.rps = float(rps) if rps else None
+        self.request_kwargs = to_request_kwargs(_files_to_bytes(prepared), timeout or None)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._future = None
+        self._next = 0
+        self._exited = 0
+        self._session = None
+        self.histogram = LatencyHistogram()
+        self.status_counts = {}  # 状态码或错误类型 -> 次数
+        self.errors = 0
+        self.last_error = ''
+        self.throughput = []  # 每秒完成的请求数
+        self.start_time = None
+        self.end_time = None
+
+    def start(self):
+        self.start_time = time.monotonic()
+        if self.use_async:
+            self._future = get_async_transport().submit(self._run_async())
+            return
+        self._session = create_session(self.concurrency)
+        self._threads = [threading.Thread(target=self._run) for _ in range(self.concurrency)]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def stop(self):
+        """停止压测：不再发出新请求，进行中的请求完成后结束"""
+        self._stop_event.set()
+
+    def is_running(self):
+        if self._future is not None:
+            return self.end_time is None
+        return any(t.is_alive() for t in self._threads)
+
+    def snapshot(self):
+        """当前结果的副本，可在界面线程中调用"""
+        with self._lock:
+            h = self.histogram
+            now = self.end_time or time.monotonic()
+            elapsed = now - self.start_time if self.start_time is not None else 0.0
+            return {
+                'done': h.count,
+                'total': self.total,
+                'errors': self.errors,
+                'last_error': self.last_error,
+                'elapsed': elapsed,
+                'rps': h.count / elapsed if elapsed > 0 else 0.0,
+                'min': h.min or 0,
+                'mean': h.mean(),
+                'p50': h.percentile(50),
+                'p90': h.percentile(90),
+                'p99': h.percentile(99),
+                'max': h.max,
+                'status_counts': dict(self.status_counts),
+                'throughput': list(self.throughput),
+                'buckets': h.log_buckets(),
+                'running': self.end_time is None,
+            }
+
+    def _take_index(self):
+        with self._lock:
+            if self._next >= self.total:
+                return None
+            index = self._next
+            self._next += 1
+            return index
+
+    def _run(self):
+        try:
+            while not self._stop_event.is_set():
+                index = self._take_index()
+                if index is None:
+                    return
+                if self.rps:
+                    # 第 index 个请求的计划发出时间；落后于计划时立即发出
+                    delay = self.start_time + index / self.rps - time.monotonic()
+                    if delay > 0 and self._stop_event.wait(delay):
+                        return
+                self._execute()
+        finally:
+            with self._lock:
+                self._exited += 1
+                last = self._exited == len(self._threads)
+                if last:
+                    self.end_time = time.monotonic()
+            if last:
+                self._session.close()
+                self.finished.emit()
+
+    def _execute(self):
+        start = time.monotonic()
+        try:
+            response = self._session.request(**self.request_kwargs)
+            _ = response.content  # 计入响应体的下载时间
+            response.close()
+            key = str(response.status_code)
+            error = None
+        except Exception as e:
+            key = type(e).__name__
+            error = str(e)
+        self._record(start, time.monotonic(), key, error)
+
+    async def _run_async(self):
+        transport = get_async_transport()
+        try:
+            await asyncio.gather(*[self._worker_async(transport) for _ in range(self.concurrency)])
+        finally:
+            with self._lock:
+                self.end_time = time.monotonic()
+            self.finished.emit()
+
+    async def _worker_async(self, transport):
+        while not self._stop_event.is_set():
+            index = self._take_index()
+            if index is None:
+                return
+            if self.rps:
+                delay = self.start_time + index / self.rps - time.monotonic()
+                while delay > 0:
+                    # 分段等待，以便及时响应停止
+                    await asyncio.sleep(min(delay, 0.1))
+                    if self._stop_event.is_set():
+                        return
+                    delay = self.start_time + index / self.rps - time.monotonic()
+            start = time.monotonic()
+            try:
+                response = await transport.send(self.request_kwargs, http2=self.http2)  # 已读取完整响应体
+                key = str(response.status_code)
+                error = None
+            except Exception as e:
+                key = type(e).__name__
+                error = str(e) or key
+            self._record(start, time.monotonic(), key, error)
+
+    def _record(self, start, end, key, error):
+        with self._lock:
+            self.histogram.record((end - start) * 1e6)
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+            if error is not None:
+                self.errors += 1
+                self.last_error = error
+            second = int(end - self.start_time)
+            while len(self.throughput) <= second:
+                self.throughput.append(0)
+            self.throughput[second] += 1
+
+
+def upload_size(prepared):
+    """构建的请求中上传文件的总字节数"""
+    total = 0
+    for f in (prepared.get('files') or {}).values():
+        try:
+            total += os.fstat(f.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            pass
+    return total
+
+
+def _files_to_bytes(prepared):
+    """上传文件读入内存（每次请求都要重新发送文件内容），并关闭文件句柄"""
+    prepared = dict(prepared)
+    if prepared.get('files'):
+        files = {}
+        for key, f in prepared['files'].items():
+            f.seek(0)
+            files[key] = (os.path.basename(getattr(f, 'name', key)), f.read())
+        prepared['files'] = files
+    close_file_handles(prepared.get('file_handles'))
+    prepared['file_handles'] = []
+    return prepared
@@ -1,197 +1,373 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import codecs
+import collections
 import multiprocessing as mp
-import requests
-import json
-import time
 import os
-import sys
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer
+import threading
+from multiprocessing.connection import wait as wait_connections
+from ui.utils.request_worker import RequestWorker
+from ui.utils.dns_cache import dns_cache_config
+from ui.utils.response_store import ResponseBody
+from ui.utils.settings_manager import load_settings
 
 
-def run_request_process(method, url, params, headers, data, json_data, files, result_queue, error_queue, stop_event):
-    """在子进程中执行请求的独立函数"""
+DEFAULT_PROCESS_POOL_SIZE = 2
+
+
+def run_pool_process(conn):
+    """常驻请求进程的主循环：逐个执行父进程通过管道发来的请求，结果写回管道
+
+    进程内复用同一个会话，连续请求同一主机时复用keep-alive连接。
+    每个任务附带父进程的解析缓存设置，变化时（包括手动清空缓存）同步到本进程。
+    收到 None 或管道关闭时退出。
+    """
+    from ui.utils.session_pool import create_session
+    from ui.utils.dns_cache import get_dns_cache
+    from ui.utils.request_timing import RequestTiming, bind_request_timing
+    from ui.utils.request_worker import http_version_of
+    session = create_session(1)
+    dns_generation = None
     try:
-        # 构建请求参数
-        request_kwargs = {
-            'url': url,
-            'method': method,
-            'timeout': 30  # 可以设置更长的超时，因为可以强制kill
-        }
-        
-        # 添加参数
-        if params:
-            request_kwargs['params'] = {p['key']: p['value'] for p in params if p.get('key')}
-            
-        # 添加头部
-        if headers:
-            request_kwargs['headers'] = {h['key']: h['value'] for h in headers if h.get('key')}
-            
-        # 添加数据
-        if data:
-            request_kwargs['data'] = data
-        elif json_data:
-            request_kwargs['json'] = json_data
-        elif files:
-            request_kwargs['files'] = files
-        
-        # 检查停止标志
-        if stop_event.is_set():
-            return
-            
-        # 发送请求
-        response = requests.request(**request_kwargs)
-        
-        # 请求完成后再次检查停止标志
-        if stop_event.is_set():
-            return
-            
-        # 构建响应数据
-        result = {
-            'status_code': response.status_code,
-            'status_text': f"{response.status_code} {response.reason}",
-            'headers': dict(response.headers),
-            'body': response.text,
-            'url': response.url,
-            'elapsed': response.elapsed.total_seconds()
-        }
-        
-        result_queue.put(result)
-        
-    except requests.exceptions.RequestException as e:
-        if not stop_event.is_set():
-            error_queue.put(str(e))
-    except Exception as e:
-        if not stop_event.is_set():
-            error_queue.put(f"Unexpected error: {str(e)}")
-
-
-class MultiprocessRequestWorker(QObject):
-    """多进程请求工作器"""
-    finished = pyqtSignal(dict)
-    error = pyqtSignal(str)
-    stopped = pyqtSignal()
-    
-    def __init__(self, method, url, params, headers, data, json_data, files):
-        super().__init__()
-        self.method = method
-        self.url = url
-        self.params = params
-        self.headers = headers
-        self.data = data
-        self.json_data = json_data
-        self.files = files
-        self._process = None
-        self._stop_flag = False
-        self._timer = None
-        
-    def stop(self):
-        """停止请求 - 强制kill子进程"""
-        self._stop_flag = True
-        if self._process and self._process.is_alive():
+        while True:
+            try:
+                job = conn.recv()
+            except (EOFError, OSError):
+                break
+            if job is None:
+                break
+            job_id, request_kwargs, dns_config = job
+            if dns_config['generation'] != dns_generation:
+                dns_generation = dns_config.pop('generation')
+                get_dns_cache().configure(**dns_config)
+                get_dns_cache().flush()
+                session.close()  # 已建立的连接可能连向旧地址
             try:
-                self._process.terminate()  # 先尝试优雅终止
-                self._process.join(timeout=0.5)  # 最多等0.5秒
-                if self._process.is_alive():
-                    self._process.kill()  # 强制kill
-                    self._process.join(timeout=0.1)
+                timing = RequestTiming()
+                with bind_request_timing(timing):
+                    response = session.request(**request_kwargs)
+                timing.finish()
+                encoding = response.encoding or 'utf-8'
+                try:
+                    codecs.lookup(encoding)
+                except LookupError:
+                    encoding = 'utf-8'
+                result = {
+                    'status_code': response.status_code,
+                    'status_text': f"{response.status_code} {response.reason}",
+                    'http_version': http_version_of(response),
+                    'headers': dict(response.headers),
+                    'content': response.content,
+                    'encoding': encoding,
+                    'url': response.url,
+                    'elapsed': timing.total(),
+                    'timing': timing.to_dict()
+                }
+                conn.send((job_id, 'finished', result))
             except Exception as e:
-                print(f"停止进程时出错: {e}")
-            finally:
-                self._process = None
-        if self._timer:
-            self._timer.stop()
-            self._timer = None
-        # 重置状态
-        self._stop_flag = False
-        
-    def start_request(self):
-        """启动请求进程"""
+                conn.send((job_id, 'error', f"Unexpected error: {str(e)}"))
+    finally:
+        session.close()
+
+
+class _PoolProcess:
+    """池中的一个请求进程及其结果管道"""
+
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=run_pool_process, args=(child_conn,))
+        self.process.daemon = True
+        self.process.start()
+        child_conn.close()
+        self.job = None  # 正在执行的任务
+
+
+class _PoolJob:
+    def __init__(self, job_id, request_kwargs, callback):
+        self.id = job_id
+        self.request_kwargs = request_kwargs
+        self.callback = callback  # callback(kind, payload)，kind 为 'finished' 或 'error'
+        self.process = None
+        self.cancelled = False
+
+
+class RequestProcessPool:
+    """预启动、可复用的请求进程池
+
+    每个进程一次执行一个请求；进程都忙时任务排队。一个分发线程阻塞等待所有进程的
+    结果管道（multiprocessing.connection.wait，Windows下同样可用），结果到达时
+    立即回调，不需要定时轮询。取消正在执行的任务时直接杀掉该进程并启动一个新的
+    进程补位，其他进程不受影响。
+    """
+
+    def __init__(self, size=DEFAULT_PROCESS_POOL_SIZE):
+        self._ctx = mp.get_context()
+        self._lock = threading.Lock()
+        self._processes = []
+        self._idle = []
+        self._queue = collections.deque()
+        self._next_id = 0
+        self._closed = False
+        self._watched = []  # 管道尚未关闭的进程（包括已退役、等待退出的进程）
+        # 新进程加入时唤醒分发线程，使其等待新的管道
+        self._wakeup_reader, self._wakeup_writer = self._ctx.Pipe(duplex=False)
+        self.size = max(1, int(size))
+        with self._lock:
+            for _ in range(self.size):
+                self._idle.append(self._spawn_locked())
+        self._reader = threading.Thread(target=self._read_results, name='process-pool-reader')
+        self._reader.daemon = True
+        self._reader.start()
+
+    def submit(self, request_kwargs, callback):
+        """提交请求；request_kwargs 必须可以序列化（上传文件需先读为 bytes）"""
+        with self._lock:
+            job = _PoolJob(self._next_id, request_kwargs, callback)
+            self._next_id += 1
+            if self._idle:
+                self._dispatch_locked(self._idle.pop(), job)
+            else:
+                self._queue.append(job)
+            return job
+
+    def cancel(self, job):
+        """取消任务；排队中的直接移除，执行中的杀掉所在进程。任务已完成时返回 False"""
+        with self._lock:
+            if job in self._queue:
+                self._queue.remove(job)
+                job.cancelled = True
+                return True
+            proc = job.process
+            if proc is None or proc.job is not job:
+                return False
+            job.cancelled = True
+            # 先移出池并立即补位：杀掉之前结果可能刚好到达，_release_locked 不会再把
+            # 排队的任务分给这个进程
+            self._processes.remove(proc)
+            if not self._closed:
+                self._release_locked(self._spawn_locked())
+            print(f"RequestProcessPool: 终止请求进程 {proc.process.pid}")
+            try:
+                proc.process.kill()
+            except Exception as e:
+                print(f"RequestProcessPool: 终止进程出错 {e}")
+        # 读取线程收到管道关闭后回收该进程
+        return True
+
+    def configure(self, size):
+        """调整进程数；多出的进程在空闲后退出"""
+        with self._lock:
+            self.size = max(1, int(size))
+            while len(self._processes) < self.size:
+                proc = self._spawn_locked()
+                if self._queue:
+                    self._dispatch_locked(proc, self._queue.popleft())
+                else:
+                    self._idle.append(proc)
+            while len(self._processes) > self.size and self._idle:
+                self._retire_locked(self._idle.pop())
+
+    def shutdown(self):
+        """关闭所有进程（应用退出时调用）"""
+        with self._lock:
+            self._closed = True
+            self._queue.clear()
+            processes = list(self._processes)
+        self._wake_reader()
+        for proc in processes:
+            try:
+                proc.process.kill()
+            except Exception as e:
+                print(f"RequestProcessPool: 关闭进程出错 {e}")
+
+    def stats(self):
+        with self._lock:
+            return {'processes': len(self._processes), 'idle': len(self._idle), 'queued': len(self._queue)}
+
+    def _spawn_locked(self):
+        proc = _PoolProcess(self._ctx)
+        self._processes.append(proc)
+        self._watched.append(proc)
+        self._wake_reader()
+        return proc
+
+    def _wake_reader(self):
         try:
-            # 创建进程间通信对象
-            result_queue = mp.Queue()
-            error_queue = mp.Queue()
-            stop_event = mp.Event()
-            
-            # 创建子进程
-            self._process = mp.Process(
-                target=run_request_process,
-                args=(self.method, self.url, self.params, self.headers, 
-                      self.data, self.json_data, self.files, 
-                      result_queue, error_queue, stop_event)
-            )
-            
-            # 启动进程
-            self._process.start()
-            
-            # 创建定时器轮询结果
-            self._timer = QTimer()
-            self._timer.timeout.connect(self._create_check_callback(result_queue, error_queue, stop_event))
-            self._timer.start(50)  # 每50ms检查一次
-            
+            self._wakeup_writer.send_bytes(b'1')
         except Exception as e:
-            self.error.emit(f"启动请求进程失败: {str(e)}")
-            
-    def _create_check_callback(self, result_queue, error_queue, stop_event):
-        """创建检查回调函数"""
-        def check_callback():
-            self._check_result(result_queue, error_queue, stop_event)
-        return check_callback
-            
-    def _check_result(self, result_queue, error_queue, stop_event):
-        """检查进程结果"""
-        # 检查停止标志
-        if self._stop_flag:
-            stop_event.set()
-            self.stop()
-            self.stopped.emit()
+            print(f"RequestProcessPool: 唤醒分发线程出错 {e}")
+
+    def _retire_locked(self, proc):
+        self._processes.remove(proc)
+        try:
+            proc.conn.send(None)
+        except Exception:
+            proc.process.kill()
+
+    def _dispatch_locked(self, proc, job):
+        proc.job = job
+        job.process = proc
+        try:
+            proc.conn.send((job.id, job.request_kwargs, dns_cache_config()))
+        except Exception as e:
+            # 进程已退出：由读取线程回收并报告错误
+            print(f"RequestProcessPool: 发送请求到进程出错 {e}")
+        job.request_kwargs = None  # 已发送，不再保留请求体
+
+    def _release_locked(self, proc):
+        """进程空闲：执行排队的任务，或放回空闲列表"""
+        if proc not in self._processes:
             return
-        
-        # 检查进程是否还活着
-        if self._process and not self._process.is_alive():
-            # 进程已结束，检查是否有结果
-            try:
-                if not result_queue.empty():
-                    result = result_queue.get_nowait()
-                    self.finished.emit(result)
-                    self.stop()
-                    return
-            except:
-                pass
-                
-            try:
-                if not error_queue.empty():
-                    error_msg = error_queue.get_nowait()
-                    self.error.emit(error_msg)
-                    self.stop()
+        if len(self._processes) > self.size:
+            self._retire_locked(proc)
+        elif self._queue:
+            self._dispatch_locked(proc, self._queue.popleft())
+        else:
+            self._idle.append(proc)
+
+    def _read_results(self):
+        """分发线程：阻塞等待任一进程的结果或管道关闭，到达后立即处理"""
+        while True:
+            with self._lock:
+                if self._closed and not self._watched:
                     return
-            except:
-                pass
-            
-            # 如果没有结果且进程已结束，可能是被停止的
-            if self._stop_flag:
-                self.stopped.emit()
-            else:
-                self.error.emit("请求进程意外结束")
-            self.stop()
-            return
-        
-        # 检查是否有结果
-        try:
-            if not result_queue.empty():
-                result = result_queue.get_nowait()
-                self.finished.emit(result)
-                self.stop()
-                return
-        except:
-            pass
-        
+                by_conn = {proc.conn: proc for proc in self._watched}
+            for conn in wait_connections(list(by_conn) + [self._wakeup_reader]):
+                if conn is self._wakeup_reader:
+                    self._wakeup_reader.recv_bytes()
+                    continue
+                proc = by_conn[conn]
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    self._on_process_exit(proc)
+                    continue
+                self._on_result(proc, *message)
+
+    def _on_result(self, proc, job_id, kind, payload):
+        with self._lock:
+            job = proc.job
+            proc.job = None
+            self._release_locked(proc)
+        if job is not None and job.id == job_id and not job.cancelled:
+            job.callback(kind, payload)
+
+    def _on_process_exit(self, proc):
+        """管道关闭：进程被取消杀掉、退役或意外崩溃；回收，意外崩溃时补位"""
+        proc.process.join(timeout=1)
+        proc.conn.close()
+        with self._lock:
+            self._watched.remove(proc)
+            job = proc.job
+            proc.job = None
+            if proc in self._idle:
+                self._idle.remove(proc)
+            if proc in self._processes:
+                self._processes.remove(proc)
+                if not self._closed:
+                    self._release_locked(self._spawn_locked())
+        if job is not None and not job.cancelled:
+            job.callback('error', '请求进程意外结束')
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool():
+    """获取全局请求进程池（首次调用时按设置预启动进程）"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = RequestProcessPool(load_settings().get('process_pool_size', DEFAULT_PROCESS_POOL_SIZE))
+        return _pool
+
+
+def apply_process_pool_settings(settings):
+    """设置保存后更新已启动的进程池；选择多进程传输时预启动"""
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        pool.configure(settings.get('process_pool_size', DEFAULT_PROCESS_POOL_SIZE))
+    elif settings.get('request_transport') == 'process':
+        get_process_pool()
+
+
+class MultiprocessRequestWorker(RequestWorker):
+    """请求工作对象 - 多进程版本
+
+    接口和信号与 RequestWorker 相同；请求在预启动的进程池中执行，
+    stop() 直接杀掉执行该请求的进程（由池补位），可中断任何阻塞的请求。
+    不支持流式下载，响应体完整返回后再按 spill_threshold 决定是否写入临时文件。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._job = None
+        self._done = False
+        self._done_lock = threading.Lock()
+        self._timer = None
+
+    def start(self):
+        """提交到进程池"""
         try:
-            if not error_queue.empty():
-                error_msg = error_queue.get_nowait()
-                self.error.emit(error_msg)
-                self.stop()
+            request_kwargs = self.build_request_kwargs()
+            if request_kwargs.get('files'):
+                # 文件对象不能跨进程传递，读为 (文件名, 内容)
+                request_kwargs['files'] = {
+                    key: (os.path.basename(getattr(f, 'name', key)), f.read()) if hasattr(f, 'read') else f
+                    for key, f in request_kwargs['files'].items()
+                }
+            print(f"MultiprocessRequestWorker: 提交请求 {self.method} {self.url}")
+            self._job = get_process_pool().submit(request_kwargs, self._on_result)
+            if self.total_timeout:
+                self._timer = threading.Timer(self.total_timeout, self._on_total_timeout)
+                self._timer.daemon = True
+                self._timer.start()
+        except Exception as e:
+            self._emit_once(self.error, f"启动请求进程失败: {str(e)}")
+
+    def start_request(self):
+        self.start()
+
+    def stop(self):
+        """停止请求 - 杀掉执行该请求的进程"""
+        self._stop_flag = True
+        self._cancel_timer()
+        if self._job is None or get_process_pool().cancel(self._job):
+            self._emit_once(self.stopped)
+
+    def _on_total_timeout(self):
+        print(f"MultiprocessRequestWorker: 超过总超时 {self.total_timeout}s，终止请求进程")
+        self._timed_out = True
+        if get_process_pool().cancel(self._job):
+            self._emit_once(self.error, self.timeout_message())
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def _on_result(self, kind, payload):
+        # 在进程池的分发线程中调用
+        self._cancel_timer()
+        if self._stop_flag:
+            self._emit_once(self.stopped)
+        elif kind == 'finished':
+            content = payload.pop('content')
+            encoding = payload.pop('encoding')
+            response_body = ResponseBody.from_bytes(content, self.spill_threshold, encoding)
+            payload['response_body'] = response_body
+            payload['size'] = response_body.size
+            payload['body'] = '' if response_body.is_file_backed() else content.decode(encoding, errors='replace')
+            self._emit_once(self.finished, payload)
+        else:
+            self._emit_once(self.error, payload)
+
+    def _emit_once(self, signal, *args):
+        """finished/error/stopped 每个请求只发出一次"""
+        with self._done_lock:
+            if self._done:
                 return
-        except:
-            pass 
\ No newline at end of file
+            self._done = True
+        signal.emit(*args)
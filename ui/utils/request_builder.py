@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+# 允许上传文件的方法，其他方法不传 files
+FILE_UPLOAD_METHODS = ('POST', 'PUT', 'PATCH')
+# 请求选择的HTTP版本；空字符串表示按全局设置
+HTTP_VERSION_DEFAULT = ''
+HTTP_VERSION_1 = 'HTTP/1.1'
+HTTP_VERSION_2 = 'HTTP/2'
+
+
+def use_http2(http_version, default=False):
+    """请求选择的HTTP版本 -> 是否使用HTTP/2；未选择时按全局设置 default"""
+    if http_version == HTTP_VERSION_2:
+        return True
+    if http_version == HTTP_VERSION_1:
+        return False
+    return bool(default)
+
+
+def build_request(method, url, params=None, headers=None, body_type='none', body=None, raw_type='JSON',
+                  http_version=HTTP_VERSION_DEFAULT):
+    """由请求的各部分构建 RequestWorker 所需的参数
+
+    params/headers 为 [{'key', 'value'}] 列表；body_type 为
+    'none' / 'form-data' / 'x-www-form-urlencoded' / 'raw'，form-data 的 body 为
+    [{'key', 'value', 'type'}] 列表（type 为 'File' 时 value 是文件路径）。
+    返回字典：method, url, params, headers, data, json_data, files, file_handles, http_version，
+    file_handles 为打开的上传文件，由调用方在请求结束后关闭。
+    打开上传文件失败时关闭已打开的文件并抛出 OSError。
+    """
+    method = (method or 'GET').upper()
+    url = (url or '').strip()
+    params = [{'key': p['key'].strip(), 'value': p.get('value', '').strip()}
+              for p in params or [] if p.get('key', '').strip()]
+    headers = [{'key': h['key'].strip(), 'value': h.get('value', '').strip()}
+               for h in headers or [] if h.get('key', '').strip()]
+    data = None
+    json_data = None
+    files = None
+    file_handles = []
+    if body_type == 'form-data':
+        fields = body if isinstance(body, list) else []
+        # form-data中有文件时自动加Content-Type
+        if any(f.get('type') == 'File' for f in fields if f.get('key', '').strip()):
+            if not any(h['key'].lower() == 'content-type' for h in headers):
+                headers.append({'key': 'Content-Type', 'value': 'multipart/form-data'})
+        data = {}
+        files = {}
+        for field in fields:
+            key = field.get('key', '').strip()
+            value = field.get('value', '').strip()
+            if not key:
+                continue
+            if field.get('type') == 'File' and value:
+                try:
+                    f = open(value, 'rb')
+                except OSError:
+                    for opened in file_handles:
+                        opened.close()
+                    raise
+                files[key] = f
+                file_handles.append(f)
+            else:
+                data[key] = value
+        if not files:
+            files = None
+    elif body_type == 'x-www-form-urlencoded':
+        data = {}
+        for field in body if isinstance(body, list) else []:
+            key = field.get('key', '').strip()
+            if key:
+                data[key] = field.get('value', '').strip()
+    elif body_type == 'raw':
+        raw_text = body.strip() if isinstance(body, str) else ''
+        if raw_text:
+            if raw_type == 'JSON':
+                try:
+                    json_data = json.loads(raw_text)
+                except ValueError:
+                    data = raw_text
+            else:
+                data = raw_text
+    if files and method not in FILE_UPLOAD_METHODS:
+        files = None
+    return {
+        'method': method,
+        'url': url,
+        'params': params,
+        'headers': headers,
+        'data': data,
+        'json_data': json_data,
+        'files': files,
+        'file_handles': file_handles,
+        'http_version': http_version or HTTP_VERSION_DEFAULT,
+    }
+
+
+def build_request_from_data(request):
+    """由集合中保存的请求数据（RequestEditor.serialize_request 的结果）构建请求参数"""
+    return build_request(
+        request.get('method', 'GET'),
+        request.get('url', ''),
+        request.get('params') or [],
+        request.get('headers') or [],
+        request.get('body_type', 'none'),
+        request.get('body'),
+        request.get('raw_type', 'JSON'),
+        request.get('http_version', HTTP_VERSION_DEFAULT),
+    )
+
+
+def to_request_kwargs(prepared, timeout=None):
+    """构建的请求参数 -> requests.request() 的关键字参数
+
+    所有发送方式（请求标签页的各种传输、集合运行器、压力测试）都通过这里构建，
+    同一个请求发出的内容一致。timeout 为秒数或 (连接超时, 读取超时)。
+    """
+    request_kwargs = {
+        'url': prepared['url'],
+        'method': prepared['method'],
+        'timeout': timeout,
+    }
+    if prepared['params']:
+        request_kwargs['params'] = {p['key']: p['value'] for p in prepared['params'] if p.get('key')}
+    headers = {h['key']: h['value'] for h in prepared['headers'] or [] if h.get('key')}
+    content_type = next((v for k, v in headers.items() if k.lower() == 'content-type'), '')
+    if prepared['files'] and content_type.startswith('multipart/form-data'):
+        # 用requests原生API上传文件，移除Content-Type，让requests自动生成（含boundary）
+        request_kwargs['headers'] = {k: v for k, v in headers.items() if k.lower() != 'content-type'}
+        request_kwargs['files'] = dict(prepared['files'])
+        if prepared['data']:
+            request_kwargs['data'] = prepared['data']
+    else:
+        # 手动指定了其他Content-Type时按该类型发送，不做multipart编码
+        request_kwargs['headers'] = headers or None
+        if prepared['data']:
+            request_kwargs['data'] = prepared['data']
+        elif prepared['json_data']:
+            request_kwargs['json'] = prepared['json_data']
+        elif prepared['files']:
+            request_kwargs['files'] = prepared['files']
+    return request_kwargs
+
+
+def close_file_handles(file_handles):
+    for f in file_handles or []:
+        try:
+            f.close()
+        except Exception as e:
+            print(f"关闭文件句柄出错: {e}")
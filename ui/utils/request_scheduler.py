@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, pyqtSignal
+from ui.utils.session_pool import get_pool_key
+
+
+class ScheduledJob:
+    """调度器中的一个请求任务"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+
+    def __init__(self, owner, worker, url, label=''):
+        self.owner = owner
+        self.worker = worker
+        self.url = url
+        self.label = label
+        self.host_key = get_pool_key(url)
+        self.state = self.QUEUED
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+
+
+class RequestScheduler(QObject):
+    """有界并发的请求调度器
+
+    每个 owner（通常是一个请求Tab的编辑器）同一时刻最多有一个任务；
+    全局并发和单主机并发超过上限的任务进入队列，按提交顺序启动。
+    worker 需提供 start()/stop() 以及 finished/error/stopped 信号，
+    结果通过调度器的 job_* 信号带着 job 转发，每个任务只转发一次。
+    """
+    job_finished = pyqtSignal(object, dict)
+    job_error = pyqtSignal(object, str)
+    job_stopped = pyqtSignal(object)
+    queue_changed = pyqtSignal()
+
+    def __init__(self, max_concurrent=6, max_per_host=4, parent=None):
+        super().__init__(parent)
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.max_per_host = max(0, int(max_per_host))
+        self._queue = deque()
+        self._running = []
+
+    def configure(self, max_concurrent=None, max_per_host=None):
+        if max_concurrent is not None:
+            self.max_concurrent = max(1, int(max_concurrent))
+        if max_per_host is not None:
+            self.max_per_host = max(0, int(max_per_host))
+        self._dispatch()
+
+    def submit(self, owner, worker, url, label=''):
+        """提交任务，返回 ScheduledJob；有空闲名额时立即启动"""
+        job = ScheduledJob(owner, worker, url, label)
+        worker.finished.connect(lambda result: self._on_worker_done(job, self.job_finished, result))
+        worker.error.connect(lambda msg: self._on_worker_done(job, self.job_error, msg))
+        worker.stopped.connect(lambda: self._on_worker_done(job, self.job_stopped))
+        self._queue.append(job)
+        self.queue_changed.emit()
+        self._dispatch()
+        return job
+
+    def cancel(self, owner):
+        """取消 owner 的任务并立即释放名额；之后该 worker 的信号会被忽略"""
+        job = self.job_for(owner)
+        if job is None:
+            return False
+        was_running = job.state == ScheduledJob.RUNNING
+        self._detach(job)
+        if was_running:
+            try:
+                job.worker.stop()
+            except Exception as e:
+                print(f"RequestScheduler: 停止任务出错 {e}")
+        self.job_stopped.emit(job)
+        self.queue_changed.emit()
+        self._dispatch()
+        return True
+
+    def cancel_all(self):
+        for job in self.jobs():
+            self.cancel(job.owner)
+
+    def is_busy(self, owner):
+        return self.job_for(owner) is not None
+
+    def job_for(self, owner):
+        for job in self._running:
+            if job.owner is owner:
+                return job
+        for job in self._queue:
+            if job.owner is owner:
+                return job
+        return None
+
+    def jobs(self):
+        """运行中和排队中的任务快照（运行中在前）"""
+        return list(self._running) + list(self._queue)
+
+    def running_count(self):
+        return len(self._running)
+
+    def queued_count(self):
+        return len(self._queue)
+
+    def _detach(self, job):
+        if job in self._running:
+            self._running.remove(job)
+            return True
+        if job in self._queue:
+            self._queue.remove(job)
+            return True
+        return False
+
+    def _host_running(self, host_key):
+        return sum(1 for job in self._running if job.host_key == host_key)
+
+    def _next_startable(self):
+        """队列中第一个所在主机未达到并发上限的任务"""
+        for job in self._queue:
+            if not self.max_per_host or self._host_running(job.host_key) < self.max_per_host:
+                return job
+        return None
+
+    def _dispatch(self):
+        # 每次都从当前队列中选择：启动失败或 worker 同步发出信号时会重入 _dispatch，
+        # 内层调用可能已经启动或移除了后面的任务
+        started = False
+        while len(self._running) < self.max_concurrent:
+            job = self._next_startable()
+            if job is None:
+                break
+            self._queue.remove(job)
+            job.state = ScheduledJob.RUNNING
+            job.started_at = time.monotonic()
+            self._running.append(job)
+            started = True
+            try:
+                job.worker.start()
+            except Exception as e:
+                print(f"RequestScheduler: 启动任务失败 {e}")
+                self._on_worker_done(job, self.job_error, f"启动请求失败: {e}")
+        if started:
+            self.queue_changed.emit()
+
+    def _on_worker_done(self, job, signal, *args):
+        if not self._detach(job):
+            return  # 已取消或已处理过
+        signal.emit(job, *args)
+        self.queue_changed.emit()
+        self._dispatch()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import contextvars
+import time
+from contextlib import contextmanager
+from ui.utils.i18n import get_text
+
+
+PHASES = ('dns', 'connect', 'tls', 'send', 'ttfb', 'download')
+
+# 当前请求的计时对象；线程和asyncio任务各自有独立的上下文，互不影响
+_current_timing = contextvars.ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """一次请求各阶段的耗时（秒）
+
+    dns: 域名解析；connect: TCP连接；tls: TLS握手；send: 发送请求；
+    ttfb: 发送完请求到收到响应头；download: 收到响应头到读完响应体。
+    发生重定向时各阶段累加；连接复用时没有 dns/connect/tls。
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.connections = 0  # 新建的连接数
+        self.headers_at = None
+        self.end = None
+
+    def add(self, phase, seconds):
+        self.phases[phase] += max(0.0, seconds)
+
+    def mark_headers(self):
+        self.headers_at = time.perf_counter()
+
+    def finish(self):
+        """响应体读取完毕：记录下载耗时和总耗时"""
+        self.end = time.perf_counter()
+        if self.headers_at is not None:
+            self.add('download', self.end - self.headers_at)
+        return self
+
+    def total(self):
+        return (self.end or time.perf_counter()) - self.start
+
+    def to_dict(self):
+        """各阶段耗时（毫秒），放入请求结果，可跨进程传递"""
+        result = {phase: seconds * 1000 for phase, seconds in self.phases.items()}
+        result['total'] = self.total() * 1000
+        result['reused'] = self.connections == 0
+        return result
+
+
+def current_timing():
+    return _current_timing.get()
+
+
+@contextmanager
+def bind_request_timing(timing):
+    """with块内（当前线程或asyncio任务中）发送的请求把各阶段耗时记录到 timing"""
+    token = _current_timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _current_timing.reset(token)
+
+
+def format_timing(timing, width=40):
+    """把 to_dict() 的结果画成文本瀑布图：每个阶段一行，条形的位置和长度按总耗时缩放"""
+    if not timing:
+        return get_text('timing_unavailable')
+    total = timing.get('total') or 0.0
+    scale = width / total if total > 0 else 0.0
+    lines = []
+    offset = 0.0
+    for phase in PHASES:
+        ms = timing.get(phase, 0.0)
+        start = min(width, int(round(offset * scale)))
+        length = min(width - start, max(1 if ms > 0 else 0, int(round(ms * scale))))
+        bar = ' ' * start + '\u2588' * length + ' ' * (width - start - length)
+        lines.append(f"[{bar}] {ms:9.1f} ms  {get_text('timing_' + phase)}")
+        offset += ms
+    lines.append(f"{'':{width + 2}} {total:9.1f} ms  {get_text('timing_total')}")
+    if timing.get('reused'):
+        lines.append('')
+        lines.append(get_text('timing_reused'))
+    return '\n'.join(lines)
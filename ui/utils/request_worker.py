@@ -2,11 +2,14 @@
 # -*- coding: utf-8 -*-
 
 from PyQt5.QtCore import QObject, pyqtSignal
-import requests
 import json
 import time
 import threading
 from requests_toolbelt.multipart.encoder import MultipartEncoder
+from ui.utils.session_pool import get_session_pool, CancelToken, bind_cancel_token
+from ui.utils.request_builder import to_request_kwargs
+from ui.utils.response_store import ResponseBody, StreamCollector
+from ui.utils.request_timing import RequestTiming, bind_request_timing
 
 
 class RequestWorker(QObject):
@@ -14,9 +17,28 @@ class RequestWorker(QObject):
     finished = pyqtSignal(dict)
     error = pyqtSignal(str)
     stopped = pyqtSignal()
+    # 流式下载：已接收字节数、吞吐量(字节/秒)、总字节数(未知为None)
+    progress = pyqtSignal(object, float, object)
+    # 流式下载：一批已解码的文本，供界面增量追加
+    chunk_received = pyqtSignal(str)
+
+    STREAM_CHUNK_SIZE = 64 * 1024
+    STREAM_EMIT_INTERVAL = 0.1  # 秒，进度和文本按此间隔批量发送
     
-    def __init__(self, method, url, params, headers, data, json_data, files):
+    def __init__(self, method, url, params, headers, data, json_data, files,
+                 stream=False, chunk_size=None, spill_threshold=None, preview_limit=None, timeouts=None,
+                 http2=False):
         super().__init__()
+        # 使用HTTP/2（由 create_request_worker 交给异步传输发送）
+        self.http2 = http2
+        # (连接超时, 读取超时, 总超时)，单位秒，None为不限制
+        self.connect_timeout, self.read_timeout, self.total_timeout = timeouts or (None, None, None)
+        self.stream = stream
+        self.chunk_size = chunk_size or self.STREAM_CHUNK_SIZE
+        # 超过该字节数的响应体写入临时文件，不再保存在内存中
+        self.spill_threshold = spill_threshold
+        # 流式下载时最多向界面发送的字节数，超出部分由分页查看
+        self.preview_limit = preview_limit
         self.method = method
         self.url = url
         self.params = params
@@ -25,16 +47,28 @@ class RequestWorker(QObject):
         self.json_data = json_data
         self.files = files
         self._stop_flag = False
+        self._timed_out = False
         self._thread = None
+        # 停止或总超时时关闭请求正在使用的连接，中断阻塞中的收发
+        self._cancel_token = CancelToken()
         
     def stop(self):
-        """停止请求"""
+        """停止请求：设置停止标志并关闭正在使用的连接"""
         try:
             print("RequestWorker: 设置停止标志")
             self._stop_flag = True
-            print("RequestWorker: 停止标志已设置")
+            self._cancel_token.cancel()
+            print("RequestWorker: 停止标志已设置，连接已中断")
         except Exception as e:
             print(f"RequestWorker.stop() 出错: {e}")
+
+    def _on_total_timeout(self):
+        print(f"RequestWorker: 超过总超时 {self.total_timeout}s，中断请求")
+        self._timed_out = True
+        self._cancel_token.cancel()
+
+    def timeout_message(self):
+        return f"Request timed out after {self.total_timeout:g}s"
         
     def start(self):
         """启动请求线程"""
@@ -48,57 +82,41 @@ class RequestWorker(QObject):
         
     def run(self):
         """执行请求"""
+        timer = None
+        if self.total_timeout:
+            timer = threading.Timer(self.total_timeout, self._on_total_timeout)
+            timer.daemon = True
+            timer.start()
+        try:
+            with bind_cancel_token(self._cancel_token):
+                self._run()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._cancel_token.release()
+
+    def _run(self):
         try:
             print("RequestWorker: 开始执行请求")
             if self._stop_flag:
                 print("RequestWorker: 请求被停止")
                 self.stopped.emit()
                 return
-            # 构建请求参数
-            request_kwargs = {
-                'url': self.url,
-                'method': self.method,
-                'timeout': None  # 无超时限制，一直等待服务器响应
-            }
-            # 添加参数
-            if self.params:
-                request_kwargs['params'] = {p['key']: p['value'] for p in self.params if p.get('key')}
-            # 添加头部
-            headers_dict = {h['key']: h['value'] for h in self.headers if h.get('key')}
-            # 检查是否multipart/form-data上传
-            is_multipart = False
-            if self.files:
-                ct = headers_dict.get('Content-Type', '')
-                if ct.startswith('multipart/form-data'):
-                    is_multipart = True
-            if is_multipart:
-                # 用requests原生API上传文件，不用MultipartEncoder
-                # files参数格式：{'file': fileobj, ...}
-                # data参数为普通字段
-                fields = self.files.copy() if isinstance(self.files, dict) else {}
-                data = self.data if self.data else None
-                # 移除Content-Type，让requests自动生成
-                headers_dict = {k: v for k, v in headers_dict.items() if k.lower() != 'content-type'}
-                request_kwargs['headers'] = headers_dict
-                request_kwargs['files'] = fields
-                if data:
-                    request_kwargs['data'] = data
-            else:
-                request_kwargs['headers'] = headers_dict if headers_dict else None
-                # 添加数据
-                if self.data:
-                    request_kwargs['data'] = self.data
-                elif self.json_data:
-                    request_kwargs['json'] = self.json_data
-                elif self.files:
-                    request_kwargs['files'] = self.files
+            request_kwargs = self.build_request_kwargs()
             # 发送请求前再次检查停止标志
             if self._stop_flag:
                 print("RequestWorker: 请求发送前被停止")
                 self.stopped.emit()
                 return
             print(f"RequestWorker: 发送请求 {self.method} {self.url}")
-            response = requests.request(**request_kwargs)
+            if self.stream:
+                self._run_streaming(request_kwargs)
+                return
+            # 通过全局会话池发送，复用同一主机的keep-alive连接；同时记录各阶段耗时
+            timing = RequestTiming()
+            with bind_request_timing(timing):
+                response = get_session_pool().request(**request_kwargs)
+            timing.finish()
             
             # 请求完成后立即检查停止标志
             if self._stop_flag:
@@ -108,14 +126,21 @@ class RequestWorker(QObject):
                 
             print(f"RequestWorker: 请求完成，状态码 {response.status_code}")
             
-            # 构建响应数据
+            # 构建响应数据；超过阈值的响应体写入临时文件
+            response_body = ResponseBody.from_bytes(
+                response.content, self.spill_threshold, response.encoding or 'utf-8')
             result = {
                 'status_code': response.status_code,
                 'status_text': f"{response.status_code} {response.reason}",
+                'http_version': http_version_of(response),
                 'headers': dict(response.headers),
-                'body': response.text,
+                'body': '' if response_body.is_file_backed() else response.text,
+                'response_body': response_body,
+                'size': response_body.size,
                 'url': response.url,
-                'elapsed': response.elapsed.total_seconds()
+                # response.elapsed 只计到收到响应头，这里包括下载响应体
+                'elapsed': timing.total(),
+                'timing': timing.to_dict()
             }
             
             self.finished.emit(result)
@@ -124,7 +149,9 @@ class RequestWorker(QObject):
             import traceback
             print(f"RequestWorker: 意外错误 {e}")
             traceback.print_exc()
-            if not self._stop_flag:
+            if self._timed_out and not self._stop_flag:
+                self.error.emit(self.timeout_message())
+            elif not self._stop_flag:
                 self.error.emit(f"Unexpected error: {str(e)}\n{traceback.format_exc()}")
             else:
                 print("RequestWorker: 意外错误但已停止")
@@ -132,6 +159,89 @@ class RequestWorker(QObject):
         finally:
             print("RequestWorker: 线程执行完成")
 
+    def build_request_kwargs(self):
+        """构建 requests.request() 的关键字参数"""
+        # (连接超时, 读取超时)；都为None时一直等待服务器响应，总超时由定时器中断
+        timeout = (self.connect_timeout, self.read_timeout) if self.connect_timeout or self.read_timeout else None
+        return to_request_kwargs({
+            'method': self.method,
+            'url': self.url,
+            'params': self.params,
+            'headers': self.headers,
+            'data': self.data,
+            'json_data': self.json_data,
+            'files': self.files,
+        }, timeout)
+
+    def _run_streaming(self, request_kwargs):
+        """流式下载响应体：分块读取、批量发送进度和文本，超过阈值时写入临时文件"""
+        start = time.monotonic()
+        request_kwargs['stream'] = True
+        pool = get_session_pool()
+        timing = RequestTiming()
+        with pool.acquire(request_kwargs['url']) as session:
+            with bind_request_timing(timing):
+                response = session.request(**request_kwargs)
+            collector = None
+            try:
+                print(f"RequestWorker: 收到响应头，状态码 {response.status_code}，开始流式读取")
+                total = response.headers.get('Content-Length')
+                total = int(total) if total and total.isdigit() else None
+                collector = StreamCollector(response.encoding or 'utf-8', self.spill_threshold, self.preview_limit)
+                last_emit = start
+                for chunk in response.iter_content(chunk_size=self.chunk_size):
+                    if self._stop_flag:
+                        print("RequestWorker: 流式读取中被停止")
+                        collector.discard()
+                        self.stopped.emit()
+                        return
+                    if not chunk:
+                        continue
+                    collector.feed(chunk)
+                    now = time.monotonic()
+                    if now - last_emit >= self.STREAM_EMIT_INTERVAL:
+                        last_emit = now
+                        self._emit_stream_progress(collector, start, total, now)
+                response_body = collector.finish()
+                elapsed = time.monotonic() - start
+                timing.finish()
+                self._emit_stream_progress(collector, start, total, start + elapsed)
+                self.finished.emit(self._stream_result(response.status_code, response.reason, response.headers,
+                                                       response.url, response_body, collector.received, elapsed,
+                                                       timing, http_version_of(response)))
+            except Exception:
+                if collector is not None:
+                    collector.discard()
+                raise
+            finally:
+                response.close()
+
+    def _emit_stream_progress(self, collector, start, total, now):
+        """发送已解码的文本和进度"""
+        text = collector.take_text()
+        if text:
+            self.chunk_received.emit(text)
+        received = collector.received
+        self.progress.emit(received, received / max(now - start, 1e-6), total)
+
+    @staticmethod
+    def _stream_result(status_code, reason, headers, url, response_body, received, elapsed, timing=None,
+                       http_version=None):
+        # 构建响应数据；写入临时文件的响应体只能通过 response_body 分页读取
+        return {
+            'status_code': status_code,
+            'status_text': f"{status_code} {reason}",
+            'http_version': http_version,
+            'headers': dict(headers),
+            'body': '' if response_body.is_file_backed() else response_body.text(),
+            'response_body': response_body,
+            'size': received,
+            'streamed': True,
+            'url': str(url),
+            'elapsed': elapsed,
+            'timing': timing.to_dict() if timing is not None else None
+        }
+
     def __del__(self):
         """析构函数，确保资源清理"""
         try:
@@ -149,4 +259,40 @@ class RequestWorker(QObject):
             if hasattr(self, '_thread') and self._thread:
                 self._thread = None
         except Exception as e:
-            print(f"RequestWorker.cleanup 出错: {e}") 
\ No newline at end of file
+            print(f"RequestWorker.cleanup 出错: {e}")
+
+
+def http_version_of(response):
+    """requests 响应实际使用的协议版本，如 'HTTP/1.1'"""
+    version = getattr(response.raw, 'version', None)
+    return {9: 'HTTP/0.9', 10: 'HTTP/1.0', 11: 'HTTP/1.1', 20: 'HTTP/2'}.get(version, 'HTTP/1.1')
+
+
+def timeouts_from_settings(settings):
+    """设置中的超时（秒，0为不限制） -> (连接超时, 读取超时, 总超时)"""
+    return tuple(settings.get(key, 0) or None for key in
+                 ('request_connect_timeout', 'request_read_timeout', 'request_total_timeout'))
+
+
+def create_request_worker(*args, transport='thread', **kwargs):
+    """按传输方式创建请求工作对象，参数同 RequestWorker
+
+    transport 为 'async' 且已安装 httpx 时使用共享事件循环的 AsyncRequestWorker，
+    为 'process' 时使用进程池中的 MultiprocessRequestWorker，
+    否则使用每个请求一个线程的 RequestWorker。
+    http2 为 True 时不论 transport 都使用 AsyncRequestWorker（只有 httpx 支持HTTP/2）。
+    """
+    if kwargs.get('http2'):
+        from ui.utils.async_transport import AsyncRequestWorker, http2_available
+        if http2_available():
+            return AsyncRequestWorker(*args, **kwargs)
+        print("create_request_worker: 未安装httpx或h2，使用HTTP/1.1")
+    if transport == 'process':
+        from ui.utils.multiprocess_worker import MultiprocessRequestWorker
+        return MultiprocessRequestWorker(*args, **kwargs)
+    if transport == 'async':
+        from ui.utils.async_transport import AsyncRequestWorker, async_transport_available
+        if async_transport_available():
+            return AsyncRequestWorker(*args, **kwargs)
+        print("create_request_worker: 未安装httpx，使用线程传输")
+    return RequestWorker(*args, **kwargs)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import codecs
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+from ui.utils.blob_store import (
+    FILE_CHUNK_SIZE, codec_for_path, file_has_content, open_compressed_writer
+)
+
+
+TEMP_PREFIX = 'postsuperman-resp-'
+
+
+class ResponseBody:
+    """响应体存储
+
+    小响应体以 bytes 保存在内存中；大响应体保存在临时文件中并内存映射，
+    按需读取，避免整个响应体同时以 bytes、str 和 QTextDocument 三份驻留内存。
+    """
+
+    def __init__(self, data=None, path=None, encoding='utf-8'):
+        self.encoding = encoding or 'utf-8'
+        self._data = data if data is not None else b''
+        self._path = path
+        self._file = None
+        self._mmap = None
+        if path is not None:
+            self._file = open(path, 'rb')
+            self._size = os.fstat(self._file.fileno()).st_size
+            if self._size > 0:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._size = len(self._data)
+
+    @classmethod
+    def from_bytes(cls, data, spill_threshold=None, encoding='utf-8'):
+        """超过阈值的内容写入临时文件，否则保存在内存中"""
+        if spill_threshold and len(data) > spill_threshold:
+            f = create_spill_file()
+            try:
+                f.write(data)
+            finally:
+                f.close()
+            return cls(path=f.name, encoding=encoding)
+        return cls(data=bytes(data), encoding=encoding)
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def path(self):
+        return self._path
+
+    def is_file_backed(self):
+        return self._path is not None
+
+    def read(self, offset=0, length=None):
+        """读取原始字节"""
+        if length is None:
+            length = self._size - offset
+        end = min(self._size, offset + max(0, length))
+        if self._mmap is not None:
+            return self._mmap[offset:end]
+        if self._path is not None:
+            return b''
+        return self._data[offset:end]
+
+    def find(self, sub, start=0, end=None):
+        """在原始字节中查找，语义同 bytes.find"""
+        if end is None:
+            end = self._size
+        if self._mmap is not None:
+            return self._mmap.find(sub, start, end)
+        if self._path is not None:
+            return -1
+        return self._data.find(sub, start, end)
+
+    def text(self):
+        """整体解码（仅用于内存中的小响应体）"""
+        return self.read().decode(self.encoding, errors='replace')
+
+    def copy_to(self, dest):
+        """保存到文件；文件存储时直接复制文件，不经过解码"""
+        if self._path is not None:
+            shutil.copyfile(self._path, dest)
+        else:
+            with open(dest, 'wb') as f:
+                f.write(self._data)
+
+    def digest(self):
+        """内容的 SHA-256（分块计算，不整体复制文件存储的内容）"""
+        h = hashlib.sha256()
+        for offset in range(0, self._size, FILE_CHUNK_SIZE):
+            h.update(self.read(offset, FILE_CHUNK_SIZE))
+        return h.hexdigest()
+
+    def save_to(self, dest):
+        """保存到文件，返回写入的字节数
+
+        扩展名为 .gz/.zst 时压缩保存；目标文件已是相同的内容时不再写入，返回 0
+        （反复保存轮询接口的相同响应时不产生写入）。
+        """
+        codec = codec_for_path(dest)
+        if codec == 'raw':
+            if file_has_content(dest, self._size, self.digest()):
+                return 0
+            self.copy_to(dest)
+            return self._size
+        writer = open_compressed_writer(dest, codec)
+        try:
+            for offset in range(0, self._size, FILE_CHUNK_SIZE):
+                writer.write(self.read(offset, FILE_CHUNK_SIZE))
+        finally:
+            writer.close()
+        return os.path.getsize(dest)
+
+    def close(self):
+        """释放内存映射并删除临时文件"""
+        try:
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._path is not None and os.path.exists(self._path):
+                os.remove(self._path)
+        except Exception as e:
+            print(f"ResponseBody: 释放临时文件出错 {e}")
+        self._path = None
+        self._data = b''
+        self._size = 0
+
+
+def create_spill_file():
+    """创建用于保存大响应体的临时文件（调用方负责关闭）"""
+    return tempfile.NamedTemporaryFile(prefix=TEMP_PREFIX, suffix='.body', delete=False)
+
+
+class StreamCollector:
+    """流式响应体的接收缓冲（线程和异步两种工作对象共用）
+
+    feed() 逐块接收：超过 spill_threshold 后改写临时文件；前 preview_limit 字节
+    增量解码为文本，由 take_text() 取出发送给界面；finish() 返回 ResponseBody。
+    """
+
+    def __init__(self, encoding='utf-8', spill_threshold=None, preview_limit=None):
+        try:
+            codecs.lookup(encoding or 'utf-8')
+        except LookupError:
+            encoding = 'utf-8'
+        self.encoding = encoding or 'utf-8'
+        self.spill_threshold = spill_threshold
+        self.preview_limit = preview_limit
+        self.received = 0
+        self._previewed = 0
+        self._decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        self._buffer = bytearray()
+        self._pending_text = []
+        self._spill_file = None
+
+    def feed(self, chunk):
+        if not chunk:
+            return
+        self.received += len(chunk)
+        if self.preview_limit is None or self._previewed < self.preview_limit:
+            self._pending_text.append(self._decoder.decode(chunk))
+            self._previewed += len(chunk)
+        if self._spill_file is None:
+            self._buffer += chunk
+            if self.spill_threshold and self.received > self.spill_threshold:
+                # 超过阈值：已有内容写入临时文件，之后只写文件
+                self._spill_file = create_spill_file()
+                self._spill_file.write(self._buffer)
+                self._buffer = bytearray()
+                print(f"StreamCollector: 响应体超过 {self.spill_threshold} 字节，写入临时文件 {self._spill_file.name}")
+        else:
+            self._spill_file.write(chunk)
+
+    def take_text(self):
+        """取出尚未发送的预览文本"""
+        text = ''.join(self._pending_text)
+        self._pending_text = []
+        return text
+
+    def finish(self):
+        """接收完毕：冲刷解码器，返回 ResponseBody；之后 take_text() 返回剩余文本"""
+        if self._previewed == self.received:
+            self._pending_text.append(self._decoder.decode(b'', final=True))
+        if self._spill_file is not None:
+            self._spill_file.close()
+            path = self._spill_file.name
+            self._spill_file = None
+            return ResponseBody(path=path, encoding=self.encoding)
+        body = ResponseBody(data=bytes(self._buffer), encoding=self.encoding)
+        self._buffer = bytearray()
+        return body
+
+    def discard(self):
+        """放弃接收：关闭并删除临时文件"""
+        spill_file = self._spill_file
+        self._spill_file = None
+        self._buffer = bytearray()
+        if spill_file is None:
+            return
+        try:
+            spill_file.close()
+            os.remove(spill_file.name)
+        except Exception as e:
+            print(f"StreamCollector: 删除临时文件出错 {e}")
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from http import cookiejar
+from socket import timeout as SocketTimeout
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import connection, connectionpool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family, create_connection
+
+try:
+    from urllib3.exceptions import NameResolutionError
+except ImportError:
+    # urllib3 1.x 没有单独的域名解析错误，解析失败与连接失败一样报 NewConnectionError
+    NameResolutionError = None
+
+from ui.utils.request_timing import current_timing
+from ui.utils.dns_cache import dns_generation, get_dns_cache
+from ui.utils.settings_manager import load_settings
+
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_PER_HOST = 6
+DEFAULT_IDLE_TIMEOUT = 90
+DEFAULT_MAX_HOSTS = 64
+# 等待主机并发名额时检查取消的间隔（秒）
+SLOT_WAIT_INTERVAL = 0.1
+
+
+class _NoCookiePolicy(cookiejar.DefaultCookiePolicy):
+    """会话不跨请求保留Cookie，保持与 requests.request() 一致的行为"""
+    def set_ok(self, cookie, request):
+        return False
+
+
+def get_pool_key(url):
+    """根据URL生成连接池键 (scheme, host, port)"""
+    parts = urlsplit(url)
+    scheme = (parts.scheme or 'http').lower()
+    host = (parts.hostname or '').lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port is None:
+        port = 443 if scheme == 'https' else 80
+    return scheme, host, port
+
+
+def create_cookie_jar():
+    """不保留Cookie的CookieJar（异步传输的客户端也使用）"""
+    return cookiejar.CookieJar(policy=_NoCookiePolicy())
+
+
+class CancelToken:
+    """取消令牌：记录请求正在使用的连接，cancel() 时关闭其socket
+
+    阻塞在 connect 之后的发送、等待响应或读取响应体中的请求线程会立即收到连接错误；
+    建立TCP连接（含DNS解析）的阶段无法中断，由连接超时限制。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connections = []
+        self.cancelled = False
+
+    def register(self, conn):
+        with self._lock:
+            if self.cancelled:
+                raise requests.exceptions.ConnectionError('Request cancelled')
+            conn._cancel_token = self
+            self._connections.append(conn)
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            connections = self._connections
+            self._connections = []
+        for conn in connections:
+            # 连接可能已归还连接池并被其他请求使用，只关闭仍属于本令牌的连接
+            if getattr(conn, '_cancel_token', None) is not self:
+                continue
+            sock = getattr(conn, 'sock', None)
+            if sock is None:
+                continue
+            try:
+                # 绕过SSL层直接关闭底层socket，使其他线程中阻塞的读写立即返回
+                socket.socket.shutdown(sock, socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def release(self):
+        """请求结束：不再跟踪连接"""
+        with self._lock:
+            for conn in self._connections:
+                if getattr(conn, '_cancel_token', None) is self:
+                    conn._cancel_token = None
+            self._connections = []
+
+
+_cancel_local = threading.local()
+
+
+@contextmanager
+def bind_cancel_token(token):
+    """在当前线程中，with块内通过会话发送的请求使用的连接都登记到 token"""
+    previous = getattr(_cancel_local, 'token', None)
+    _cancel_local.token = token
+    try:
+        yield token
+    finally:
+        _cancel_local.token = previous
+
+
+def _register_connection(conn):
+    token = getattr(_cancel_local, 'token', None)
+    if token is not None:
+        token.register(conn)
+
+
+def resolve_address(host):
+    """解析主机名，返回去重后的 [(family, IP)]；经过全局解析缓存和手动指定的地址"""
+    return get_dns_cache().resolve(host, allowed_gai_family())
+
+
+class _InstrumentedConnection:
+    """连接登记到 CancelToken，并把各阶段耗时记录到当前的 RequestTiming
+
+    _new_conn 先解析域名，再依次尝试连接解析出的地址（与 urllib3 相同），
+    以便分别计时域名解析和TCP连接。
+    """
+    _cancel_token = None
+    _sent_at = None
+
+    def _new_conn(self):
+        timing = current_timing()
+        start = time.perf_counter()
+        try:
+            addresses = resolve_address(self._dns_host)
+        except socket.gaierror as e:
+            if NameResolutionError is None:
+                raise NewConnectionError(self, f"Failed to establish a new connection: {e}") from e
+            raise NameResolutionError(self.host, self, e) from e
+        resolved = time.perf_counter()
+        if timing is not None:
+            timing.add('dns', resolved - start)
+        error = None
+        for _, address in addresses:
+            try:
+                sock = create_connection((address, self.port), self.timeout,
+                                         source_address=self.source_address,
+                                         socket_options=self.socket_options)
+                break
+            except OSError as e:
+                error = e
+        else:
+            if isinstance(error, SocketTimeout):
+                raise ConnectTimeoutError(
+                    self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})") from error
+            error = error or OSError('getaddrinfo returns an empty list')
+            raise NewConnectionError(self, f"Failed to establish a new connection: {error}") from error
+        if timing is not None:
+            timing.add('connect', time.perf_counter() - resolved)
+            timing.connections += 1
+        return sock
+
+    def connect(self):
+        _register_connection(self)
+        start = time.perf_counter()
+        timing = current_timing()
+        phases = dict(timing.phases) if timing is not None else None
+        super().connect()
+        if timing is not None and isinstance(self, connection.HTTPSConnection):
+            # connect() 中除了解析和TCP连接之外的时间为TLS握手（经代理时含CONNECT隧道）
+            spent = (timing.phases['dns'] - phases['dns']) + (timing.phases['connect'] - phases['connect'])
+            timing.add('tls', time.perf_counter() - start - spent)
+
+    def request(self, *args, **kwargs):
+        # keep-alive复用的连接不会再调用 connect，在每次发送请求时登记
+        _register_connection(self)
+        timing = current_timing()
+        if timing is None:
+            return super().request(*args, **kwargs)
+        start = time.perf_counter()
+        # 尚未连接时 request() 中会先建立连接，这部分已计入 dns/connect/tls
+        before = sum(timing.phases[p] for p in ('dns', 'connect', 'tls'))
+        super().request(*args, **kwargs)
+        self._sent_at = time.perf_counter()
+        connecting = sum(timing.phases[p] for p in ('dns', 'connect', 'tls')) - before
+        timing.add('send', self._sent_at - start - connecting)
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        timing = current_timing()
+        if timing is not None and self._sent_at is not None:
+            timing.add('ttfb', time.perf_counter() - self._sent_at)
+            timing.mark_headers()
+        self._sent_at = None
+        return response
+
+
+# 类名与urllib3相同，错误信息中显示的连接和连接池名称保持不变
+class HTTPConnection(_InstrumentedConnection, connection.HTTPConnection):
+    pass
+
+
+class HTTPSConnection(_InstrumentedConnection, connection.HTTPSConnection):
+    pass
+
+
+class HTTPConnectionPool(connectionpool.HTTPConnectionPool):
+    ConnectionCls = HTTPConnection
+
+
+class HTTPSConnectionPool(connectionpool.HTTPSConnectionPool):
+    ConnectionCls = HTTPSConnection
+
+
+_CANCELLABLE_POOL_CLASSES = {
+    'http': HTTPConnectionPool,
+    'https': HTTPSConnectionPool,
+}
+
+
+class CancellableHTTPAdapter(HTTPAdapter):
+    """连接可由 CancelToken 中断的 HTTPAdapter"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _CANCELLABLE_POOL_CLASSES
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        # SOCKS代理使用自己的连接类，不替换
+        if not proxy.lower().startswith('socks'):
+            manager.pool_classes_by_scheme = _CANCELLABLE_POOL_CLASSES
+        return manager
+
+
+def create_session(pool_size):
+    """创建不保留Cookie、连接池大小为 pool_size 的会话"""
+    session = requests.Session()
+    session.cookies.set_policy(_NoCookiePolicy())
+    adapter = CancellableHTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class _PooledHost:
+    """单个 scheme/host/port 对应的会话、连接池和并发限制"""
+
+    def __init__(self, key, pool_size, max_per_host):
+        self.key = key
+        self.session = create_session(pool_size)
+        self.semaphore = threading.BoundedSemaphore(max_per_host) if max_per_host > 0 else None
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+
+    def close(self):
+        try:
+            self.session.close()
+        except Exception as e:
+            print(f"SessionPool: 关闭会话出错 {self.key}: {e}")
+
+
+class SessionPool:
+    """进程级HTTP会话池，按 scheme/host/port 复用keep-alive连接"""
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE, max_per_host=DEFAULT_MAX_PER_HOST,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, max_hosts=DEFAULT_MAX_HOSTS):
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self.pool_size = pool_size
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.max_hosts = max_hosts
+        self._dns_generation = dns_generation()
+
+    def configure(self, pool_size=None, max_per_host=None, idle_timeout=None, max_hosts=None):
+        """更新池参数；已存在的会话在空闲后按新参数重建"""
+        with self._lock:
+            if pool_size is not None:
+                self.pool_size = max(1, int(pool_size))
+            if max_per_host is not None:
+                self.max_per_host = max(0, int(max_per_host))
+            if idle_timeout is not None:
+                self.idle_timeout = max(0, float(idle_timeout))
+            if max_hosts is not None:
+                self.max_hosts = max(1, int(max_hosts))
+            self._reset_hosts_locked()
+
+    @contextmanager
+    def acquire(self, url):
+        """获取URL对应的会话；在with块内占用一个该主机的并发名额"""
+        host = self._checkout(get_pool_key(url))
+        if host.semaphore is not None:
+            # 主机已达并发上限时等待名额；当前线程绑定的 CancelToken 被取消时放弃等待
+            token = getattr(_cancel_local, 'token', None)
+            while not host.semaphore.acquire(timeout=SLOT_WAIT_INTERVAL):
+                if token is not None and token.cancelled:
+                    self._checkin(host)
+                    raise requests.exceptions.ConnectionError('Request cancelled')
+        try:
+            yield host.session
+        finally:
+            if host.semaphore is not None:
+                host.semaphore.release()
+            self._checkin(host)
+
+    def request(self, **request_kwargs):
+        """与 requests.request 相同的调用方式，但复用池中的连接"""
+        with self.acquire(request_kwargs.get('url', '')) as session:
+            return session.request(**request_kwargs)
+
+    def evict_idle(self):
+        """关闭超过空闲时间的会话"""
+        with self._lock:
+            self._evict_idle_locked(time.monotonic())
+
+    def close_all(self):
+        """关闭所有空闲会话（应用退出时由 close_session_pool 调用）"""
+        with self._lock:
+            for key in [k for k, h in self._hosts.items() if h.in_flight == 0]:
+                self._hosts.pop(key).close()
+
+    def stats(self):
+        """返回每个主机的当前并发数，供调试或界面显示"""
+        with self._lock:
+            return {f'{s}://{h}:{p}': host.in_flight for (s, h, p), host in self._hosts.items()}
+
+    def _checkout(self, key):
+        with self._lock:
+            if self._dns_generation != dns_generation():
+                # DNS设置变化或缓存被清空：已建立的连接可能连向旧地址，重新连接
+                self._dns_generation = dns_generation()
+                self._reset_hosts_locked()
+            now = time.monotonic()
+            self._evict_idle_locked(now)
+            host = self._hosts.get(key)
+            if host is None:
+                host = _PooledHost(key, self.pool_size, self.max_per_host)
+                self._hosts[key] = host
+                self._evict_lru_locked()
+            host.in_flight += 1
+            host.last_used = now
+            return host
+
+    def _checkin(self, host):
+        with self._lock:
+            host.in_flight -= 1
+            host.last_used = time.monotonic()
+            # 已被移出池的会话，用完后关闭
+            if host.in_flight == 0 and self._hosts.get(host.key) is not host:
+                host.close()
+
+    def _reset_hosts_locked(self):
+        # 忙碌中的会话先移出池，等请求结束后在 _checkin 中关闭
+        for key in list(self._hosts):
+            host = self._hosts.pop(key)
+            if host.in_flight == 0:
+                host.close()
+
+    def _evict_idle_locked(self, now):
+        if self.idle_timeout <= 0:
+            return
+        for key, host in list(self._hosts.items()):
+            if host.in_flight == 0 and now - host.last_used > self.idle_timeout:
+                del self._hosts[key]
+                host.close()
+
+    def _evict_lru_locked(self):
+        idle = sorted((h.last_used, k) for k, h in self._hosts.items() if h.in_flight == 0)
+        while len(self._hosts) > self.max_hosts and idle:
+            _, key = idle.pop(0)
+            self._hosts.pop(key).close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool():
+    """获取全局会话池（首次调用时按设置创建）"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            s = load_settings()
+            _pool = SessionPool(
+                pool_size=s.get('http_pool_size', DEFAULT_POOL_SIZE),
+                max_per_host=s.get('http_pool_max_per_host', DEFAULT_MAX_PER_HOST),
+                idle_timeout=s.get('http_pool_idle_timeout', DEFAULT_IDLE_TIMEOUT),
+            )
+        return _pool
+
+
+def apply_pool_settings(settings):
+    """设置保存后立即更新全局会话池参数"""
+    get_session_pool().configure(
+        pool_size=settings.get('http_pool_size', DEFAULT_POOL_SIZE),
+        max_per_host=settings.get('http_pool_max_per_host', DEFAULT_MAX_PER_HOST),
+        idle_timeout=settings.get('http_pool_idle_timeout', DEFAULT_IDLE_TIMEOUT),
+    )
+
+
+def close_session_pool():
+    """应用退出时关闭全局会话池中的空闲会话；尚未创建时不创建"""
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        pool.close_all()
@@ -15,12 +15,42 @@ DATA_DIR = get_default_data_dir()
 DEFAULT_SETTINGS = {
     "collections_path": os.path.join(DATA_DIR, "collections.json"),
     "log_path": os.path.join(DATA_DIR, "postsuperman.log"),
+    "collections_save_delay_ms": 500,  # 集合修改后延迟写入的时间（毫秒），期间的多次修改合并写入
+    "collections_compact_json": False,  # collections.json 使用紧凑格式（不缩进）
+    "collections_sharded": False,  # 分片存储：每个顶级集合一个文件（collections.d目录），重启后生效
     "editor_tab_size": 4,  # 编辑器Tab空格数
     "ui_font_family": "微软雅黑",  # UI默认字体
     "ui_font_size": 12,  # UI默认字体大小
     "editor_font_family": "Consolas",  # 编辑器默认字体
     "editor_font_size": 12,  # 编辑器默认字号
     "ui_language": "zh",  # UI默认语言
+    "http_pool_size": 10,  # 每个主机保持的最大连接数
+    "http_pool_max_per_host": 6,  # 每个主机同时进行的最大请求数，0为不限制
+    "http_pool_idle_timeout": 90,  # 空闲会话回收时间（秒）
+    "max_concurrent_requests": 6,  # 同时发送的最大请求数，超出的排队
+    "max_concurrent_per_host": 4,  # 同一主机同时发送的最大请求数，0为不限制
+    "request_transport": "thread",  # 请求传输方式：thread 每个请求一个线程；async 共享的asyncio事件循环（需安装httpx）；process 进程池
+    "process_pool_size": 2,  # 多进程传输时预启动的请求进程数
+    "dns_cache_enabled": False,  # 缓存域名解析结果，重复发送时不再经过系统解析器（默认关闭）
+    "dns_cache_ttl": 60,  # 解析结果缓存时间（秒）；安装了dnspython时不超过DNS记录的TTL
+    "dns_negative_ttl": 10,  # 域名不存在的结果缓存时间（秒），0为不缓存
+    "dns_overrides": {},  # 手动指定的主机地址（类似hosts文件）：{"主机名": ["IP", ...]}
+    "request_connect_timeout": 0,  # 建立连接的超时（秒），0为不限制
+    "request_read_timeout": 0,  # 等待服务器数据的超时（秒，两次收到数据之间的间隔），0为不限制
+    "request_total_timeout": 0,  # 整个请求（含下载响应体）的超时（秒），0为不限制
+    "response_streaming": True,  # 流式下载响应体，边接收边显示
+    "http2_enabled": False,  # 请求未单独选择HTTP版本时使用HTTP/2（需安装httpx[http2]），同一源站的并发请求共用一个连接
+    "stream_chunk_size_kb": 64,  # 流式下载每次读取的块大小（KB）
+    "stream_spill_threshold_mb": 32,  # 响应体超过该大小（MB）时写入临时文件
+    "stream_preview_kb": 1024,  # 流式下载时在编辑器中预览的最大大小（KB）
+    "large_body_viewer_threshold_kb": 2048,  # 响应体超过该大小（KB）时使用虚拟化查看器
+    "json_auto_format_max_kb": 5120,  # 响应JSON不超过该大小（KB）时自动格式化，更大的需手动点击
+    "highlight_max_size_kb": 2048,  # 文本超过该大小（K字符）时不做语法高亮，0为不限制
+    "history_enabled": True,  # 记录发送的请求和响应（保存在集合文件同目录的 history.db）
+    "history_max_entries": 100000,  # 最多保留的历史记录数，0为不限制
+    "history_max_days": 30,  # 历史记录保留天数，0为不限制
+    "history_max_mb": 512,  # 历史数据库大小上限（MB），超出时删除最旧的记录，0为不限制
+    "history_max_body_kb": 1024,  # 历史中保存的响应体最大大小（KB），更大的只记录大小
     "shortcuts": {
         "send": "Ctrl+Enter",
         "save": "Ctrl+S",
@@ -4,7 +4,6 @@
 from PyQt5.QtWidgets import QWidget, QPlainTextEdit, QTextEdit
 from PyQt5.QtCore import Qt, QSize, QRect
 from PyQt5.QtGui import QColor, QTextFormat, QTextCharFormat, QFont, QPainter, QTextCursor
-import json
 from ui.utils.settings_manager import load_settings
 
 
@@ -74,12 +73,9 @@ class CodeEditor(QPlainTextEdit):
             if self.parent_mainwindow.raw_type_combo.currentText() == 'JSON':
                 # Ctrl+B 一键美化
                 if event.key() == Qt.Key_B and event.modifiers() & Qt.ControlModifier:
-                    try:
-                        obj = json.loads(self.toPlainText())
-                        pretty = json.dumps(obj, ensure_ascii=False, indent=tab_size)
-                        self.setPlainText(pretty)
-                    except Exception:
-                        pass
+                    if hasattr(self.parent_mainwindow, 'beautify_json'):
+                        # 由请求编辑器在后台线程中美化，按编辑器的Tab空格数缩进
+                        self.parent_mainwindow.beautify_json(indent=tab_size, explicit=False)
                     return
                 # Tab/Shift+Tab 多行缩进/反缩进
                 if event.key() == Qt.Key_Tab:
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QListView, QPushButton, QMenu, QAbstractItemView,
+    QMessageBox
+)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor
+from ui.utils.i18n import get_text
+
+
+class HistoryListModel(QAbstractListModel):
+    """历史列表模型：按需分页读取（canFetchMore/fetchMore），滚动到底部时才读取下一页"""
+
+    PAGE_SIZE = 200
+    EntryIdRole = Qt.UserRole + 1
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.filter_text = ''
+        self._rows = []
+        self._exhausted = store is None
+
+    def set_filter(self, text):
+        self.beginResetModel()
+        self.filter_text = text.strip()
+        self._rows = []
+        self._exhausted = self.store is None
+        self.endResetModel()
+
+    def reload(self):
+        self.set_filter(self.filter_text)
+
+    def prepend(self, summaries):
+        """新记录插入到顶部；有过滤条件时重新查询"""
+        if self.filter_text:
+            self.reload()
+            return
+        summaries = sorted(summaries, key=lambda s: s['id'], reverse=True)
+        self.beginInsertRows(QModelIndex(), 0, len(summaries) - 1)
+        self._rows[0:0] = summaries
+        self.endInsertRows()
+
+    def remove_entry(self, entry_id):
+        for row, summary in enumerate(self._rows):
+            if summary['id'] == entry_id:
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._rows[row]
+                self.endRemoveRows()
+                return
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        before_id = self._rows[-1]['id'] if self._rows else None
+        page = self.store.query(before_id=before_id, limit=self.PAGE_SIZE, text=self.filter_text)
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page) - 1)
+            self._rows.extend(page)
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        summary = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            when = time.strftime('%m-%d %H:%M:%S', time.localtime(summary['ts']))
+            status = summary['status'] or 'ERR'
+            return f"{when}  {summary['method']}  {status}  {summary['url']}"
+        if role == Qt.ToolTipRole:
+            lines = [summary['url'], summary['status_text'] or summary['error'] or '']
+            if summary['elapsed'] is not None:
+                lines.append(f"{summary['elapsed'] * 1000:.0f}ms   {(summary['size'] or 0) / 1024:.2f}KB")
+            return '\n'.join(line for line in lines if line)
+        if role == Qt.ForegroundRole:
+            if summary['error'] or summary['status'] >= 400:
+                return QColor('#c62828')
+            return None
+        if role == self.EntryIdRole:
+            return summary['id']
+        return None
+
+
+class HistoryPanel(QWidget):
+    """左侧 History 标签页：过滤框 + 历史列表，双击打开历史请求"""
+
+    open_requested = pyqtSignal(int)      # 历史记录 id
+    entries_recorded = pyqtSignal(list)   # 由存储的写入线程发出，在界面线程中插入列表
+
+    FILTER_DELAY_MS = 250
+
+    def __init__(self, store=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setClearButtonEnabled(True)
+        self.clear_btn = QPushButton()
+        filter_layout.addWidget(self.filter_edit)
+        filter_layout.addWidget(self.clear_btn)
+        layout.addLayout(filter_layout)
+
+        self.model = HistoryListModel(store, self)
+        self.list_view = QListView()
+        self.list_view.setUniformItemSizes(True)  # 行高一致，不必逐行计算
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.list_view.setModel(self.model)
+        layout.addWidget(self.list_view)
+
+        # 输入停止后再查询
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(lambda: self.model.set_filter(self.filter_edit.text()))
+        self.filter_edit.textChanged.connect(lambda _: self._filter_timer.start())
+        self.list_view.doubleClicked.connect(self._on_double_clicked)
+        self.list_view.customContextMenuRequested.connect(self._show_context_menu)
+        self.clear_btn.clicked.connect(self.clear_history)
+        self.entries_recorded.connect(self.model.prepend)
+        if store is not None:
+            store.on_recorded = self.entries_recorded.emit
+        self.refresh_texts()
+
+    def refresh_texts(self):
+        self.filter_edit.setPlaceholderText(get_text('history_filter_placeholder'))
+        self.clear_btn.setText(get_text('history_clear'))
+
+    def _selected_ids(self):
+        return [index.data(HistoryListModel.EntryIdRole) for index in self.list_view.selectionModel().selectedIndexes()]
+
+    def _on_double_clicked(self, index):
+        self.open_requested.emit(index.data(HistoryListModel.EntryIdRole))
+
+    def _show_context_menu(self, pos):
+        index = self.list_view.indexAt(pos)
+        if not index.isValid() or self.store is None:
+            return
+        menu = QMenu(self)
+        open_action = menu.addAction(get_text('history_open'))
+        delete_action = menu.addAction(get_text('history_delete'))
+        action = menu.exec_(self.list_view.viewport().mapToGlobal(pos))
+        if action == open_action:
+            self.open_requested.emit(index.data(HistoryListModel.EntryIdRole))
+        elif action == delete_action:
+            entry_ids = self._selected_ids() or [index.data(HistoryListModel.EntryIdRole)]
+            self.store.delete(entry_ids)
+            for entry_id in entry_ids:
+                self.model.remove_entry(entry_id)
+
+    def clear_history(self):
+        if self.store is None:
+            return
+        choice = QMessageBox.question(self, get_text('history_clear'), get_text('history_clear_confirm'),
+                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if choice != QMessageBox.Yes:
+            return
+        self.store.clear()
+        self.store.flush(5)
+        self.model.reload()
@@ -2,46 +2,174 @@
 # -*- coding: utf-8 -*-
 
 from PyQt5.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont
+from PyQt5.QtCore import QTimer
 import re
+from ui.utils.settings_manager import load_settings
+
+
+# 单次扫描的词法规则（预编译）；字符串正确处理转义的引号
+_TOKEN_RE = re.compile(r'''
+    (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<open_string>"(?:[^"\\]|\\.)*\\?$)
+  | (?P<number>-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<bool>\b(?:true|false)\b)
+  | (?P<null>\bnull\b)
+''', re.VERBOSE)
+# 上一行以未结束的字符串结尾时，本行从开头继续匹配字符串剩余部分
+_STRING_REST_RE = re.compile(r'(?:[^"\\]|\\.)*"')
+_KEY_TAIL_RE = re.compile(r'\s*:')
+
+STATE_UNHIGHLIGHTED = -2  # 大文档中尚未高亮的块
+STATE_NORMAL = 0
+STATE_IN_STRING = 1
 
 
 class JsonHighlighter(QSyntaxHighlighter):
-    """JSON语法高亮器"""
-    def __init__(self, parent=None):
+    """JSON语法高亮器
+
+    单次扫描每行文本，跨行的字符串通过块状态(setCurrentBlockState)延续。
+    大文档先高亮可见的行，其余的在空闲时分批完成；超过设置的大小时不高亮。
+    """
+
+    LAZY_MIN_BLOCKS = 2000  # 超过该行数时先高亮可见区域
+    IDLE_CHUNK = 1000  # 每次空闲时高亮的行数
+
+    def __init__(self, parent=None, editor=None):
         super().__init__(parent)
+        self.editor = editor  # 用于确定可见区域的编辑器（可选）
         self.keyFormat = QTextCharFormat()
         self.keyFormat.setForeground(QColor('#1976d2'))
         self.keyFormat.setFontWeight(QFont.Bold)
-        
+
         self.strFormat = QTextCharFormat()
         self.strFormat.setForeground(QColor('#43a047'))
-        
+
         self.numFormat = QTextCharFormat()
         self.numFormat.setForeground(QColor('#e65100'))
-        
+
         self.boolFormat = QTextCharFormat()
         self.boolFormat.setForeground(QColor('#d84315'))
-        
+
         self.nullFormat = QTextCharFormat()
         self.nullFormat.setForeground(QColor('#757575'))
 
+        self._skip_pass = False  # 为True时跳过Qt在setDocument后触发的整篇高亮
+        self._lazy_token = 0  # 每次setDocument递增，使过期的延迟任务失效
+        self._budget = None  # 本次rehighlightBlock最多高亮的块数，None为不限制
+        self._last_block = None
+        self._fill_block = None
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setInterval(0)
+        self._idle_timer.timeout.connect(self._highlight_idle_chunk)
+        if self.editor is not None:
+            self.editor.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+    def setDocument(self, doc):
+        """挂接文档；大文档先高亮可见区域，超过大小上限时退回纯文本"""
+        self._idle_timer.stop()
+        self._fill_block = None
+        if doc is not None:
+            max_chars = int(load_settings().get('highlight_max_size_kb', 2048)) * 1024
+            if max_chars and doc.characterCount() > max_chars:
+                print(f"JsonHighlighter: 文档超过 {max_chars} 字符，不进行高亮")
+                doc = None
+        lazy = doc is not None and doc.blockCount() > self.LAZY_MIN_BLOCKS
+        self._skip_pass = lazy
+        self._lazy_token += 1
+        super().setDocument(doc)
+        if lazy:
+            # Qt的整篇高亮在下一轮事件循环执行（被跳过），之后先高亮可见区域
+            token = self._lazy_token
+            QTimer.singleShot(0, lambda: self._start_lazy_highlight(token))
+
     def highlightBlock(self, text):
-        # key: "key"
-        for m in re.finditer(r'"(.*?)"(?=\s*:)', text):
-            self.setFormat(m.start(), m.end()-m.start(), self.keyFormat)
-        
-        # string value: : "value"
-        for m in re.finditer(r':\s*"(.*?)"', text):
-            self.setFormat(m.start(0)+1, len(m.group(0))-1, self.strFormat)
-        
-        # number value
-        for m in re.finditer(r':\s*(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)', text):
-            self.setFormat(m.start(1), len(m.group(1)), self.numFormat)
-        
-        # bool value
-        for m in re.finditer(r':\s*(true|false)', text):
-            self.setFormat(m.start(1), len(m.group(1)), self.boolFormat)
-        
-        # null value
-        for m in re.finditer(r':\s*(null)', text):
-            self.setFormat(m.start(1), len(m.group(1)), self.nullFormat) 
\ No newline at end of file
+        if self._skip_pass:
+            self.setCurrentBlockState(STATE_UNHIGHLIGHTED)
+            return
+        if self._budget is not None:
+            # Qt在块状态改变时会继续重排下一块；额度用完后让未高亮的块保持原状态，停止级联
+            if self._budget <= 0 and self.currentBlockState() == STATE_UNHIGHLIGHTED:
+                return
+            self._budget -= 1
+            self._last_block = self.currentBlock()
+        pos = 0
+        length = len(text)
+        if self.previousBlockState() == STATE_IN_STRING:
+            m = _STRING_REST_RE.match(text)
+            if m is None:
+                self.setFormat(0, length, self.strFormat)
+                self.setCurrentBlockState(STATE_IN_STRING)
+                return
+            self.setFormat(0, m.end(), self.strFormat)
+            pos = m.end()
+        state = STATE_NORMAL
+        for m in _TOKEN_RE.finditer(text, pos):
+            kind = m.lastgroup
+            start = m.start()
+            if kind == 'string':
+                fmt = self.keyFormat if _KEY_TAIL_RE.match(text, m.end()) else self.strFormat
+            elif kind == 'open_string':
+                fmt = self.strFormat
+                state = STATE_IN_STRING
+            elif kind == 'number':
+                fmt = self.numFormat
+            elif kind == 'bool':
+                fmt = self.boolFormat
+            else:
+                fmt = self.nullFormat
+            self.setFormat(start, m.end() - start, fmt)
+        self.setCurrentBlockState(state)
+
+    def _start_lazy_highlight(self, token):
+        if token != self._lazy_token:
+            return
+        doc = self.document()
+        self._skip_pass = False
+        if doc is None:
+            return
+        self._highlight_visible()
+        self._fill_block = doc.begin()
+        self._idle_timer.start()
+
+    def _rehighlight_from(self, block, count):
+        """从 block 开始最多高亮 count 块，返回最后处理的块"""
+        self._budget = count
+        self._last_block = block
+        try:
+            self.rehighlightBlock(block)
+        finally:
+            self._budget = None
+        return self._last_block
+
+    def _visible_range(self):
+        """编辑器当前可见的第一个块及可见块数"""
+        doc = self.document()
+        if self.editor is None or self.editor.document() is not doc:
+            return doc.begin(), 100
+        line_height = max(1, self.editor.fontMetrics().lineSpacing())
+        return self.editor.firstVisibleBlock(), self.editor.viewport().height() // line_height + 2
+
+    def _highlight_visible(self):
+        if self.document() is None:
+            return
+        block, count = self._visible_range()
+        if block.isValid():
+            self._rehighlight_from(block, count)
+
+    def _on_scrolled(self, _value):
+        # 空闲高亮尚未完成时，滚动到的新区域立即高亮
+        if self._fill_block is not None and self.document() is not None:
+            self._highlight_visible()
+
+    def _highlight_idle_chunk(self):
+        block = self._fill_block
+        if block is None or not block.isValid() or self.document() is None:
+            self._fill_block = None
+            self._idle_timer.stop()
+            return
+        block = self._rehighlight_from(block, self.IDLE_CHUNK).next()
+        if block.isValid():
+            self._fill_block = block
+        else:
+            self._fill_block = None
+            self._idle_timer.stop()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from array import array
+from bisect import bisect_left
+from PyQt5.QtWidgets import QAbstractScrollArea, QApplication, QInputDialog, QMenu
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor, QFont, QPainter
+from ui.utils.settings_manager import load_settings
+
+
+class LargeTextViewer(QAbstractScrollArea):
+    """只读的虚拟化文本查看器，用于显示大响应体
+
+    数据源为 ResponseBody（内存或内存映射文件），不会整体解码。
+    行索引只记录每个数据块之前的换行数，绘制时只读取可见的行，
+    内存占用与可见区域相关，与响应体大小基本无关。
+    """
+
+    BLOCK_SIZE = 64 * 1024
+    MAX_COPY_BYTES = 16 * 1024 * 1024
+    TAB_SIZE = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._body = None
+        self._nl_before = array('q', [0])  # 第 i 个数据块之前的换行数
+        self._line_count = 0
+        self._max_cols = 0
+        self._sel_anchor = None
+        self._sel_line = None
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self._show_context_menu)
+        s = load_settings()
+        self.setFont(QFont(s.get('editor_font_family', 'Consolas'), s.get('editor_font_size', 12)))
+
+    def set_source(self, body):
+        """设置数据源（ResponseBody）并建立行索引"""
+        self._body = body
+        self._sel_anchor = None
+        self._sel_line = None
+        self._max_cols = 0
+        self._build_index()
+        self.verticalScrollBar().setValue(0)
+        self.horizontalScrollBar().setValue(0)
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def clear(self):
+        self._body = None
+        self._nl_before = array('q', [0])
+        self._line_count = 0
+        self._max_cols = 0
+        self._sel_anchor = None
+        self._sel_line = None
+        self._update_scrollbars()
+        self.viewport().update()
+
+    def line_count(self):
+        return self._line_count
+
+    def goto_line(self, line_number):
+        """跳转到第 line_number 行（从1开始）"""
+        if self._line_count == 0:
+            return
+        line = max(0, min(int(line_number) - 1, self._line_count - 1))
+        self._sel_anchor = self._sel_line = line
+        self.verticalScrollBar().setValue(max(0, line - self._visible_lines() // 3))
+        self.viewport().update()
+
+    def prompt_goto_line(self):
+        if self._line_count == 0:
+            return
+        current = (self._sel_line if self._sel_line is not None else self.verticalScrollBar().value()) + 1
+        line, ok = QInputDialog.getInt(self, 'Go to Line', f'Line (1 - {self._line_count}):',
+                                       current, 1, self._line_count)
+        if ok:
+            self.goto_line(line)
+
+    def _build_index(self):
+        """按块统计换行数；块内行位置在绘制时再查找"""
+        nl_before = array('q', [0])
+        size = self._body.size if self._body is not None else 0
+        total = 0
+        for offset in range(0, size, self.BLOCK_SIZE):
+            total += self._body.read(offset, self.BLOCK_SIZE).count(b'\n')
+            nl_before.append(total)
+        self._nl_before = nl_before
+        self._line_count = total + 1 if self._body is not None else 0
+
+    def _line_start(self, line):
+        """第 line 行（从0开始）首字节的偏移"""
+        if line <= 0:
+            return 0
+        # 找到包含第 line 个换行符的数据块
+        block = bisect_left(self._nl_before, line) - 1
+        block_start = block * self.BLOCK_SIZE
+        block_end = min(block_start + self.BLOCK_SIZE, self._body.size)
+        pos = block_start
+        for _ in range(line - self._nl_before[block]):
+            pos = self._body.find(b'\n', pos, block_end) + 1
+        return pos
+
+    def _line_end(self, start):
+        end = self._body.find(b'\n', start)
+        return self._body.size if end < 0 else end
+
+    def _line_text(self, start, end, first_col=0, max_cols=None):
+        """解码一行中从 first_col 开始的可见部分；列按字节计，避免解码超长行"""
+        read_start = min(end, start + first_col)
+        read_end = end if max_cols is None else min(end, read_start + max_cols * 4)
+        text = self._body.read(read_start, read_end - read_start)
+        text = text.decode(self._body.encoding, errors='replace').rstrip('\r')
+        return text.replace('\t', ' ' * self.TAB_SIZE)
+
+    def _char_width(self):
+        return max(1, self.fontMetrics().horizontalAdvance('9'))
+
+    def _gutter_width(self):
+        return 10 + self._char_width() * len(str(max(1, self._line_count)))
+
+    def _visible_lines(self):
+        return max(1, self.viewport().height() // max(1, self.fontMetrics().lineSpacing()))
+
+    def _visible_cols(self):
+        return max(1, (self.viewport().width() - self._gutter_width()) // self._char_width())
+
+    def _update_scrollbars(self):
+        visible_lines = self._visible_lines()
+        vbar = self.verticalScrollBar()
+        vbar.setRange(0, max(0, self._line_count - visible_lines))
+        vbar.setPageStep(visible_lines)
+        visible_cols = self._visible_cols()
+        hbar = self.horizontalScrollBar()
+        hbar.setRange(0, max(0, self._max_cols - visible_cols))
+        hbar.setPageStep(visible_cols)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        rect = self.viewport().rect()
+        painter.fillRect(rect, QColor('#ffffff'))
+        gutter = self._gutter_width()
+        painter.fillRect(0, 0, gutter, rect.height(), QColor('#f0f0f0'))
+        if self._body is None or self._line_count == 0:
+            return
+        fm = self.fontMetrics()
+        line_height = fm.lineSpacing()
+        first_line = self.verticalScrollBar().value()
+        first_col = self.horizontalScrollBar().value()
+        visible_cols = self._visible_cols()
+        last_line = min(self._line_count, first_line + self._visible_lines() + 1)
+        sel = self._selection()
+        widest = self._max_cols
+        start = self._line_start(first_line)
+        y = 0
+        for line in range(first_line, last_line):
+            end = self._line_end(start)
+            widest = max(widest, end - start)
+            if sel and sel[0] <= line <= sel[1]:
+                painter.fillRect(gutter, y, rect.width() - gutter, line_height, QColor('#e8f2ff'))
+            painter.setPen(QColor('#666666'))
+            painter.drawText(0, y, gutter - 5, line_height, Qt.AlignRight | Qt.AlignVCenter, str(line + 1))
+            painter.setPen(QColor('#000000'))
+            text = self._line_text(start, end, first_col, visible_cols + 1)
+            painter.drawText(gutter + 4, y + fm.ascent(), text)
+            y += line_height
+            start = end + 1
+        painter.end()
+        if widest > self._max_cols:
+            # 水平滚动范围随已显示过的最长行扩展
+            self._max_cols = widest
+            self._update_scrollbars()
+
+    def _selection(self):
+        if self._sel_anchor is None or self._sel_line is None:
+            return None
+        return min(self._sel_anchor, self._sel_line), max(self._sel_anchor, self._sel_line)
+
+    def _line_at(self, y):
+        line = self.verticalScrollBar().value() + y // max(1, self.fontMetrics().lineSpacing())
+        return max(0, min(line, self._line_count - 1))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self._line_count:
+            line = self._line_at(event.pos().y())
+            if not (event.modifiers() & Qt.ShiftModifier) or self._sel_anchor is None:
+                self._sel_anchor = line
+            self._sel_line = line
+            self.viewport().update()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton and self._sel_anchor is not None:
+            self._sel_line = self._line_at(event.pos().y())
+            self.viewport().update()
+        super().mouseMoveEvent(event)
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() // 40
+        vbar = self.verticalScrollBar()
+        vbar.setValue(vbar.value() - steps)
+
+    def keyPressEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier:
+            if event.key() == Qt.Key_G:
+                self.prompt_goto_line()
+                return
+            if event.key() == Qt.Key_C:
+                self.copy_selection()
+                return
+            if event.key() == Qt.Key_Home:
+                self.verticalScrollBar().setValue(0)
+                return
+            if event.key() == Qt.Key_End:
+                self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+                return
+        super().keyPressEvent(event)
+
+    def copy_selection(self):
+        """复制选中的行（超过上限时截断）"""
+        sel = self._selection()
+        if sel is None or self._body is None:
+            return
+        start = self._line_start(sel[0])
+        end = self._line_end(self._line_start(sel[1]))
+        end = min(end, start + self.MAX_COPY_BYTES)
+        data = self._body.read(start, end - start)
+        QApplication.clipboard().setText(data.decode(self._body.encoding, errors='replace'))
+
+    def _show_context_menu(self, pos):
+        menu = QMenu(self)
+        copy_action = menu.addAction('Copy')
+        copy_action.setEnabled(self._selection() is not None)
+        goto_action = menu.addAction('Go to Line...')
+        action = menu.exec_(self.viewport().mapToGlobal(pos))
+        if action == copy_action:
+            self.copy_selection()
+        elif action == goto_action:
+            self.prompt_goto_line()
@@ -67,6 +67,17 @@ class RespLoadingOverlay(QWidget):
         self.animation_timer.stop()
         self.dots_count = 0
         
+    def set_compact(self, compact):
+        """紧凑模式：只覆盖父窗口底部一条，露出正在流式显示的响应内容"""
+        parent = self.parentWidget()
+        if parent is None:
+            return
+        if compact:
+            height = min(parent.height(), 96)
+            self.setGeometry(0, parent.height() - height, parent.width(), height)
+        else:
+            self.setGeometry(0, 0, parent.width(), parent.height())
+
     def update_animation(self):
         """更新动画效果"""
         self.dots_count = (self.dots_count + 1) % 4
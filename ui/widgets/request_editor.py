@@ -11,10 +11,12 @@ from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QIcon
 from .code_editor import CodeEditor
 from .json_highlighter import JsonHighlighter
-import json
+from ui.utils.json_formatter import JsonFormatWorker
+from ui.models.collection_manager import NODE_KIND_ROLE, NODE_REQUEST
 import os
 import uuid
 from ui.utils.i18n import get_text
+from ui.utils.request_builder import HTTP_VERSION_DEFAULT, HTTP_VERSION_1, HTTP_VERSION_2
 
 
 class RequestEditor(QWidget):
@@ -26,6 +28,11 @@ class RequestEditor(QWidget):
         self.req_name = req_name
         self.is_dirty = False
         self._dirty = False
+        # 请求体JSON在后台线程中美化
+        self._json_formatter = JsonFormatWorker(self)
+        self._json_formatter.finished.connect(self._on_json_formatted)
+        self._json_formatter.error.connect(self._on_json_format_error)
+        self._format_job = None  # (序号, 开始时的文档版本, 是否用户主动美化)
         self.init_ui()
         
     def init_ui(self):
@@ -49,12 +56,20 @@ class RequestEditor(QWidget):
         self.url_edit.setObjectName('UrlEdit')
         self.url_edit.setPlaceholderText('Enter request URL...')
         
+        # 请求使用的HTTP版本，Auto 按设置中的全局选项
+        self.http_version_combo = QComboBox()
+        self.http_version_combo.setObjectName('HttpVersionCombo')
+        for text, value in [('Auto', HTTP_VERSION_DEFAULT), ('HTTP/1.1', HTTP_VERSION_1), ('HTTP/2', HTTP_VERSION_2)]:
+            self.http_version_combo.addItem(text, value)
+        self.http_version_combo.setToolTip(get_text('http_version_tooltip'))
+
         self.send_btn = QPushButton('Send')
         self.send_btn.setFixedWidth(80)
         self.send_btn.setStyleSheet('''QPushButton {background-color: #1976d2; color: white; font-weight: bold; border-radius: 6px; padding: 8px 0; font-size: 16px;} QPushButton:pressed {background-color: #115293;}''')
         
         req_line_layout.addWidget(self.method_combo)
         req_line_layout.addWidget(self.url_edit)
+        req_line_layout.addWidget(self.http_version_combo)
         req_line_layout.addWidget(self.send_btn)
         
         layout.addWidget(req_line)
@@ -183,7 +198,7 @@ class RequestEditor(QWidget):
         raw_widget.setLayout(raw_main_layout)
         self.body_stack.addWidget(raw_widget)
         
-        self.json_highlighter = JsonHighlighter(self.raw_text_edit.document())
+        self.json_highlighter = JsonHighlighter(self.raw_text_edit.document(), editor=self.raw_text_edit)
         
         # 连接Body类型切换信号
         self.raw_type_combo.currentTextChanged.connect(self.on_raw_type_changed)
@@ -191,7 +206,7 @@ class RequestEditor(QWidget):
         self.body_form_radio.toggled.connect(lambda checked: checked and self.body_stack.setCurrentIndex(1))
         self.body_url_radio.toggled.connect(lambda checked: checked and self.body_stack.setCurrentIndex(2))
         self.body_raw_radio.toggled.connect(lambda checked: checked and self.body_stack.setCurrentIndex(3))
-        self.beautify_btn.clicked.connect(self.beautify_json)
+        self.beautify_btn.clicked.connect(lambda: self.beautify_json())
         # 连接查找/替换按钮
         self.find_replace_btn.clicked.connect(self.show_find_replace_dialog)
         
@@ -223,7 +238,7 @@ class RequestEditor(QWidget):
         self.resp_headers = ''
         
         # 连接编辑信号
-        for widget in [self.method_combo, self.url_edit, self.params_table, self.headers_table, self.form_table, self.url_table, self.raw_text_edit]:
+        for widget in [self.method_combo, self.http_version_combo, self.url_edit, self.params_table, self.headers_table, self.form_table, self.url_table, self.raw_text_edit]:
             if hasattr(widget, 'textChanged'):
                 widget.textChanged.connect(self.mark_dirty)
             elif hasattr(widget, 'currentTextChanged'):
@@ -246,7 +261,7 @@ class RequestEditor(QWidget):
         self._find_sc = QShortcut(QKeySequence(shortcuts.get('find', 'Ctrl+F')), self.raw_text_edit)
         self._find_sc.activated.connect(self.show_find_replace_dialog)
         self._beautify_sc = QShortcut(QKeySequence(shortcuts.get('beautify', 'Ctrl+B')), self.raw_text_edit)
-        self._beautify_sc.activated.connect(self.beautify_json)
+        self._beautify_sc.activated.connect(lambda: self.beautify_json(indent=self.raw_text_edit.get_tab_size()))
         
         # 设置Beautify按钮的初始可见性
         self.beautify_btn.setVisible(True)  # 默认JSON类型显示
@@ -427,8 +442,11 @@ class RequestEditor(QWidget):
         from PyQt5.QtCore import Qt
         mainwin = self.window()
         if hasattr(mainwin, 'collection_tree'):
-            sel = mainwin.collection_tree.currentItem()
-            if sel and sel.childCount() == 0:
+            # 优先使用路径索引中该Tab对应的树节点，其次是当前选中的节点
+            sel = mainwin.path_index.item_for_tab(self)
+            if sel is None:
+                sel = mainwin.collection_tree.currentItem()
+            if sel and mainwin.is_request_node(sel):
                 # 获取当前Tab的完整路径
                 idx = mainwin.req_tabs.indexOf(self)
                 if idx >= 0:
@@ -454,13 +472,14 @@ class RequestEditor(QWidget):
                     mainwin.req_tabs.setTabText(idx, new_tab_text)
                 
                 # 保存内容到树节点
-                sel.setData(0, Qt.UserRole, self.serialize_request())
+                mainwin.set_request_payload(sel, self.serialize_request())
             else:
                 from PyQt5.QtWidgets import QTreeWidgetItem
                 name = self.url_edit.text() or 'New Request'
                 item = QTreeWidgetItem([name])
                 item.setIcon(0, mainwin.file_icon)
-                item.setData(0, Qt.UserRole, self.serialize_request())
+                item.setData(0, NODE_KIND_ROLE, NODE_REQUEST)
+                mainwin.set_request_payload(item, self.serialize_request())
                 mainwin.collection_tree.addTopLevelItem(item)
                 idx = mainwin.req_tabs.indexOf(self)
                 if idx >= 0:
@@ -475,27 +494,43 @@ class RequestEditor(QWidget):
         self._dirty = False
         mainwin.save_all()
         
-    def beautify_json(self):
-        """美化JSON"""
-        try:
-            text = self.raw_text_edit.toPlainText()
-            if text.strip():
-                obj = json.loads(text)
-                self.raw_text_edit.setPlainText(json.dumps(obj, ensure_ascii=False, indent=2))
-        except Exception as e:
-            QMessageBox.warning(self, 'Error', f'Invalid JSON: {e}')
+    def beautify_json(self, indent=2, explicit=True):
+        """美化JSON；explicit 为 False 时（如编辑器中按 Ctrl+B）JSON无效不提示"""
+        self._start_json_format(explicit, indent)
+
+    def _start_json_format(self, explicit, indent=2):
+        """在后台线程中美化请求体；完成前若内容被修改则放弃结果"""
+        text = self.raw_text_edit.toPlainText()
+        if not text.strip():
+            return
+        generation = self._json_formatter.format(text, indent)
+        self._format_job = (generation, self.raw_text_edit.document().revision(), explicit)
+
+    def _on_json_formatted(self, generation, text):
+        job = self._format_job
+        if job is None or job[0] != generation or not self._json_formatter.is_current(generation):
+            return
+        self._format_job = None
+        if job[1] != self.raw_text_edit.document().revision():
+            return  # 格式化期间用户修改了内容
+        self.raw_text_edit.setPlainText(text)
+
+    def _on_json_format_error(self, generation, msg):
+        job = self._format_job
+        if job is None or job[0] != generation or not self._json_formatter.is_current(generation):
+            return
+        self._format_job = None
+        if job[2]:
+            QMessageBox.warning(self, 'Error', f'Invalid JSON: {msg}')
             
     def on_raw_type_changed(self, text):
         """原始类型改变"""
         if text == 'JSON':
             self.beautify_btn.setVisible(True)
-            # 自动美化
-            try:
-                obj = json.loads(self.raw_text_edit.toPlainText())
-                self.raw_text_edit.setPlainText(json.dumps(obj, ensure_ascii=False, indent=2))
-            except Exception:
-                pass
+            # 自动美化（无效JSON时静默忽略）
+            self._start_json_format(explicit=False)
         else:
+            self._json_formatter.cancel()
             self.beautify_btn.setVisible(False)
                 
     def on_send_clicked(self):
@@ -563,7 +598,7 @@ class RequestEditor(QWidget):
             body_type = 'raw'
             body_data = self.raw_text_edit.toPlainText()
         
-        return {
+        request = {
             'method': self.method_combo.currentText(),
             'url': self.url_edit.text(),
             'params': get_table_data(self.params_table),
@@ -571,7 +606,19 @@ class RequestEditor(QWidget):
             'body_type': body_type,
             'body': body_data,
             'raw_type': self.raw_type_combo.currentText() if body_type == 'raw' else 'JSON'
-        } 
+        }
+        # 只在选择了HTTP版本时保存，已有的集合文件不变
+        if self.http_version():
+            request['http_version'] = self.http_version()
+        return request
+
+    def http_version(self):
+        return self.http_version_combo.currentData() or HTTP_VERSION_DEFAULT
+
+    def set_http_version(self, http_version):
+        index = self.http_version_combo.findData(http_version or HTTP_VERSION_DEFAULT)
+        self.http_version_combo.setCurrentIndex(max(0, index))
+
 
     def show_find_replace_dialog(self):
         """弹出查找/替换对话框，支持正则"""